@@ -0,0 +1,88 @@
+"""
+Helpers shared by the benchmarks: timing, result formatting and a local stub server.
+"""
+
+import asyncio
+import statistics
+import time
+
+from typing import Awaitable, Callable
+
+from aiohttp import web
+
+
+def result(name: str, timings: list[float], count: int, **extra) -> dict:
+    """
+    Summarize the timings of `repeat` runs that each processed `count` items.
+    """
+    best = min(timings)
+    return {
+        "name": name,
+        "count": count,
+        "repeat": len(timings),
+        "best_seconds": best,
+        "median_seconds": statistics.median(timings),
+        "per_item_microseconds": best / count * 1_000_000,
+        **extra,
+    }
+
+
+def measure(name: str, fn: Callable[[], object], count: int, repeat: int, **extra) -> dict:
+    """
+    Time `repeat` calls of `fn`, each of which processes `count` items.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return result(name, timings, count, **extra)
+
+
+async def measure_async(
+    name: str, fn: Callable[[], Awaitable[object]], count: int, repeat: int, **extra
+) -> dict:
+    """
+    Time `repeat` awaited calls of `fn`, each of which processes `count` items.
+    """
+    # One untimed run, so connection setup and first-use caches don't skew the results.
+    await fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+
+    return result(name, timings, count, **extra)
+
+
+class StubServer:
+    """
+    Serves an `aiohttp.web.Application` on a random local port, so benchmarks that
+    make HTTP requests don't depend on the network.
+
+    ```python
+    async with StubServer(app) as url:
+        ...
+    ```
+    """
+
+    def __init__(self, app: web.Application):
+        self._runner = web.AppRunner(app, access_log=None)
+
+    async def __aenter__(self) -> str:
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._runner.cleanup()
+
+
+def run_async(coroutine: Awaitable[list[dict]]) -> list[dict]:
+    return asyncio.run(coroutine)
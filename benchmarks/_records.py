@@ -0,0 +1,97 @@
+"""
+Synthetic query results in the shape of the Salesforce REST API responses.
+"""
+
+from typing import Any
+
+
+def _attributes(object_type: str, record_id: str) -> dict[str, str]:
+    return {
+        "type": object_type,
+        "url": f"/services/data/v62.0/sobjects/{object_type}/{record_id}",
+    }
+
+
+def flat_record(index: int) -> dict[str, Any]:
+    record_id = f"001{index:015d}"
+    return {
+        "attributes": _attributes("Account", record_id),
+        "Id": record_id,
+        "Name": f"Account {index}",
+        "Industry": "Technology",
+        "AnnualRevenue": 1_000_000.0 + index,
+        "NumberOfEmployees": index % 500,
+        "Phone": "(555) 555-0100",
+        "Website": f"https://account{index}.example.com",
+        "BillingCity": "San Francisco",
+        "IsDeleted": False,
+        "CreatedDate": "2025-03-06T18:20:42.000+0000",
+        "LastModifiedDate": "2025-03-09T18:20:42.000+0000",
+    }
+
+
+def nested_record(index: int) -> dict[str, Any]:
+    record_id = f"003{index:015d}"
+    account_id = f"001{index:015d}"
+    return {
+        "attributes": _attributes("Contact", record_id),
+        "Id": record_id,
+        "FirstName": "Contact",
+        "LastName": str(index),
+        "Email": f"contact{index}@example.com",
+        "Account": {
+            "attributes": _attributes("Account", account_id),
+            "Name": f"Account {index}",
+            "Owner": {
+                "attributes": _attributes("User", f"005{index:015d}"),
+                "Name": "Owner",
+                "Email": "owner@example.com",
+            },
+        },
+    }
+
+
+def subquery_record(index: int, children: int = 3) -> dict[str, Any]:
+    record = flat_record(index)
+    record["Contacts"] = {
+        "totalSize": children,
+        "done": True,
+        "records": [
+            {
+                "attributes": _attributes("Contact", f"003{index:012d}{child:03d}"),
+                "Id": f"003{index:012d}{child:03d}",
+                "LastName": f"{index}-{child}",
+            }
+            for child in range(children)
+        ],
+    }
+    return record
+
+
+SHAPES = {
+    "flat": flat_record,
+    "nested": nested_record,
+    "subquery": subquery_record,
+}
+
+
+def page(
+    shape: str,
+    size: int,
+    offset: int = 0,
+    total_size: int | None = None,
+    next_records_url: str | None = None,
+) -> dict[str, Any]:
+    """
+    A page of `size` records of the given shape, as returned by the query endpoints.
+    """
+    body: dict[str, Any] = {
+        "totalSize": total_size if total_size is not None else size,
+        "done": next_records_url is None,
+        "records": [SHAPES[shape](offset + index) for index in range(size)],
+    }
+
+    if next_records_url is not None:
+        body["nextRecordsUrl"] = next_records_url
+
+    return body
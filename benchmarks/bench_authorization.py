@@ -0,0 +1,70 @@
+"""
+Micro-benchmark for bulk-constructing `Authorization` objects from raw add-on
+responses, which is what pre-warming authorizations at boot spends its CPU on.
+
+Usage:
+
+    python benchmarks/bench_authorization.py [--count 500] [--repeat 5]
+"""
+
+import argparse
+import json
+
+import orjson
+
+from _common import measure
+
+from heroku_applink.authorization import Authorization
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+
+
+def _payload(index: int) -> bytes:
+    return orjson.dumps(
+        {
+            "id": f"b8bc7bcb-89c3-45c0-b7b7-{index:012d}",
+            "status": "authorized",
+            "org": {
+                "id": "00DSG00000DGEIr2AP",
+                "developer_name": f"org{index}",
+                "instance_url": "https://example.my.salesforce.com",
+                "type": "SalesforceOrg",
+                "api_version": "62.0",
+                "user_auth": {
+                    "username": "admin@example.org",
+                    "user_id": "005SG00000DGEIr2AP",
+                    "access_token": "00DSG00000DGEIr2AP!token",
+                },
+            },
+            "created_at": "2025-03-06T18:20:42.226577Z",
+            "created_by": "user@example.tld",
+            "created_via_app": "example-app",
+            "last_modified_at": "2025-03-09T18:20:42.226577Z",
+            "last_modified_by": "user@example.tld",
+            "redirect_uri": "https://example-app.herokuapp.com",
+        }
+    )
+
+
+def run(count: int = 500, repeat: int = 5) -> list[dict]:
+    payloads = [_payload(index) for index in range(count)]
+    connection = Connection(Config.default())
+
+    def build():
+        for payload in payloads:
+            Authorization._build_authorization(connection, orjson.loads(payload))
+
+    return [measure("authorization.build", build, count=count, repeat=repeat)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
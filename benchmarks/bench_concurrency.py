@@ -0,0 +1,106 @@
+"""
+Throughput benchmark for concurrent `DataAPI` calls, and for requests passing through
+`IntegrationAsgiMiddleware`, against `heroku_applink.testing.FakeSalesforce` with a
+fixed latency per request.
+
+Usage:
+
+    python benchmarks/bench_concurrency.py [--count 500] [--latency 0.005] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+
+from _common import measure_async, run_async
+
+import heroku_applink as sdk
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.data_api import DataAPI
+from heroku_applink.testing import FakeSalesforce
+
+SOQL = "SELECT Id, Name FROM Account LIMIT 10"
+
+
+async def _run(count: int, latency: float, repeat: int) -> list[dict]:
+    async with FakeSalesforce(latency=latency) as salesforce:
+        salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(10)])
+        connection = Connection(Config.default())
+        data_api = DataAPI(
+            org_domain_url=salesforce.url,
+            api_version=salesforce.api_version,
+            access_token=salesforce.access_token,
+            connection=connection,
+        )
+
+        async def concurrent_queries():
+            await asyncio.gather(*(data_api.query(SOQL) for _ in range(count)))
+
+        async def app(scope, receive, send):
+            await sdk.get_client_context().data_api.query(SOQL)
+
+        middleware = sdk.IntegrationAsgiMiddleware(app)
+        header = salesforce.client_context_header().encode()
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            pass
+
+        async def middleware_requests():
+            await asyncio.gather(
+                *(
+                    middleware(
+                        {
+                            "type": "http",
+                            "method": "GET",
+                            "path": "/",
+                            "headers": [(b"x-client-context", header)],
+                        },
+                        receive,
+                        send,
+                    )
+                    for _ in range(count)
+                )
+            )
+
+        try:
+            return [
+                await measure_async(
+                    "data_api.concurrent_query",
+                    concurrent_queries,
+                    count=count,
+                    repeat=repeat,
+                    latency_seconds=latency,
+                ),
+                await measure_async(
+                    "asgi_middleware.concurrent_query",
+                    middleware_requests,
+                    count=count,
+                    repeat=repeat,
+                    latency_seconds=latency,
+                ),
+            ]
+        finally:
+            await connection.close()
+            await middleware.connection.close()
+
+
+def run(count: int = 500, latency: float = 0.005, repeat: int = 5) -> list[dict]:
+    return run_async(_run(count, latency, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.latency, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for decoding the `x-client-context` header into a `ClientContext`, which the
+middleware does for every incoming request.
+
+Usage:
+
+    python benchmarks/bench_context.py [--count 10000] [--repeat 5]
+"""
+
+import argparse
+import base64
+import json
+
+from _common import measure
+
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.context import ClientContext, DataAPIPool
+
+
+def _header(index: int) -> str:
+    context = {
+        "requestId": f"00DSG00000DGEIr2AP-{index}",
+        "accessToken": "00DSG00000DGEIr2AP!token",
+        "apiVersion": "62.0",
+        "namespace": "",
+        "orgId": "00DSG00000DGEIr2AP",
+        "orgDomainUrl": "https://example.my.salesforce.com",
+        "userContext": {
+            "userId": "005SG00000DGEIr2AP",
+            "username": "admin@example.org",
+        },
+    }
+    return base64.b64encode(json.dumps(context).encode()).decode()
+
+
+def run(count: int = 10000, repeat: int = 5) -> list[dict]:
+    headers = [_header(index) for index in range(count)]
+    connection = Connection(Config.default())
+    data_api_pool = DataAPIPool(connection)
+
+    def without_pool():
+        for header in headers:
+            ClientContext.from_header(header, connection)
+
+    def with_pool():
+        for header in headers:
+            ClientContext.from_header(header, connection, data_api_pool)
+
+    return [
+        measure("client_context.from_header", without_pool, count=count, repeat=repeat),
+        measure(
+            "client_context.from_header.pooled", with_pool, count=count, repeat=repeat
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark for the per-request overhead of `IntegrationAsgiMiddleware` with a realistic
+number of proxy headers: reading the headers it needs from the raw ASGI header list,
+compared to decoding all of them, and a full request through the middleware, with and
+without a FastAPI app behind it.
+
+Usage:
+
+    python benchmarks/bench_middleware.py [--count 10000] [--headers 30] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+
+from _common import measure, measure_async, run_async
+
+import heroku_applink as sdk
+from heroku_applink.connection import Connection
+from heroku_applink.middleware import _asgi_headers
+
+try:
+    from fastapi import FastAPI
+    from starlette.datastructures import Headers
+except ImportError:
+    FastAPI = None
+
+
+def _raw_headers(header_count: int) -> list[tuple[bytes, bytes]]:
+    client_context = base64.b64encode(
+        json.dumps(
+            {
+                "requestId": "00DSG00000DGEIr2AP-1",
+                "accessToken": "00DSG00000DGEIr2AP!token",
+                "apiVersion": "62.0",
+                "namespace": "",
+                "orgId": "00DSG00000DGEIr2AP",
+                "orgDomainUrl": "https://example.my.salesforce.com",
+                "userContext": {
+                    "userId": "005SG00000DGEIr2AP",
+                    "username": "admin@example.org",
+                },
+            }
+        ).encode()
+    )
+    headers = [
+        (f"x-forwarded-header-{index}".encode(), f"value-{index}".encode() * 4)
+        for index in range(header_count)
+    ]
+    headers.insert(header_count // 2, (b"x-client-context", client_context))
+    headers.append((b"x-request-id", b"00DSG00000DGEIr2AP-1"))
+    return headers
+
+
+async def _run(count: int, header_count: int, repeat: int) -> list[dict]:
+    raw_headers = _raw_headers(header_count)
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "scheme": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": raw_headers,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def app(scope, receive, send):
+        sdk.get_client_context()
+
+    middleware = sdk.IntegrationAsgiMiddleware(app)
+    connection = Connection(sdk.Config.default())
+
+    def decode_all():
+        for _ in range(count):
+            headers = connection._decode_headers(dict(raw_headers))
+            headers.get("x-client-context")
+            headers.get("x-request-id")
+
+    def scan():
+        for _ in range(count):
+            headers = _asgi_headers(raw_headers, middleware.header_names)
+            headers.get("x-client-context")
+            headers.get("x-request-id")
+
+    async def middleware_requests():
+        for _ in range(count):
+            await middleware(dict(scope), receive, send)
+
+    results = [
+        measure(
+            "asgi_headers.decode_all",
+            decode_all,
+            count=count,
+            repeat=repeat,
+            headers=len(raw_headers),
+        ),
+        measure(
+            "asgi_headers.scan", scan, count=count, repeat=repeat, headers=len(raw_headers)
+        ),
+        await measure_async(
+            "asgi_middleware.request",
+            middleware_requests,
+            count=count,
+            repeat=repeat,
+            headers=len(raw_headers),
+        ),
+    ]
+
+    if FastAPI is not None:
+
+        def starlette_headers():
+            for _ in range(count):
+                headers = Headers(raw=raw_headers)
+                headers.get("x-client-context")
+                headers.get("x-request-id")
+
+        fastapi_app = FastAPI()
+
+        @fastapi_app.get("/")
+        async def root():
+            return {}
+
+        fastapi_with_middleware = sdk.IntegrationAsgiMiddleware(fastapi_app)
+
+        async def fastapi_requests():
+            for _ in range(count):
+                await fastapi_app(dict(scope), receive, send)
+
+        async def fastapi_middleware_requests():
+            for _ in range(count):
+                await fastapi_with_middleware(dict(scope), receive, send)
+
+        results += [
+            measure(
+                "starlette.headers",
+                starlette_headers,
+                count=count,
+                repeat=repeat,
+                headers=len(raw_headers),
+            ),
+            await measure_async(
+                "fastapi.request",
+                fastapi_requests,
+                count=count,
+                repeat=repeat,
+                headers=len(raw_headers),
+            ),
+            await measure_async(
+                "fastapi.request.asgi_middleware",
+                fastapi_middleware_requests,
+                count=count,
+                repeat=repeat,
+                headers=len(raw_headers),
+            ),
+        ]
+
+        await fastapi_with_middleware.connection.close()
+
+    await asyncio.gather(connection.close(), middleware.connection.close())
+    return results
+
+
+def run(count: int = 10000, headers: int = 30, repeat: int = 5) -> list[dict]:
+    return run_async(_run(count, headers, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--headers", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.headers, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
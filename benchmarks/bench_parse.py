@@ -0,0 +1,93 @@
+"""
+Benchmark for parsing query result pages into `QueriedRecord`s, which is where
+`DataAPI.query` spends its CPU for large result sets, and for decoding and parsing
+them with and without `convert_field_types` and `Config.exact_decimals`.
+
+Usage:
+
+    python benchmarks/bench_parse.py [--count 2000] [--repeat 5]
+"""
+
+import argparse
+import json
+
+import orjson
+from _common import measure_async, run_async
+from _records import SHAPES, page
+
+from heroku_applink.data_api._field_types import _compile_field_converters, _loads
+from heroku_applink.data_api._requests import _parse_record_query_result
+
+# The converted fields of the objects in `_records`, as their describe would list them.
+DESCRIBES = {
+    "Account": {
+        "fields": [
+            {"name": "AnnualRevenue", "type": "currency"},
+            {"name": "CreatedDate", "type": "datetime"},
+            {"name": "LastModifiedDate", "type": "datetime"},
+        ]
+    },
+}
+
+
+async def _download_file(url: str) -> bytes:
+    return b""
+
+
+async def _field_converters(object_type: str):
+    return _compile_field_converters(DESCRIBES.get(object_type, {}))
+
+
+async def _run(count: int, repeat: int) -> list[dict]:
+    results = []
+
+    for shape in SHAPES:
+        body = page(shape, count)
+
+        results.append(
+            await measure_async(
+                f"parse_record_query_result.{shape}",
+                lambda: _parse_record_query_result(body, _download_file),
+                count=count,
+                repeat=repeat,
+            )
+        )
+
+        # What `DataAPI.query` does with a response body: without `convert_field_types`,
+        # with it, and with it and `Config.exact_decimals`.
+        raw_body = orjson.dumps(body)
+
+        for name, field_converters, exact_decimals in (
+            (f"decode_and_parse.{shape}", None, False),
+            (f"decode_and_parse.{shape}.convert_field_types", _field_converters, False),
+            (f"decode_and_parse.{shape}.exact_decimals", _field_converters, True),
+        ):
+            results.append(
+                await measure_async(
+                    name,
+                    lambda: _parse_record_query_result(
+                        _loads(raw_body, exact_decimals), _download_file, field_converters
+                    ),
+                    count=count,
+                    repeat=repeat,
+                )
+            )
+
+    return results
+
+
+def run(count: int = 2000, repeat: int = 5) -> list[dict]:
+    return run_async(_run(count, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+End-to-end benchmark for `DataAPI.query` followed by `DataAPI.query_more` until all
+pages were read, against a local stub server.
+
+Usage:
+
+    python benchmarks/bench_query.py [--pages 5] [--page-size 2000] [--repeat 5]
+"""
+
+import argparse
+import json
+
+import orjson
+
+from aiohttp import web
+
+from _common import StubServer, measure_async, run_async
+from _records import page
+
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.data_api import DataAPI
+
+API_VERSION = "62.0"
+
+
+def _stub_app(pages: int, page_size: int) -> web.Application:
+    """
+    An app serving `pages` pages of `page_size` flat records, pre-serialized so the
+    server doesn't dominate the timings.
+    """
+    total_size = pages * page_size
+    bodies = []
+
+    for index in range(pages):
+        next_records_url = (
+            f"/services/data/v{API_VERSION}/query/01gBENCH-{(index + 1) * page_size}"
+            if index + 1 < pages
+            else None
+        )
+        bodies.append(
+            orjson.dumps(
+                page(
+                    "flat",
+                    page_size,
+                    offset=index * page_size,
+                    total_size=total_size,
+                    next_records_url=next_records_url,
+                )
+            )
+        )
+
+    def respond(index: int) -> web.Response:
+        return web.Response(body=bodies[index], content_type="application/json")
+
+    async def query(request: web.Request) -> web.Response:
+        return respond(0)
+
+    async def query_more(request: web.Request) -> web.Response:
+        offset = int(request.match_info["locator"].rsplit("-", 1)[1])
+        return respond(offset // page_size)
+
+    app = web.Application()
+    app.router.add_get(f"/services/data/v{API_VERSION}/query", query)
+    app.router.add_get(f"/services/data/v{API_VERSION}/query/{{locator}}", query_more)
+    return app
+
+
+async def _run(pages: int, page_size: int, repeat: int) -> list[dict]:
+    async with StubServer(_stub_app(pages, page_size)) as url:
+        connection = Connection(Config.default())
+        data_api = DataAPI(
+            org_domain_url=url,
+            api_version=API_VERSION,
+            access_token="token",
+            connection=connection,
+        )
+
+        async def query_all():
+            result = await data_api.query("SELECT Id, Name FROM Account")
+            while not result.done:
+                result = await data_api.query_more(result)
+
+        try:
+            return [
+                await measure_async(
+                    "data_api.query_paging",
+                    query_all,
+                    count=pages * page_size,
+                    repeat=repeat,
+                    pages=pages,
+                )
+            ]
+        finally:
+            await connection.close()
+
+
+def run(pages: int = 5, page_size: int = 2000, repeat: int = 5) -> list[dict]:
+    return run_async(_run(pages, page_size, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.pages, args.page_size, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark for building and serializing the request body of a large composite graph,
+which is what `DataAPI.commit_unit_of_work` does before sending it, with and without
+binary fields. Registering the operations is measured separately, since that's where
+each of them is serialized.
+
+Usage:
+
+    python benchmarks/bench_serialize.py [--count 500] [--repeat 5]
+"""
+
+import argparse
+import json
+
+from _common import measure
+
+from heroku_applink.data_api import _json_serialize
+from heroku_applink.data_api._requests import CompositeGraphRestApiRequest
+from heroku_applink.data_api.record import Record
+from heroku_applink.data_api.unit_of_work import UnitOfWork
+
+
+def _unit_of_work(count: int) -> UnitOfWork:
+    """
+    A unit of work with `count` operations: accounts, each followed by a contact that
+    references it.
+    """
+    unit_of_work = UnitOfWork()
+
+    for index in range(count // 2):
+        account = unit_of_work.register_create(
+            Record(
+                type="Account",
+                fields={
+                    "Name": f"Account {index}",
+                    "Industry": "Technology",
+                    "Description": "x" * 200,
+                },
+            )
+        )
+        unit_of_work.register_create(
+            Record(
+                type="Contact",
+                fields={
+                    "FirstName": "Contact",
+                    "LastName": str(index),
+                    "AccountId": account,
+                },
+            )
+        )
+
+    return unit_of_work
+
+
+def _binary_unit_of_work(count: int, size: int = 16 * 1024) -> UnitOfWork:
+    """
+    A unit of work with `count` content versions, each carrying `size` bytes of file
+    data that's sent base64-encoded.
+    """
+    unit_of_work = UnitOfWork()
+    data = bytes(range(256)) * (size // 256)
+
+    for index in range(count):
+        unit_of_work.register_create(
+            Record(
+                type="ContentVersion",
+                fields={
+                    "Title": f"File {index}",
+                    "PathOnClient": f"file-{index}.bin",
+                    "VersionData": data,
+                },
+            )
+        )
+
+    return unit_of_work
+
+
+def _measure_unit_of_work(name: str, build, count: int, repeat: int) -> list[dict]:
+    unit_of_work = build(count)
+
+    def serialize():
+        request = CompositeGraphRestApiRequest(
+            "62.0", unit_of_work._sub_requests, unit_of_work._nodes
+        )
+        return _json_serialize(request.request_body())
+
+    return [
+        measure(
+            f"{name}.register",
+            lambda: build(count),
+            count=count,
+            repeat=repeat,
+        ),
+        measure(
+            f"{name}.serialize",
+            serialize,
+            count=len(unit_of_work._sub_requests),
+            repeat=repeat,
+            body_bytes=len(serialize()),
+        ),
+    ]
+
+
+def run(count: int = 500, repeat: int = 5) -> list[dict]:
+    return [
+        *_measure_unit_of_work("composite_graph", _unit_of_work, count, repeat),
+        *_measure_unit_of_work(
+            "composite_graph.binary", _binary_unit_of_work, count, repeat
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Run all benchmarks and write the results as JSON, so they can be compared between
+changes.
+
+Usage:
+
+    python benchmarks/run.py [--repeat 5] [--output results.json] [--only parse ...]
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+import bench_authorization
+import bench_concurrency
+import bench_context
+import bench_middleware
+import bench_parse
+import bench_query
+import bench_serialize
+
+from heroku_applink.config import Config
+
+BENCHMARKS = {
+    "authorization": bench_authorization,
+    "concurrency": bench_concurrency,
+    "context": bench_context,
+    "middleware": bench_middleware,
+    "parse": bench_parse,
+    "query": bench_query,
+    "serialize": bench_serialize,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this file instead of stdout")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        results.extend(BENCHMARKS[name].run(repeat=args.repeat))
+
+    report = json.dumps(
+        {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "user_agent": Config.default().user_agent(),
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,37 @@ SPDX-License-Identifier: BSD-3-Clause
 For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
 """
 
-from .authorization import Authorization
+from .authorization import Authorization, AuthorizationResults, refresh_addon_config
 from .config import Config
 from .context import ClientContext, get_client_context, set_client_context
-from .data_api.record import QueriedRecord, Record, RecordQueryResult
+from .data_api.record import QueriedRecord, Record, RecordQueryResult, TrackedRecord
 from .data_api.reference_id import ReferenceId
+from .data_api.statement import BoundStatement, PreparedStatement
+from .data_api.batch import Batch
+from .data_api.loader import RecordLoader
 from .data_api.unit_of_work import UnitOfWork
 from .middleware import IntegrationWsgiMiddleware, IntegrationAsgiMiddleware
-from .exceptions import ClientError, UnexpectedRestApiResponsePayload
-from .connection import Connection
+from .exceptions import (
+    CircuitOpenError,
+    ClientError,
+    DeadlineExceededError,
+    StreamingError,
+    UnexpectedRestApiResponsePayload,
+)
+from .connection import Connection, get_deadline, set_deadline
+from .circuit_breaker import CircuitBreakerPolicy
+from .hedging import HedgingPolicy
+from .instrumentation import HistogramCollector, Instrumentation, RequestEvent
+from .metrics import MetricsAsgiApp, MetricsRegistry
+from .transport import AiohttpTransport, Http2Transport, Transport
+from .write_batching import WriteBatchingPolicy
+from .streaming import (
+    CheckpointStore,
+    MemoryCheckpointStore,
+    StreamingClient,
+    StreamingEvent,
+)
+from .sync import SyncedObject, SyncEngine, SyncResult
 
 def get_authorization(developer_name: str, attachment_or_url: str|None=None) -> Authorization:
     """
@@ -41,18 +63,48 @@ __all__ = [
     "get_client_context",
     "set_client_context",
     "get_authorization",
+    "get_deadline",
+    "set_deadline",
+    "refresh_addon_config",
     "Authorization",
+    "AuthorizationResults",
     "Config",
     "Connection",
+    "HedgingPolicy",
+    "CircuitBreakerPolicy",
+    "WriteBatchingPolicy",
+    "Instrumentation",
+    "HistogramCollector",
+    "RequestEvent",
+    "MetricsAsgiApp",
+    "MetricsRegistry",
+    "Transport",
+    "AiohttpTransport",
+    "Http2Transport",
     "ClientContext",
     "QueriedRecord",
     "Record",
     "RecordQueryResult",
+    "TrackedRecord",
     "ReferenceId",
+    "PreparedStatement",
+    "BoundStatement",
+    "RecordLoader",
     "UnitOfWork",
+    "Batch",
+    "StreamingClient",
+    "StreamingEvent",
+    "CheckpointStore",
+    "MemoryCheckpointStore",
+    "SyncEngine",
+    "SyncedObject",
+    "SyncResult",
     "IntegrationWsgiMiddleware",
     "IntegrationAsgiMiddleware",
     "ClientError",
+    "DeadlineExceededError",
+    "CircuitOpenError",
+    "StreamingError",
     "UnexpectedRestApiResponsePayload",
 ]
 
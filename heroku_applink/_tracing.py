@@ -0,0 +1,181 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+
+Optional OpenTelemetry tracing. When `opentelemetry-api` isn't installed, every helper
+in this module is a no-op that returns shared, pre-built objects.
+"""
+
+from typing import Any, Mapping
+
+try:
+    from opentelemetry import context as otel_context, propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover
+    propagate = None
+    trace = None
+
+ENABLED = trace is not None
+"""Whether OpenTelemetry is installed."""
+
+class _NoopSpan:
+    """
+    Stands in for both the span context manager and the span itself when
+    OpenTelemetry isn't installed.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+if trace is not None:
+    _tracer = trace.get_tracer("heroku_applink")
+    _SPAN_KINDS = {
+        "internal": SpanKind.INTERNAL,
+        "client": SpanKind.CLIENT,
+        "server": SpanKind.SERVER,
+    }
+
+class _CurrentSpan:
+    """
+    Makes a span the current span until it ends, like `Tracer.start_as_current_span()`.
+    That one is built on `contextlib`, which assigns `__traceback__` to exceptions
+    passing through it and so fails for frozen dataclass exceptions such as
+    `SalesforceRestApiError`.
+    """
+
+    __slots__ = ("_span", "_token", "_end_on_exit")
+
+    def __init__(self, span, end_on_exit: bool):
+        self._span = span
+        self._token = None
+        self._end_on_exit = end_on_exit
+
+    def __enter__(self):
+        self._token = otel_context.attach(trace.set_span_in_context(self._span))
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        try:
+            if exc_value is not None:
+                _record_exception(self._span, exc_value)
+        finally:
+            otel_context.detach(self._token)
+            if self._end_on_exit or exc_value is not None:
+                self._span.end()
+
+        return False
+
+def start_span(
+    name: str,
+    attributes: Mapping[str, Any] | None = None,
+    kind: str = "internal",
+    context: Any = None,
+    end_on_exit: bool = True,
+):
+    """
+    Start a span as a child of the current span (or of `context`, if given) and make
+    it the current span, for use as a context manager.
+
+    If `end_on_exit` is `False`, the span is only ended when the `with` block raises,
+    otherwise it must be ended with `end_span()`.
+    """
+    if trace is None:
+        return _NOOP_SPAN
+
+    return _CurrentSpan(
+        _tracer.start_span(
+            name, context=context, kind=_SPAN_KINDS[kind], attributes=attributes
+        ),
+        end_on_exit,
+    )
+
+def end_span(span, exc_value: BaseException | None = None) -> None:
+    """
+    End a span started with `end_on_exit=False`, recording `exc_value` if it failed.
+    """
+    if trace is None:
+        return
+
+    if exc_value is not None:
+        _record_exception(span, exc_value)
+
+    span.end()
+
+def _record_exception(span, exc_value: BaseException) -> None:
+    span.record_exception(exc_value)
+    span.set_status(
+        Status(StatusCode.ERROR, f"{type(exc_value).__name__}: {exc_value}")
+    )
+
+def current_span():
+    """
+    Get the current span, so attributes can be added to it.
+    """
+    if trace is None:
+        return _NOOP_SPAN
+
+    return trace.get_current_span()
+
+def mark_error(span, description: str) -> None:
+    """
+    Mark a span as failed without an exception, for example for error responses.
+    """
+    if trace is None:
+        return
+
+    span.set_status(Status(StatusCode.ERROR, description))
+
+def inject(headers: dict[str, str]) -> None:
+    """
+    Add the trace context of the current span (e.g. `traceparent`) to outgoing
+    request headers.
+    """
+    if propagate is None:
+        return
+
+    propagate.inject(headers)
+
+def extract(headers: Mapping[str, str]) -> Any:
+    """
+    Get the trace context from incoming request headers, to continue the caller's
+    trace. `headers` must use lower-case header names.
+    """
+    if propagate is None:
+        return None
+
+    return propagate.extract(headers)
+
+_propagation_headers: tuple[Any, frozenset[bytes]] | None = None
+
+def propagation_headers() -> frozenset[bytes]:
+    """
+    The lower-case names of the headers `extract()` reads, as raw ASGI header names.
+    """
+    global _propagation_headers
+
+    if propagate is None:
+        return frozenset()
+
+    textmap = propagate.get_global_textmap()
+    if _propagation_headers is None or _propagation_headers[0] is not textmap:
+        _propagation_headers = (
+            textmap,
+            frozenset(field.lower().encode("latin1") for field in textmap.fields),
+        )
+
+    return _propagation_headers[1]
@@ -5,15 +5,20 @@ SPDX-License-Identifier: BSD-3-Clause
 For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
 """
 
+import asyncio
+import orjson
 import os
+import threading
+import time
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime
-from functools import lru_cache
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Mapping, Optional
 from urllib.parse import urlparse
 from yarl import URL
 
+from . import metrics
 from .config import Config
 from .connection import Connection
 from .data_api import DataAPI
@@ -50,6 +55,23 @@ class Org:
     api_version: str
     user_auth: UserAuth
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class AuthorizationResults:
+    """
+    The outcome of resolving several authorizations with `Authorization.find_many`.
+    """
+
+    authorizations: dict[str, "Authorization"]
+    """
+    The authorizations that were found, keyed by developer name.
+    """
+
+    errors: dict[str, Exception]
+    """
+    The exceptions raised while looking up the remaining developer names, keyed by
+    developer name.
+    """
+
 @dataclass
 class Authorization:
     """
@@ -102,7 +124,8 @@ class Authorization:
 
     created_at: datetime
     """
-    The date and time the authorization was created.
+    The date and time the authorization was created, as a timezone-aware UTC
+    datetime.
 
     For example: `2025-03-06T18:20:42.226577Z`
     """
@@ -123,7 +146,8 @@ class Authorization:
 
     last_modified_at: datetime
     """
-    The date and time the authorization was last modified.
+    The date and time the authorization was last modified, as a timezone-aware UTC
+    datetime.
 
     For example: `2025-03-06T18:20:42.226577Z`
     """
@@ -144,7 +168,8 @@ class Authorization:
     async def find(
         developer_name: str,
         attachment_or_url: str|None=None,
-        config: Config=Config.default()
+        config: Config=Config.default(),
+        use_cache: bool=False,
     ) -> "Authorization":
         """
         Fetch authorization for a given Heroku AppLink developer.
@@ -162,6 +187,13 @@ class Authorization:
         result = await authorization.data_api.query("SELECT Id, Name FROM Account")
         ```
 
+        Every fetched authorization is stored in an in-process cache. If `use_cache`
+        is `True`, a cached authorization for the same developer name and add-on is
+        returned without making a request. Cached authorizations expire after 5
+        minutes, and only the 1024 most recently used ones are kept. Use
+        `Authorization.clear_cache()` to drop cached authorizations, for example after
+        their access tokens were revoked.
+
         This function will raise aiohttp-specific exceptions for HTTP errors and
         any HTTP response other than 200 OK.
 
@@ -172,8 +204,92 @@ class Authorization:
         if not developer_name:
             raise ValueError("Developer name must be provided")
 
+        auth_bundle = _resolve_attachment_or_url(attachment_or_url)
+
+        if use_cache:
+            cached = _authorization_cache.get((auth_bundle.api_url, developer_name))
+
+            if cached is not None:
+                return cached
+
+        return await Authorization._fetch(Connection(config), auth_bundle, developer_name)
+
+    @staticmethod
+    async def find_many(
+        developer_names: list[str],
+        attachment_or_url: str|None=None,
+        config: Config=Config.default(),
+        concurrency: int=10,
+    ) -> AuthorizationResults:
+        """
+        Fetch authorizations for several Heroku AppLink developer names concurrently,
+        for example to pre-warm the authorization cache when an app boots.
+
+        All lookups share a single `Connection`, and at most `concurrency` requests
+        are in flight at the same time. A failing lookup doesn't affect the others:
+        its exception is reported in `AuthorizationResults.errors` instead of being
+        raised. Successfully fetched authorizations are stored in the cache used by
+        `Authorization.find(..., use_cache=True)`.
+
+        Example usage:
+
+        ```python
+        results = await Authorization.find_many(["org1", "org2", "org3"])
+
+        for developer_name, error in results.errors.items():
+            print(f"Failed to fetch authorization for {developer_name}: {error}")
+
+        # Later, served from the cache without a request.
+        authorization = await Authorization.find("org1", use_cache=True)
+        ```
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
         connection = Connection(config)
         auth_bundle = _resolve_attachment_or_url(attachment_or_url)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(developer_name: str) -> "Authorization":
+            if not developer_name:
+                raise ValueError("Developer name must be provided")
+
+            async with semaphore:
+                return await Authorization._fetch(connection, auth_bundle, developer_name)
+
+        unique_names = list(dict.fromkeys(developer_names))
+        outcomes = await asyncio.gather(
+            *(fetch(developer_name) for developer_name in unique_names),
+            return_exceptions=True,
+        )
+
+        authorizations: dict[str, Authorization] = {}
+        errors: dict[str, Exception] = {}
+
+        for developer_name, outcome in zip(unique_names, outcomes):
+            if isinstance(outcome, Authorization):
+                authorizations[developer_name] = outcome
+            elif isinstance(outcome, Exception):
+                errors[developer_name] = outcome
+            else:
+                # Don't swallow `asyncio.CancelledError` and friends.
+                raise outcome
+
+        return AuthorizationResults(authorizations=authorizations, errors=errors)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Remove all authorizations from the in-process authorization cache.
+        """
+        _authorization_cache.clear()
+
+    @staticmethod
+    async def _fetch(
+        connection: Connection,
+        auth_bundle: AuthBundle,
+        developer_name: str,
+    ) -> "Authorization":
         request_url = URL(auth_bundle.api_url) / f"authorizations/{developer_name}"
 
         headers = {
@@ -184,9 +300,14 @@ class Authorization:
 
         response = await connection.request("GET", request_url, headers=headers)
         response.raise_for_status()
-        payload = await response.json()
+        # Using orjson over `response.json()` for faster deserialization, consistent
+        # with the Data API client.
+        payload = orjson.loads(await response.read())
 
-        return Authorization._build_authorization(connection, payload)
+        authorization = Authorization._build_authorization(connection, payload)
+        _authorization_cache.put((auth_bundle.api_url, developer_name), authorization)
+
+        return authorization
 
     @staticmethod
     def _build_authorization(connection: Connection, payload: dict) -> "Authorization":
@@ -224,11 +345,79 @@ class Authorization:
             redirect_uri=payload.get("redirect_uri"),
         )
 
+class _AuthorizationCache:
+    """
+    Authorizations fetched by `Authorization.find` and `Authorization.find_many`, keyed
+    by add-on API URL and developer name.
+
+    Entries expire `ttl` seconds after they were fetched, so a revoked or refreshed
+    access token isn't served forever. Once the cache holds `max_size` entries, the
+    least recently used one is evicted.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1024):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Authorization]] = OrderedDict()
+        # The WSGI middleware may be called from several threads at once.
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> Authorization | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and time.monotonic() >= entry[0]:
+                del self._entries[key]
+                entry = None
+
+            metrics._record_cache_lookup("authorization", entry is not None)
+
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple[str, str], authorization: Authorization) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, authorization)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_authorization_cache = _AuthorizationCache()
+
 def _parse_datetime(datetime_str: str) -> datetime:
     """
-    Parse a datetime string into a datetime object.
+    Parse a datetime string such as `2025-03-06T18:20:42.226577Z` into a timezone-aware
+    UTC datetime object. Datetimes without a `Z` suffix or UTC offset are taken to be
+    in UTC.
     """
-    return datetime.strptime(datetime_str, "%Y-%m-%dT%H:%M:%S.%fZ")
+    # Python 3.10's `fromisoformat` doesn't understand the `Z` suffix and only accepts
+    # 3 or 6 fractional digits, so anything else falls back to `strptime`.
+    try:
+        if datetime_str.endswith("Z"):
+            parsed = datetime.fromisoformat(datetime_str[:-1])
+        else:
+            parsed = datetime.fromisoformat(datetime_str)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(datetime_str, "%Y-%m-%dT%H:%M:%S.%f%z")
+        except ValueError:
+            parsed = datetime.strptime(datetime_str, "%Y-%m-%dT%H:%M:%S.%f")
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.astimezone(timezone.utc)
 
 def _resolve_attachment_or_url(attachment_or_url: Optional[str] = None) -> AuthBundle:
    if attachment_or_url:
@@ -243,57 +432,148 @@ def _is_valid_url(url: str) -> bool:
     result = urlparse(url)
     return all([result.scheme, result.netloc])
 
-@lru_cache(maxsize=None)
-def _resolve_addon_config_by_attachment_or_color(attachment_or_color: str) -> AuthBundle:
+class _AddonConfigIndex:
     """
-    First try:
-      {ATTACHMENT}_API_URL / _TOKEN
-    Then fallback to:
-      HEROKU_APPLINK_{COLOR}_API_URL / _TOKEN
+    An index of every Heroku AppLink add-on config (`{PREFIX}_API_URL` and
+    `{PREFIX}_TOKEN` pairs) found in the environment, so resolving an attachment,
+    color, or API URL is a dictionary lookup instead of a scan of `os.environ`.
+
+    The index is built once at import time. A lookup that misses rebuilds it if any
+    add-on config var (`*_API_URL`, `*_TOKEN`, `HEROKU_APP_ID`, or
+    `HEROKU_APPLINK_ADDON_NAME`) was added, removed, or changed since, so config vars
+    that were set later are still found, while repeated misses for unknown
+    attachments don't rebuild the index every time. Changed values of config vars
+    that are found, such as a rotated token, are only picked up after calling
+    `refresh()`.
     """
-    addon_prefix = os.getenv("HEROKU_APPLINK_ADDON_NAME", "HEROKU_APPLINK")
-    key = attachment_or_color.upper()
 
-    api_url = os.getenv(f"{key}_API_URL")
-    token   = os.getenv(f"{key}_TOKEN")
-    app_uuid = os.getenv("HEROKU_APP_ID")
+    def __init__(self) -> None:
+        self.refresh()
 
-    if not app_uuid:
-        raise EnvironmentError("HEROKU_APP_ID is not set")
+    def refresh(self) -> None:
+        """
+        Rebuild the index from the current environment.
+        """
+        environ = os.environ.copy()
+        app_uuid = environ.get("HEROKU_APP_ID")
+        addon_prefix = environ.get("HEROKU_APPLINK_ADDON_NAME", "HEROKU_APPLINK")
 
-    if not api_url or not token:
-        # fallback: color under the main addon prefix
-        api_url = os.getenv(f"{addon_prefix}_{key}_API_URL")
-        token   = os.getenv(f"{addon_prefix}_{key}_TOKEN")
+        bundles: dict[str, AuthBundle] = {}
+        url_prefixes: dict[str, str] = {}
 
-    if not api_url or not token:
-        raise EnvironmentError(
-            f"Heroku Applink config not found for '{attachment_or_color}'. "
-            f"Looked for {key}_API_URL / {key}_TOKEN and "
-            f"{addon_prefix}_{key}_API_URL / {addon_prefix}_{key}_TOKEN"
-        )
+        for var, val in environ.items():
+            if not var.endswith("_API_URL"):
+                continue
 
-    return AuthBundle(api_url=api_url, token=token, app_uuid=app_uuid)
+            prefix = var[: -len("_API_URL")]
+            # The first matching variable wins, like the previous `os.environ` scan.
+            url_prefixes.setdefault(val.lower(), prefix)
 
-@lru_cache(maxsize=None)
-def _resolve_addon_config_by_url(url: str) -> AuthBundle:
-    """
-    Match an env var ending in _API_URL to the given URL, then
-    pull the corresponding _TOKEN.
-    """
-    app_uuid = os.getenv("HEROKU_APP_ID")
+            token = environ.get(f"{prefix}_TOKEN")
+            if app_uuid and val and token:
+                bundles[prefix] = AuthBundle(api_url=val, token=token, app_uuid=app_uuid)
 
-    if not app_uuid:
-        raise EnvironmentError("HEROKU_APP_ID is not set")
+        # Swap in the new index with a single assignment, so concurrent lookups never
+        # see a partially built one.
+        self._index = (app_uuid, addon_prefix, bundles, url_prefixes)
+        self._fingerprint = _addon_config_fingerprint(environ)
 
-    for var, val in os.environ.items():
-        if var.endswith("_API_URL") and val.lower() == url.lower():
-            prefix = var[: -len("_API_URL")]
-            token = os.getenv(f"{prefix}_TOKEN")
+    def by_attachment_or_color(self, attachment_or_color: str) -> AuthBundle:
+        key = attachment_or_color.upper()
+
+        bundle = self._lookup_attachment_or_color(key)
+        if bundle is None and self._refresh_if_changed():
+            bundle = self._lookup_attachment_or_color(key)
+
+        app_uuid, addon_prefix, _, _ = self._index
+
+        if not app_uuid:
+            raise EnvironmentError("HEROKU_APP_ID is not set")
+
+        if bundle is None:
+            raise EnvironmentError(
+                f"Heroku Applink config not found for '{attachment_or_color}'. "
+                f"Looked for {key}_API_URL / {key}_TOKEN and "
+                f"{addon_prefix}_{key}_API_URL / {addon_prefix}_{key}_TOKEN"
+            )
+
+        return bundle
+
+    def by_url(self, url: str) -> AuthBundle:
+        lowered_url = url.lower()
+
+        prefix = self._index[3].get(lowered_url)
+        if (prefix is None or prefix not in self._index[2]) and self._refresh_if_changed():
+            prefix = self._index[3].get(lowered_url)
+
+        app_uuid, _, bundles, _ = self._index
+
+        if not app_uuid:
+            raise EnvironmentError("HEROKU_APP_ID is not set")
 
-            if not token:
-                raise EnvironmentError(f"Missing token for API URL: {url}")
+        if prefix is None:
+            raise EnvironmentError(f"Heroku Applink config not found for API URL: {url}")
 
-            return AuthBundle(api_url=val, token=token, app_uuid=app_uuid)
+        bundle = bundles.get(prefix)
+        if bundle is None:
+            raise EnvironmentError(f"Missing token for API URL: {url}")
 
-    raise EnvironmentError(f"Heroku Applink config not found for API URL: {url}")
+        return bundle
+
+    def _refresh_if_changed(self) -> bool:
+        """
+        Rebuild the index if add-on config vars were added, removed, or changed since
+        it was built, returning whether it was rebuilt.
+        """
+        if _addon_config_fingerprint(os.environ) == self._fingerprint:
+            return False
+
+        self.refresh()
+        return True
+
+    def _lookup_attachment_or_color(self, key: str) -> AuthBundle | None:
+        _, addon_prefix, bundles, _ = self._index
+
+        # First try {ATTACHMENT}_API_URL / _TOKEN, then fall back to
+        # HEROKU_APPLINK_{COLOR}_API_URL / _TOKEN.
+        bundle = bundles.get(key)
+        if bundle is None:
+            bundle = bundles.get(f"{addon_prefix}_{key}")
+
+        return bundle
+
+def _addon_config_fingerprint(environ: Mapping[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(
+        (var, val)
+        for var, val in environ.items()
+        if var.endswith(("_API_URL", "_TOKEN")) or var in _ADDON_CONFIG_VARS
+    )
+
+_ADDON_CONFIG_VARS = frozenset({"HEROKU_APP_ID", "HEROKU_APPLINK_ADDON_NAME"})
+
+_addon_config_index = _AddonConfigIndex()
+
+def refresh_addon_config() -> None:
+    """
+    Re-read the Heroku AppLink add-on config vars from the environment.
+
+    Add-on config is indexed once at import time. Call this after config vars were
+    changed in-process, for example when an add-on token was rotated.
+    """
+    _addon_config_index.refresh()
+
+def _resolve_addon_config_by_attachment_or_color(attachment_or_color: str) -> AuthBundle:
+    """
+    First try:
+      {ATTACHMENT}_API_URL / _TOKEN
+    Then fallback to:
+      HEROKU_APPLINK_{COLOR}_API_URL / _TOKEN
+    """
+    return _addon_config_index.by_attachment_or_color(attachment_or_color)
+
+def _resolve_addon_config_by_url(url: str) -> AuthBundle:
+    """
+    Match an env var ending in _API_URL to the given URL, then
+    pull the corresponding _TOKEN.
+    """
+    return _addon_config_index.by_url(url)
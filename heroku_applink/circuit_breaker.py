@@ -0,0 +1,162 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass
+
+from . import metrics
+from .exceptions import CircuitOpenError
+
+__all__ = ["CircuitBreakerPolicy"]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CircuitBreakerPolicy:
+    """
+    Configures a circuit breaker per org domain. When an org's requests keep failing,
+    further requests to it fail fast with `CircuitOpenError` instead of waiting for
+    their timeout, so a single degraded org can't tie up the connections and workers
+    shared with healthy ones.
+
+    The circuit opens after `failure_threshold` consecutive failures, or when at
+    least `timeout_rate_threshold` of the last `window_size` requests timed out.
+    After `open_duration` seconds, up to `half_open_probes` requests are let
+    through: if they succeed the circuit closes, otherwise it opens again.
+
+    Connection errors, timeouts and `502`, `503` and `504` responses count as
+    failures.
+
+    ```python
+    config = sdk.Config(circuit_breaker=sdk.CircuitBreakerPolicy(failure_threshold=5))
+    ```
+    """
+
+    failure_threshold: int = 5
+    """Consecutive failures after which the circuit opens."""
+
+    timeout_rate_threshold: float = 0.5
+    """Share of timed out requests in the window, between `0` and `1`, after which the circuit opens."""
+
+    window_size: int = 20
+    """How many recent requests the timeout rate is computed from. It's only computed once the window is full."""
+
+    open_duration: float = 30.0
+    """Seconds the circuit stays open before probe requests are let through."""
+
+    half_open_probes: int = 1
+    """How many probe requests may be in flight while the circuit is half-open."""
+
+
+_CLOSED = "closed"
+_OPEN = "open"
+_HALF_OPEN = "half_open"
+
+# Values of the state gauge, so dashboards can plot it.
+_STATE_VALUES = {_CLOSED: 0, _OPEN: 1, _HALF_OPEN: 2}
+
+
+class _CircuitBreaker:
+    """
+    The circuit breaker state of a single org domain.
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy, org: str):
+        self._policy = policy
+        self._org = org
+        self._state = _CLOSED
+        self._consecutive_failures = 0
+        self._timeouts: deque[bool] = deque(maxlen=policy.window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def before_request(self) -> bool:
+        """
+        Check whether a request may be sent, raising `CircuitOpenError` if not.
+        Returns whether the request is a probe of a half-open circuit.
+        """
+        with self._lock:
+            if self._state == _OPEN:
+                if time.monotonic() - self._opened_at < self._policy.open_duration:
+                    self._reject()
+                self._set_state(_HALF_OPEN)
+
+            if self._state == _HALF_OPEN:
+                if self._probes_in_flight >= self._policy.half_open_probes:
+                    self._reject()
+                self._probes_in_flight += 1
+                return True
+
+            return False
+
+    def record_success(self, probe: bool) -> None:
+        with self._lock:
+            if probe:
+                self._probes_in_flight -= 1
+
+            self._consecutive_failures = 0
+            self._timeouts.append(False)
+
+            if self._state == _HALF_OPEN and probe:
+                self._timeouts.clear()
+                self._set_state(_CLOSED)
+
+    def record_failure(self, probe: bool, timeout: bool) -> None:
+        with self._lock:
+            if probe:
+                self._probes_in_flight -= 1
+
+            self._consecutive_failures += 1
+            self._timeouts.append(timeout)
+
+            if self._state == _HALF_OPEN:
+                if probe:
+                    self._open()
+                return
+
+            if self._state == _CLOSED and (
+                self._consecutive_failures >= self._policy.failure_threshold
+                or self._timeout_rate_exceeded()
+            ):
+                self._open()
+
+    def release_probe(self) -> None:
+        """
+        Give back a probe slot without an outcome, for example when the request was
+        cancelled.
+        """
+        with self._lock:
+            self._probes_in_flight -= 1
+
+    def _timeout_rate_exceeded(self) -> bool:
+        if len(self._timeouts) < self._policy.window_size:
+            return False
+
+        return sum(self._timeouts) / len(self._timeouts) >= self._policy.timeout_rate_threshold
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._consecutive_failures = 0
+        self._set_state(_OPEN)
+        metrics._CIRCUIT_BREAKER_OPENED.inc(org=self._org)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        metrics._CIRCUIT_BREAKER_STATE.set(_STATE_VALUES[state], org=self._org)
+
+    def _reject(self) -> None:
+        metrics._CIRCUIT_BREAKER_REJECTED.inc(org=self._org)
+        raise CircuitOpenError(
+            f"The circuit breaker for {self._org} is open after repeated failures"
+        )
@@ -8,6 +8,13 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 import importlib.metadata
 
 from dataclasses import dataclass
+from typing import Callable
+
+from .circuit_breaker import CircuitBreakerPolicy
+from .hedging import HedgingPolicy
+from .instrumentation import Instrumentation
+from .transport import Transport
+from .write_batching import WriteBatchingPolicy
 
 @dataclass
 class Config:
@@ -37,6 +44,86 @@ class Config:
     Timeout for reading from the Salesforce Data API.
     """
 
+    data_api_pool_size: int = 128
+    """
+    Maximum number of `DataAPI` instances the middlewares keep for reuse across
+    requests with the same org domain, API version, and access token. The least
+    recently used instance is evicted when the pool is full. Set to `0` to create a
+    new `DataAPI` for every request.
+    """
+
+    max_retries: int = 0
+    """
+    How many times an idempotent request (`GET`, `HEAD`, `OPTIONS`, `PUT`, or
+    `DELETE`) is retried after a connection error, a timeout, or a `502`, `503`,
+    or `504` response. Retries are disabled by default.
+    """
+
+    retry_backoff: float = 0.1
+    """
+    Delay in seconds before the first retry. The delay doubles with every further
+    retry.
+    """
+
+    request_deadline: float | None = None
+    """
+    Time budget in seconds for all outbound requests made while handling an
+    incoming request. The middlewares set it as the request's deadline (see
+    `set_deadline()`), so outbound requests don't outlive a caller that already gave
+    up. Disabled by default.
+    """
+
+    deadline_header: str | None = None
+    """
+    Name of an incoming request header carrying the caller's remaining time budget in
+    seconds, such as `x-request-timeout`. If both this header and `request_deadline`
+    are present, the shorter one applies.
+    """
+
+    hedging: HedgingPolicy | None = None
+    """
+    Send a duplicate of Data API queries that are slower than usual for their org,
+    and use whichever response arrives first. See `HedgingPolicy`. Disabled by
+    default.
+    """
+
+    circuit_breaker: CircuitBreakerPolicy | None = None
+    """
+    Fail fast with `CircuitOpenError` for orgs whose requests keep failing, instead
+    of waiting for every request to time out. See `CircuitBreakerPolicy`. Disabled by
+    default.
+    """
+
+    write_batching: WriteBatchingPolicy | None = None
+    """
+    Send concurrent `DataAPI.create()`, `DataAPI.update()`, and `DataAPI.delete()`
+    calls for the same org together as sObject Collections requests. See
+    `WriteBatchingPolicy`. Disabled by default.
+    """
+
+    exact_decimals: bool = False
+    """
+    Parse currency and percent values of queries with `convert_field_types` exactly
+    as written in the response, so values with more significant digits than a float
+    holds (about 15) keep all of them. Those responses are then parsed with the
+    standard library's JSON parser instead of `orjson`, which is several times
+    slower. Disabled by default.
+    """
+
+    transport: Callable[["Config"], Transport] | None = None
+    """
+    Creates the transport that sends a connection's requests, called with this
+    config. Defaults to `AiohttpTransport`, which uses HTTP/1.1. Set it to
+    `Http2Transport` to multiplex concurrent requests to an org over a single
+    HTTP/2 connection.
+    """
+
+    instrumentation: Instrumentation | None = None
+    """
+    Receives callbacks about every outbound HTTP request, such as its phase timings,
+    status code, response size, and retries. See `Instrumentation`.
+    """
+
     @classmethod
     def default(cls) -> "Config":
         return cls(
@@ -44,6 +131,17 @@ class Config:
             connect_timeout=None,
             socket_connect=None,
             socket_read=None,
+            data_api_pool_size=128,
+            max_retries=0,
+            retry_backoff=0.1,
+            request_deadline=None,
+            deadline_header=None,
+            hedging=None,
+            circuit_breaker=None,
+            write_batching=None,
+            exact_decimals=False,
+            transport=None,
+            instrumentation=None,
         )
 
     def user_agent(self) -> str:
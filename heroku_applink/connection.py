@@ -7,14 +7,34 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 
 import aiohttp
 import asyncio
+import dataclasses
+import time
 import uuid
+import weakref
 
 from contextvars import ContextVar
+from typing import Any, Coroutine, Generator
+from yarl import URL
 
+from . import _tracing, metrics
+from .circuit_breaker import _CircuitBreaker
 from .config import Config
+from .exceptions import DeadlineExceededError
+from .hedging import _LatencyWindow
+from .instrumentation import RequestEvent
+from .transport import AiohttpTransport, Response, Transport
 
 request_id: ContextVar[str] = ContextVar("request_id")
 
+# The `time.monotonic()` value by which the current request must be done, if any.
+deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+# Retrying these methods can't cause the same change to be applied twice.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Responses with these status codes signal a transient problem worth retrying.
+_RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
 def get_request_id() -> str:
     """
     Get the request ID for the current request.
@@ -27,6 +47,29 @@ def set_request_id(new_request_id: str):
     """
     request_id.set(new_request_id)
 
+def get_deadline() -> float | None:
+    """
+    Get the deadline for the current request as a `time.monotonic()` value, or
+    `None` if there is none.
+    """
+    return deadline.get()
+
+def set_deadline(timeout: float | None):
+    """
+    Set the deadline for the current request to `timeout` seconds from now, or
+    remove it if `timeout` is `None`. Outbound requests made until then have their
+    timeout clamped to the remaining time, and fail with `DeadlineExceededError` once
+    it ran out.
+    """
+    deadline.set(None if timeout is None else time.monotonic() + timeout)
+
+def _remaining_time() -> float | None:
+    current_deadline = deadline.get()
+    if current_deadline is None:
+        return None
+
+    return current_deadline - time.monotonic()
+
 class Connection:
     """
     A connection for making asynchronous HTTP requests.
@@ -34,7 +77,18 @@ class Connection:
 
     def __init__(self, config: Config):
         self._config = config
-        self._session = None
+        self._transport: Transport | None = None
+        self._in_flight = 0
+        self._latencies: dict[str, _LatencyWindow] = {}
+        self._circuit_breakers: dict[str, _CircuitBreaker] = {}
+        _live_connections.add(self)
+
+    @property
+    def config(self) -> Config:
+        """
+        The configuration of this connection.
+        """
+        return self._config
 
     def _decode_headers(self, headers: dict) -> dict:
         """
@@ -56,16 +110,38 @@ class Connection:
         params=None,
         headers=None,
         data=None,
-        timeout: float|None=None
-    ) -> aiohttp.ClientResponse:
+        timeout: float|None=None,
+        hedge: bool=False,
+    ) -> "_RequestContextManager":
         """
         Make an HTTP request to the given URL.
 
         If a timeout is provided, it will be used to set the timeout for the request.
-        """
 
-        if timeout is not None:
-            timeout = aiohttp.ClientTimeout(total=timeout)
+        Like `aiohttp.ClientSession.request`, the result can be awaited for the
+        response, or used with `async with` to release the response when done:
+
+        ```python
+        async with connection.request("GET", url) as response:
+            body = await response.json()
+        ```
+
+        The response body is read before the response is returned, so reading it
+        again doesn't perform any I/O. Idempotent requests are retried according to
+        `Config.max_retries`, and `Config.instrumentation` is notified about every
+        attempt.
+
+        If a deadline is set for the current request (see `set_deadline()`), the
+        timeout of every attempt is clamped to the remaining time, and
+        `DeadlineExceededError` is raised once it ran out.
+
+        If `hedge` is set and `Config.hedging` is configured, a duplicate of a slow
+        attempt is sent and the first response wins. Only use it for requests that
+        are safe to send twice.
+
+        If `Config.circuit_breaker` is configured, `CircuitOpenError` is raised
+        without making a request while the circuit for the URL's host is open.
+        """
 
         default_headers = {
             # Always include the user-agent header in all outbound requests.
@@ -85,24 +161,296 @@ class Connection:
         headers = self._decode_headers(headers)
         headers = {**(headers or {}), **default_headers}
 
-        response = self._client().request(
-            method,
-            url,
-            params=params,
-            headers=headers,
-            data=data,
-            timeout=timeout
+        return _RequestContextManager(
+            self._request_with_retries(method, url, params, headers, data, timeout, hedge)
+        )
+
+    async def _request_with_retries(
+        self, method, url, params, headers, data, timeout, hedge
+    ) -> Response:
+        """
+        Make the attempts of a request until one succeeds or it may not be retried.
+        """
+        retryable = str(method).upper() in _IDEMPOTENT_METHODS
+        circuit_breaker = self._circuit_breaker(url)
+        attempt = 1
+
+        while True:
+            event = RequestEvent(
+                method=method,
+                url=str(url),
+                request_id=headers["X-Request-Id"],
+                attempt=attempt,
+                start_time=time.perf_counter(),
+            )
+
+            probe = (
+                circuit_breaker.before_request() if circuit_breaker is not None else False
+            )
+
+            try:
+                attempt_timeout = self._attempt_timeout(method, url, timeout)
+
+                if hedge and self._config.hedging is not None:
+                    response = await self._hedged_attempt(
+                        event, params, headers, data, attempt_timeout
+                    )
+                else:
+                    response = await self._attempt(
+                        event,
+                        params=params,
+                        headers=headers,
+                        data=data,
+                        timeout=attempt_timeout,
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                remaining_time = _remaining_time()
+                if remaining_time is not None and remaining_time <= 0:
+                    # Running out of the caller's budget says nothing about the org.
+                    if probe:
+                        circuit_breaker.release_probe()
+
+                    raise DeadlineExceededError(
+                        f"The deadline was exceeded during {method} {url}"
+                    ) from e
+
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure(
+                        probe, timeout=isinstance(e, asyncio.TimeoutError)
+                    )
+
+                if self._should_retry(retryable, attempt):
+                    await self._wait_before_retry(event)
+                    attempt += 1
+                    continue
+
+                raise
+            except BaseException:
+                if probe:
+                    circuit_breaker.release_probe()
+                raise
+
+            if circuit_breaker is not None:
+                if response.status in _RETRYABLE_STATUS_CODES:
+                    circuit_breaker.record_failure(probe, timeout=False)
+                else:
+                    circuit_breaker.record_success(probe)
+
+            if response.status in _RETRYABLE_STATUS_CODES and self._should_retry(
+                retryable, attempt
+            ):
+                response.release()
+                await self._wait_before_retry(event)
+                attempt += 1
+                continue
+
+            return response
+
+    def _circuit_breaker(self, url) -> _CircuitBreaker | None:
+        policy = self._config.circuit_breaker
+        if policy is None:
+            return None
+
+        host = URL(str(url)).host or ""
+        circuit_breaker = self._circuit_breakers.get(host)
+        if circuit_breaker is None:
+            circuit_breaker = self._circuit_breakers[host] = _CircuitBreaker(policy, host)
+
+        return circuit_breaker
+
+    async def _hedged_attempt(
+        self, event: RequestEvent, params, headers, data, timeout
+    ) -> Response:
+        """
+        Make an attempt, and if it's slower than the configured quantile of recent
+        latencies for the host, race it against a duplicate attempt.
+        """
+        policy = self._config.hedging
+        host = URL(event.url).host or ""
+        latencies = self._latencies.get(host)
+        if latencies is None:
+            latencies = self._latencies[host] = _LatencyWindow(policy.window_size)
+
+        delay = None
+        if len(latencies) >= policy.min_samples:
+            delay = max(latencies.quantile(policy.quantile), policy.min_delay)
+
+            # A hedge that can't be answered before the deadline is wasted work.
+            remaining_time = _remaining_time()
+            if remaining_time is not None and remaining_time <= delay:
+                delay = None
+
+        primary = asyncio.ensure_future(
+            self._attempt(event, params=params, headers=headers, data=data, timeout=timeout)
+        )
+
+        if delay is None:
+            response = await primary
+            latencies.observe(event.duration)
+            return response
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+        if done:
+            response = primary.result()
+            latencies.observe(event.duration)
+            return response
+
+        metrics._HTTP_HEDGED_REQUESTS.inc(org=host)
+        hedge_event = dataclasses.replace(event, start_time=time.perf_counter(), hedge=True)
+        secondary = asyncio.ensure_future(
+            self._attempt(
+                hedge_event,
+                params=params,
+                headers=dict(headers),
+                data=data,
+                timeout=timeout,
+            )
         )
+        events = {primary: event, secondary: hedge_event}
+        pending = {primary, secondary}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            metrics._HTTP_HEDGE_WINS.inc(org=host)
+                        latencies.observe(events[task].duration)
+                        return task.result()
+
+            # Both attempts failed; report the original one's error.
+            raise primary.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _attempt_timeout(self, method, url, timeout: float | None) -> float | None:
+        """
+        The timeout for the next attempt: the given `timeout` (or the configured
+        `request_timeout`), clamped to the time remaining until the deadline.
+        """
+        remaining_time = _remaining_time()
+
+        if remaining_time is not None:
+            if remaining_time <= 0:
+                raise DeadlineExceededError(
+                    f"The deadline was exceeded before {method} {url}"
+                )
+
+            timeout = min(
+                timeout if timeout is not None else self._config.request_timeout,
+                remaining_time,
+            )
+
+        return timeout
+
+    def _should_retry(self, retryable: bool, attempt: int) -> bool:
+        if not retryable or attempt > self._config.max_retries:
+            return False
+
+        # Don't start a retry that can't finish before the deadline anyway.
+        remaining_time = _remaining_time()
+        delay = self._retry_delay(attempt)
+        return remaining_time is None or remaining_time > delay
+
+    async def _attempt(
+        self, event: RequestEvent, params, headers, data, timeout
+    ) -> Response:
+        """
+        Make a single attempt of a request, reporting it to the configured
+        instrumentation and, if OpenTelemetry is installed, as a client span.
+        """
+        instrumentation = self._config.instrumentation
+        parsed_url = URL(event.url)
+
+        with _tracing.start_span(
+            f"HTTP {event.method}",
+            {
+                "http.request.method": event.method,
+                "server.address": parsed_url.host or "",
+                "url.path": parsed_url.path,
+                "http.request.resend_count": event.attempt - 1,
+                "heroku_applink.request_id": event.request_id,
+            },
+            kind="client",
+        ) as span:
+            # Propagate the trace context next to `X-Request-Id`.
+            _tracing.inject(headers)
+
+            if instrumentation is not None:
+                instrumentation.on_request_start(event)
+
+            org = parsed_url.host or ""
+            self._in_flight += 1
+            metrics._HTTP_REQUESTS_IN_FLIGHT.inc(org=org)
+
+            try:
+                response = await self._client().request(
+                    event.method,
+                    event.url,
+                    params=params,
+                    headers=headers,
+                    data=data,
+                    timeout=timeout,
+                    event=event,
+                )
+                body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                event.error = e
+                event.end_time = time.perf_counter()
+
+                if instrumentation is not None:
+                    instrumentation.on_request_end(event)
+
+                raise
+            finally:
+                self._in_flight -= 1
+                metrics._HTTP_REQUESTS_IN_FLIGHT.dec(org=org)
+
+            metrics._HTTP_RESPONSE_BYTES.inc(len(body), org=org)
+
+            event.status = response.status
+            event.response_size = len(body)
+            event.end_time = time.perf_counter()
 
-        return response
+            span.set_attribute("http.response.status_code", response.status)
+            span.set_attribute("http.response.body.size", event.response_size)
+            if not response.ok:
+                _tracing.mark_error(span, f"HTTP {response.status}")
+
+            if instrumentation is not None:
+                instrumentation.on_request_end(event)
+
+            return response
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self._config.retry_backoff * 2 ** (attempt - 1)
+
+    async def _wait_before_retry(self, event: RequestEvent):
+        delay = self._retry_delay(event.attempt)
+        metrics._HTTP_RETRIES.inc(org=URL(event.url).host or "")
+
+        if self._config.instrumentation is not None:
+            self._config.instrumentation.on_retry(event, delay)
+
+        await asyncio.sleep(delay)
 
     async def close(self):
         """
         Close the connection.
         """
-        if self._session:
-            await self._session.close()
-            self._session = None
+        if self._transport is not None:
+            await self._transport.close()
+            self._transport = None
 
     def __del__(self):
         """
@@ -114,21 +462,68 @@ class Connection:
         except RuntimeError:
             asyncio.run(self.close())
 
-    def _client(self) -> aiohttp.ClientSession:
+    def _client(self) -> Transport:
         """
-        Lazily get the underlying `aiohttp.ClientSession`. This session is
+        Lazily create the transport configured with `Config.transport`. It's
         persisted so we can take advantage of connection pooling.
         """
-        if self._session is None:
-            self._session = aiohttp.ClientSession(
-                # Disable cookie storage using `DummyCookieJar`, given that we
-                # don't need cookie support.
-                cookie_jar=aiohttp.DummyCookieJar(),
-                timeout=aiohttp.ClientTimeout(
-                    total=self._config.request_timeout,
-                    connect=self._config.connect_timeout,
-                    sock_connect=self._config.socket_connect,
-                    sock_read=self._config.socket_read,
-                ),
-            )
-        return self._session
+        if self._transport is None:
+            transport_factory = self._config.transport or AiohttpTransport
+            self._transport = transport_factory(self._config)
+        return self._transport
+
+
+class _RequestContextManager:
+    """
+    The result of `Connection.request`: awaiting it returns the response, and using
+    it with `async with` also releases the response afterwards.
+    """
+
+    __slots__ = ("_coroutine", "_response")
+
+    def __init__(self, coroutine: Coroutine[Any, Any, Response]):
+        self._coroutine = coroutine
+        self._response: Response | None = None
+
+    def __await__(self) -> Generator[Any, None, Response]:
+        return self._coroutine.__await__()
+
+    def close(self) -> None:
+        self._coroutine.close()
+
+    async def __aenter__(self) -> Response:
+        self._response = await self._coroutine
+        return self._response
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._response.release()
+
+
+# Every `Connection` that hasn't been garbage collected, for the pool utilization metric.
+_live_connections: "weakref.WeakSet[Connection]" = weakref.WeakSet()
+
+def _pool_utilization() -> float:
+    """
+    Requests in flight across all connections, relative to their combined connection
+    pool limits. Values above `1` mean requests are waiting for a free connection.
+    """
+    in_flight = 0
+    limit = 0
+
+    for connection in list(_live_connections):
+        pool_limit = (
+            connection._transport.pool_limit()
+            if connection._transport is not None
+            else None
+        )
+        if pool_limit is not None:
+            in_flight += connection._in_flight
+            limit += pool_limit
+
+    return in_flight / limit if limit else 0.0
+
+metrics.REGISTRY.gauge(
+    "heroku_applink_connection_pool_utilization",
+    "Outbound requests in flight relative to the combined connection pool limits.",
+    callback=_pool_utilization,
+)
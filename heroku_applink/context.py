@@ -7,14 +7,19 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 
 import json
 import base64
+import threading
 
+from collections import OrderedDict
 from contextvars import ContextVar
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Iterable
 
+from . import metrics
 from .data_api import DataAPI
+from .data_api.loader import RecordLoader
 from .connection import Connection
 
-__all__ = ["User", "Org", "ClientContext"]
+__all__ = ["User", "Org", "ClientContext", "DataAPIPool"]
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class User:
@@ -59,6 +64,61 @@ class Org:
     """The currently logged in user."""
 
 
+class DataAPIPool:
+    """
+    A bounded pool of `DataAPI` instances keyed by org domain URL, API version, and
+    access token.
+
+    Incoming requests for the same org and user reuse the same `DataAPI`, so any state
+    it keeps (such as cached describe metadata) survives between requests. Once the
+    pool holds `max_size` instances, the least recently used one is evicted.
+    """
+
+    def __init__(self, connection: Connection, max_size: int = 128):
+        self._connection = connection
+        self._max_size = max_size
+        self._data_apis: OrderedDict[tuple[str, str, str], DataAPI] = OrderedDict()
+        # The WSGI middleware may be called from several threads at once.
+        self._lock = threading.Lock()
+
+    def get(self, org_domain_url: str, api_version: str, access_token: str) -> DataAPI:
+        """
+        Get the pooled `DataAPI` for the given org domain URL, API version, and access
+        token, creating it if needed.
+        """
+        if self._max_size <= 0:
+            return self._create(org_domain_url, api_version, access_token)
+
+        key = (org_domain_url, api_version, access_token)
+
+        with self._lock:
+            data_api = self._data_apis.get(key)
+            metrics._record_cache_lookup("data_api_pool", data_api is not None)
+
+            if data_api is not None:
+                self._data_apis.move_to_end(key)
+                return data_api
+
+            data_api = self._create(org_domain_url, api_version, access_token)
+            self._data_apis[key] = data_api
+
+            while len(self._data_apis) > self._max_size:
+                self._data_apis.popitem(last=False)
+
+            return data_api
+
+    def __len__(self) -> int:
+        return len(self._data_apis)
+
+    def _create(self, org_domain_url: str, api_version: str, access_token: str) -> DataAPI:
+        return DataAPI(
+            org_domain_url=org_domain_url,
+            api_version=api_version,
+            access_token=access_token,
+            connection=self._connection,
+        )
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class ClientContext:
     """Information about the Salesforce org that made the request."""
@@ -75,12 +135,54 @@ class ClientContext:
     """API version of the Salesforce component that made the request."""
     namespace: str | None = None
     """Namespace of the Salesforce component that made the request."""
+    _loaders: dict[tuple[str, tuple[str, ...]], RecordLoader] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def loader(self, object_type: str, fields: Iterable[str]) -> RecordLoader:
+        """
+        Get the `RecordLoader` of this request for the given object type and fields,
+        to batch and memoize lookups of records by ID.
+
+        ```python
+        context = sdk.get_client_context()
+
+        account = await context.loader("Account", ["Name"]).load(contact.get("AccountId"))
+        ```
+
+        The same loader is returned for the same object type and fields for the rest
+        of the request, so records loaded in one place are reused in the others.
+        """
+        key = (object_type, tuple(fields))
+
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = RecordLoader(self.data_api, object_type, key[1])
+
+        return loader
 
     @classmethod
-    def from_header(cls, header: str, connection: Connection):
+    def from_header(
+        cls,
+        header: str,
+        connection: Connection,
+        data_api_pool: DataAPIPool | None = None,
+    ):
         decoded = base64.b64decode(header)
         data = json.loads(decoded)
 
+        if data_api_pool is not None:
+            data_api = data_api_pool.get(
+                data["orgDomainUrl"], data["apiVersion"], data["accessToken"]
+            )
+        else:
+            data_api = DataAPI(
+                org_domain_url=data["orgDomainUrl"],
+                api_version=data["apiVersion"],
+                access_token=data["accessToken"],
+                connection=connection,
+            )
+
         return cls(
             org=Org(
                 id=data["orgId"],
@@ -94,12 +196,7 @@ class ClientContext:
             access_token=data["accessToken"],
             api_version=data["apiVersion"],
             namespace=data.get("namespace"),  # Use get() to handle None case
-            data_api=DataAPI(
-                org_domain_url=data["orgDomainUrl"],
-                api_version=data["apiVersion"],
-                access_token=data["accessToken"],
-                connection=connection,
-            ),
+            data_api=data_api,
         )
 
 # ContextVars for request-scoped data
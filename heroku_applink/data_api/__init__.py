@@ -5,26 +5,54 @@ SPDX-License-Identifier: BSD-3-Clause
 For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
 """
 
-from typing import Any, TypeVar
+import asyncio
+import json
+import time
+
+from typing import Any, AsyncIterator, Iterable, TypeVar
 
 import aiohttp
 import orjson
-from aiohttp.payload import BytesPayload
+from yarl import URL
 
+from heroku_applink import _tracing, metrics
 from heroku_applink.connection import Connection
 
+from ._field_types import FieldConverter, _compile_field_converters, _loads
+from ._write_batcher import _WriteBatcher
 from ._requests import (
+    COMPOSITE_BATCH_LIMIT,
+    COMPOSITE_GRAPH_LIMIT,
+    COMPOSITE_GRAPH_NODE_LIMIT,
+    CompositeBatchRestApiRequest,
     CompositeGraphRestApiRequest,
     CreateRecordRestApiRequest,
     DeleteRecordRestApiRequest,
+    DescribeSObjectRestApiRequest,
+    GraphNode,
+    IndependentGraphsRestApiRequest,
+    QUERY_URL_LIMIT,
     QueryNextRecordsRestApiRequest,
     QueryRecordsRestApiRequest,
     RestApiRequest,
     UpdateRecordRestApiRequest,
+    graph_components,
+)
+from .batch import Batch
+from .exceptions import (
+    ClientError,
+    SalesforceRestApiError,
+    UnexpectedRestApiResponsePayload,
 )
-from .exceptions import ClientError, UnexpectedRestApiResponsePayload
-from .record import Record, RecordQueryResult
+from .record import QueriedRecord, Record, RecordQueryResult
 from .reference_id import ReferenceId
+from .statement import (
+    BoundStatement,
+    PreparedStatement,
+    _prepare,
+    _soql_literal,
+    _url_encode,
+)
 from .unit_of_work import UnitOfWork
 
 __all__ = ["DataAPI"]
@@ -52,8 +80,24 @@ class DataAPI:
         self._org_domain_url = org_domain_url
         self.access_token = access_token
         self._connection = connection
+        self._org_host = URL(org_domain_url).host or ""
+        self._field_converters_cache: dict[str, dict[str, FieldConverter]] = {}
+        self._exact_decimals = connection.config.exact_decimals
+
+        write_batching = connection.config.write_batching
+        self._write_batcher = (
+            _WriteBatcher(write_batching, self._execute)
+            if write_batching is not None
+            else None
+        )
 
-    async def query(self, soql: str, timeout: float|None=None) -> RecordQueryResult:
+    async def query(
+        self,
+        soql: str | BoundStatement,
+        timeout: float|None=None,
+        convert_field_types: bool=False,
+        include_deleted: bool=False,
+    ) -> RecordQueryResult:
         """
         Query for records using the given SOQL string.
 
@@ -69,14 +113,37 @@ class DataAPI:
         If the returned `RecordQueryResult`'s `done` attribute is `False`, there are more
         records to be returned. To retrieve these, use `DataAPI.query_more()`.
 
+        If `convert_field_types` is `True`, date, datetime, time, currency, and percent
+        fields are converted from their JSON representation to `datetime.date`,
+        `datetime.datetime`, `datetime.time`, and `decimal.Decimal` values. Field types
+        are looked up with the sObject Describe API once per object type and cached on
+        this `DataAPI` instance. Currency and percent values are converted from the
+        float they were parsed to, unless `Config.exact_decimals` is set.
+
+        If `include_deleted` is `True`, the query uses the QueryAll API, which also
+        returns deleted and archived records. Deleted records have `IsDeleted` set.
+
+        Instead of a SOQL string, a `PreparedStatement` with bound values can be given,
+        see `DataAPI.prepare()`.
+
         For more information, see the [Query REST API documentation](https://developer.salesforce.com/docs/atlas.en-us.api_rest.meta/api_rest/resources_query.htm).
         """  # noqa: E501 pylint: disable=line-too-long
         return await self._execute(
-            QueryRecordsRestApiRequest(soql, self._download_file),
+            QueryRecordsRestApiRequest(
+                soql,
+                self._download_file,
+                self._field_converters if convert_field_types else None,
+                include_deleted=include_deleted,
+            ),
             timeout=timeout,
         )
 
-    async def query_more(self, result: RecordQueryResult, timeout: float|None=None) -> RecordQueryResult:
+    async def query_more(
+        self,
+        result: RecordQueryResult,
+        timeout: float|None=None,
+        convert_field_types: bool=False,
+    ) -> RecordQueryResult:
         """
         Query for more records, based on the given `RecordQueryResult`.
 
@@ -89,6 +156,8 @@ class DataAPI:
             query_more_result = await context.org.data_api.query_more(result)
         ```
 
+        See `DataAPI.query()` for a description of `convert_field_types`.
+
         For more information, see the [Query More Results REST API documentation](https://developer.salesforce.com/docs/atlas.en-us.api_rest.meta/api_rest/resources_query_more_results.htm).
         """  # noqa: E501 pylint: disable=line-too-long
         if result.next_records_url is None:
@@ -100,10 +169,214 @@ class DataAPI:
             )
 
         return await self._execute(
-            QueryNextRecordsRestApiRequest(result.next_records_url, self._download_file),
+            QueryNextRecordsRestApiRequest(
+                result.next_records_url,
+                self._download_file,
+                self._field_converters if convert_field_types else None,
+            ),
             timeout=timeout,
         )
 
+    async def stream_query(
+        self,
+        soql: str | BoundStatement,
+        timeout: float|None=None,
+        convert_field_types: bool=False,
+    ) -> AsyncIterator[QueriedRecord]:
+        """
+        Query for records using the given SOQL string, yielding every record of every
+        result page. The next page is only requested once all records of the current
+        page have been consumed.
+
+        For example:
+
+        ```python
+        async for record in context.org.data_api.stream_query("SELECT Id, Name FROM Account"):
+            # ...
+        ```
+
+        The `timeout` applies to each page request. See `DataAPI.query()` for a
+        description of `convert_field_types`.
+        """
+        result = await self.query(
+            soql, timeout=timeout, convert_field_types=convert_field_types
+        )
+
+        while True:
+            for record in result.records:
+                yield record
+
+            if result.done or result.next_records_url is None:
+                return
+
+            result = await self.query_more(
+                result, timeout=timeout, convert_field_types=convert_field_types
+            )
+
+    async def query_many(
+        self,
+        soqls: Iterable[str | BoundStatement],
+        timeout: float|None=None,
+        convert_field_types: bool=False,
+    ) -> list[RecordQueryResult]:
+        """
+        Query for records using each of the given SOQL strings, returning their results
+        in the same order. The queries are sent together with the Composite Batch API
+        (see `DataAPI.batch()`), so they take a single round-trip for up to 25 queries.
+
+        For example:
+
+        ```python
+        accounts, contacts = await context.org.data_api.query_many(
+            [
+                "SELECT Id, Name FROM Account",
+                "SELECT Id, Name FROM Contact",
+            ]
+        )
+        ```
+
+        If any of the queries fail, a `SalesforceRestApiError` with the errors of all
+        failed queries is raised. See `DataAPI.query()` for a description of
+        `convert_field_types`.
+        """
+        batch = self.batch()
+        reference_ids = [
+            batch.register_query(soql, convert_field_types=convert_field_types)
+            for soql in soqls
+        ]
+        results = await batch.execute(timeout=timeout)
+
+        errors = [
+            api_error
+            for result in results.values()
+            if isinstance(result, SalesforceRestApiError)
+            for api_error in result.api_errors
+        ]
+        if errors:
+            raise SalesforceRestApiError(api_errors=errors)
+
+        return [results[reference_id] for reference_id in reference_ids]
+
+    async def query_by_ids(
+        self,
+        object_type: str,
+        fields: Iterable[str],
+        ids: Iterable[str],
+        timeout: float|None=None,
+        convert_field_types: bool=False,
+        concurrency: int=4,
+    ) -> dict[str, QueriedRecord]:
+        """
+        Query the given fields of the records of an object type with the given IDs,
+        returning the records that were found keyed with the given IDs.
+
+        For example:
+
+        ```python
+        accounts = await context.org.data_api.query_by_ids(
+            "Account", ["Name", "Industry"], account_ids
+        )
+
+        for account_id, account in accounts.items():
+            # ...
+        ```
+
+        The IDs are split into as few `IN` queries as the maximum URL length allows,
+        and at most `concurrency` of them are in flight at the same time. All result
+        pages of each query are read. The `timeout` applies to each request. See
+        `DataAPI.query()` for a description of `convert_field_types`.
+
+        Both 15 and 18-character IDs can be given. Records are keyed with the ID they
+        were requested with, although Salesforce always returns the 18-character ID in
+        their `Id` field.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+
+        # Field names are case-insensitive in SOQL, and a field can't be selected twice.
+        selected_fields: dict[str, str] = {}
+        for field in ("Id", *fields):
+            selected_fields.setdefault(field.lower(), field)
+        selected = ", ".join(selected_fields.values())
+        statement = _prepare(f"SELECT {selected} FROM {object_type} WHERE Id IN :ids")
+
+        # The URL of a query for no IDs, except for the parentheses of the list.
+        base_length = len(
+            QueryRecordsRestApiRequest(statement.bind(ids=[""]), self._download_file).url(
+                self._org_domain_url, self._api_version
+            )
+        ) - len(_url_encode("''"))
+        separator_length = len(_url_encode(", "))
+
+        chunks: list[list[str]] = [[]]
+        length = base_length
+        for record_id in unique_ids:
+            id_length = len(_url_encode(_soql_literal(record_id)))
+            if chunks[-1] and length + separator_length + id_length > QUERY_URL_LIMIT:
+                chunks.append([])
+                length = base_length
+            length += id_length + (separator_length if len(chunks[-1]) else 0)
+            chunks[-1].append(record_id)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def query_chunk(chunk: list[str]) -> list[QueriedRecord]:
+            async with semaphore:
+                result = await self.query(
+                    statement.bind(ids=chunk),
+                    timeout=timeout,
+                    convert_field_types=convert_field_types,
+                )
+                records = list(result.records)
+
+                while not result.done and result.next_records_url is not None:
+                    result = await self.query_more(
+                        result, timeout=timeout, convert_field_types=convert_field_types
+                    )
+                    records.extend(result.records)
+
+                return records
+
+        results = await asyncio.gather(*(query_chunk(chunk) for chunk in chunks))
+
+        # 18-character IDs start with the 15-character ones.
+        by_short_id = {
+            record.fields["Id"][:15]: record for records in results for record in records
+        }
+        return {
+            record_id: by_short_id[record_id[:15]]
+            for record_id in unique_ids
+            if record_id[:15] in by_short_id
+        }
+
+    def prepare(self, soql: str) -> PreparedStatement:
+        """
+        Prepare a SOQL query with named bind parameters, to query it with different
+        values without formatting them into the query yourself.
+
+        For example:
+
+        ```python
+        statement = context.org.data_api.prepare(
+            "SELECT Id, Name FROM Account WHERE Id IN :ids AND Industry = :industry"
+        )
+
+        result = await context.org.data_api.query(
+            statement.bind(ids=account_ids, industry="Energy")
+        )
+        ```
+
+        Bound values are escaped, so they can't change the structure of the query.
+        Prepared statements are cached by their query, so preparing the same query
+        again, such as in each request of an app, doesn't compile it again. Their `key`
+        identifies queries of the same shape, such as to group them in metrics.
+        """
+        return _prepare(soql)
+
     async def create(self, record: Record, timeout: float|None=None) -> str:
         """
         Create a new record based on the given `Record` object.
@@ -122,7 +395,19 @@ class DataAPI:
             )
         )
         ```
+
+        If `Config.write_batching` is configured, concurrent calls may be sent together
+        in a single sObject Collections request (see `WriteBatchingPolicy`).
         """
+        if self._write_batcher is not None:
+            return await self._write_batcher.submit(
+                "create",
+                record.type,
+                CreateRecordRestApiRequest(record),
+                record=record,
+                timeout=timeout,
+            )
+
         return await self._execute(
             CreateRecordRestApiRequest(record),
             timeout=timeout,
@@ -147,11 +432,26 @@ class DataAPI:
             )
         )
         ```
+
+        If the given record is a `TrackedRecord`, only its changed fields are sent, and
+        nothing is sent if none changed.
+
+        If `Config.write_batching` is configured, concurrent calls may be sent together
+        in a single sObject Collections request (see `WriteBatchingPolicy`).
         """
-        return await self._execute(
-            UpdateRecordRestApiRequest(record),
-            timeout=timeout,
-        )
+        request = UpdateRecordRestApiRequest(record)
+
+        # Nothing is sent for a `TrackedRecord` without changes.
+        local_result = request.local_result()
+        if local_result is not None:
+            return local_result
+
+        if self._write_batcher is not None:
+            return await self._write_batcher.submit(
+                "update", record.type, request, record=record, timeout=timeout
+            )
+
+        return await self._execute(request, timeout=timeout)
 
     async def delete(self, object_type: str, record_id: str, timeout: float|None=None) -> str:
         """
@@ -164,7 +464,19 @@ class DataAPI:
         ```python
         await data_api.delete("Account", "001B000001Lp1FxIAJ")
         ```
+
+        If `Config.write_batching` is configured, concurrent calls may be sent together
+        in a single sObject Collections request (see `WriteBatchingPolicy`).
         """
+        if self._write_batcher is not None:
+            return await self._write_batcher.submit(
+                "delete",
+                object_type,
+                DeleteRecordRestApiRequest(object_type, record_id),
+                record_id=record_id,
+                timeout=timeout,
+            )
+
         return await self._execute(
             DeleteRecordRestApiRequest(object_type, record_id),
             timeout=timeout,
@@ -201,47 +513,235 @@ class DataAPI:
         second_record_id = result[second_create_reference_id]
         ```
         """
-        return await self._execute(
-            CompositeGraphRestApiRequest(
-                self._api_version,
-                unit_of_work._sub_requests,  # pyright: ignore [reportPrivateUsage] pylint:disable=protected-access
-            ),
-            timeout=timeout,
+        request = CompositeGraphRestApiRequest(
+            self._api_version,
+            unit_of_work._sub_requests,  # pyright: ignore [reportPrivateUsage] pylint:disable=protected-access
+            unit_of_work._nodes,  # pyright: ignore [reportPrivateUsage] pylint:disable=protected-access
+        )
+
+        # Nothing is sent if all operations are updates of unchanged `TrackedRecord`s.
+        local_result = request.local_result()
+        if local_result is not None:
+            return local_result
+
+        return await self._execute(request, timeout=timeout)
+
+    async def commit_unit_of_work_partially(
+        self, unit_of_work: UnitOfWork, timeout: float|None=None
+    ) -> dict[ReferenceId, Any]:
+        """
+        Commit a `UnitOfWork` as independent parts instead of a single atomic operation.
+
+        The operations are split into groups that don't refer to each other, directly or
+        indirectly, and each group is committed on its own: if one of its operations
+        fails, only that group is rolled back. The result of each operation is its record
+        ID, or the `SalesforceRestApiError` it failed with, instead of being raised. This
+        way only the failed groups need to be registered in a new `UnitOfWork` again.
+
+        For example:
+
+        ```python
+        results = await context.org.data_api.commit_unit_of_work_partially(unit_of_work)
+
+        failed = {
+            reference_id: error
+            for reference_id, error in results.items()
+            if isinstance(error, SalesforceRestApiError)
+        }
+        ```
+
+        Groups are sent as separate graphs of Composite Graph API requests, with up to 75
+        graphs and 500 operations per request. Requests are sent concurrently.
+        """
+        nodes: list[GraphNode] = unit_of_work._nodes  # pyright: ignore [reportPrivateUsage] pylint:disable=protected-access
+        results: dict[ReferenceId, Any] = {}
+        chunks: list[list[list[GraphNode]]] = []
+        node_count = 0
+
+        for graph in graph_components(nodes):
+            # Nothing is sent for groups of updates of unchanged `TrackedRecord`s.
+            if all(node.local for node in graph):
+                results.update(
+                    (node.reference_id, node.local_result) for node in graph
+                )
+                continue
+
+            if (
+                not chunks
+                or len(chunks[-1]) == COMPOSITE_GRAPH_LIMIT
+                or node_count + len(graph) > COMPOSITE_GRAPH_NODE_LIMIT
+            ):
+                chunks.append([])
+                node_count = 0
+
+            chunks[-1].append(graph)
+            node_count += len(graph)
+
+        chunk_results = await asyncio.gather(
+            *(
+                self._execute(
+                    IndependentGraphsRestApiRequest(self._api_version, chunk),
+                    timeout=timeout,
+                )
+                for chunk in chunks
+            )
         )
+        for chunk_result in chunk_results:
+            results.update(chunk_result)
+
+        return {node.reference_id: results[node.reference_id] for node in nodes}
+
+    def batch(self) -> Batch:
+        """
+        Create a `Batch`, to send several independent queries and record operations
+        with the Composite Batch API in one round-trip.
+
+        For example:
+
+        ```python
+        batch = context.org.data_api.batch()
+
+        accounts_reference_id = batch.register_query("SELECT Id, Name FROM Account")
+        update_reference_id = batch.register_update(
+            Record(type="Contact", fields={"Id": "003B000000Lp1FxIAJ", "Title": "CEO"})
+        )
+
+        results = await batch.execute()
+        ```
+
+        For more information, see the [Composite Batch REST API documentation](https://developer.salesforce.com/docs/atlas.en-us.api_rest.meta/api_rest/resources_composite_batch.htm).
+        """  # noqa: E501 pylint: disable=line-too-long
+        return Batch(self)
+
+    async def _execute_batch(
+        self, sub_requests: list[RestApiRequest[Any]], timeout: float|None=None
+    ) -> list[Any]:
+        local_results = [sub_request.local_result() for sub_request in sub_requests]
+        sent = [
+            sub_request
+            for sub_request, local_result in zip(sub_requests, local_results)
+            if local_result is None
+        ]
+        chunks = [
+            sent[start : start + COMPOSITE_BATCH_LIMIT]
+            for start in range(0, len(sent), COMPOSITE_BATCH_LIMIT)
+        ]
+
+        chunk_results = await asyncio.gather(
+            *(
+                self._execute(
+                    CompositeBatchRestApiRequest(self._api_version, chunk),
+                    timeout=timeout,
+                )
+                for chunk in chunks
+            )
+        )
+
+        sent_results = iter(result for results in chunk_results for result in results)
+        return [
+            local_result if local_result is not None else next(sent_results)
+            for local_result in local_results
+        ]
 
     async def _execute(self, rest_api_request: RestApiRequest[T], timeout: float|None=None) -> T:
         url: str = rest_api_request.url(self._org_domain_url, self._api_version)
         method: str = rest_api_request.http_method()
         body = rest_api_request.request_body()
 
-        try:
-            response = await self._connection.request(
-                method,
-                url,
-                headers=self._default_headers(),
-                data=None if body is None else _json_serialize(body),
-                timeout=timeout,
-            )
-
-            # Using orjson for faster JSON deserialization over the stdlib.
-            # This is not implemented using the `loads` argument to `Response.json` since:
-            # - We don't want the content type validation, since some successful requests.py return 204
-            #   (No Content) which will not have an `application/json`` content type header. However,
-            #   these parse just fine as JSON helping to unify the interface to the REST request classes.
-            # - Orjson's performance/memory usage is better if it is passed bytes directly instead of `str`.
-            response_body = await response.read()
-            json_body = orjson.loads(response_body) if response_body else None
-        except aiohttp.ClientError as e:
-            # https://docs.aiohttp.org/en/stable/client_reference.html#client-exceptions
-            raise ClientError(
-                f"An error occurred while making the request: {e.__class__.__name__}: {e}"
-            ) from e
-        except orjson.JSONDecodeError as e:
-            raise UnexpectedRestApiResponsePayload(
-                f"The server didn't respond with valid JSON: {e.__class__.__name__}: {e}"
-            ) from e
-
-        return await rest_api_request.process_response(response.status, json_body)
+        api_type = rest_api_request.api_type()
+        start_time = time.perf_counter()
+
+        with _tracing.start_span(
+            f"DataAPI.{api_type}",
+            {
+                "salesforce.org.domain_url": self._org_domain_url,
+                "salesforce.api_version": self._api_version,
+            },
+        ) as span:
+            span.set_attributes(rest_api_request.trace_attributes())
+
+            try:
+                headers = self._default_headers()
+                if body is not None:
+                    headers["Content-Type"] = "application/json"
+
+                response = await self._connection.request(
+                    method,
+                    url,
+                    headers=headers,
+                    data=None if body is None else _json_serialize(body),
+                    timeout=timeout,
+                    hedge=rest_api_request.hedgeable(),
+                )
+
+                # Using orjson for faster JSON deserialization over the stdlib.
+                # This is not implemented using the `loads` argument to `Response.json` since:
+                # - We don't want the content type validation, since some successful requests.py return 204
+                #   (No Content) which will not have an `application/json`` content type header. However,
+                #   these parse just fine as JSON helping to unify the interface to the REST request classes.
+                # - Orjson's performance/memory usage is better if it is passed bytes directly instead of `str`.
+                response_body = await response.read()
+                json_body = (
+                    _loads(
+                        response_body,
+                        self._exact_decimals and rest_api_request.exact_decimals(),
+                    )
+                    if response_body
+                    else None
+                )
+            except aiohttp.ClientError as e:
+                # https://docs.aiohttp.org/en/stable/client_reference.html#client-exceptions
+                raise ClientError(
+                    f"An error occurred while making the request: {e.__class__.__name__}: {e}"
+                ) from e
+            except json.JSONDecodeError as e:
+                # Also catches `orjson.JSONDecodeError`, which is a subclass.
+                raise UnexpectedRestApiResponsePayload(
+                    f"The server didn't respond with valid JSON: {e.__class__.__name__}: {e}"
+                ) from e
+
+            span.set_attribute("salesforce.response.size", len(response_body))
+
+            limit_info = response.headers.get("Sforce-Limit-Info")
+            if isinstance(limit_info, str):
+                metrics._record_limit_info(self._org_host, limit_info)
+
+            try:
+                result = await rest_api_request.process_response(
+                    response.status, json_body
+                )
+            finally:
+                metrics._DATA_API_REQUEST_DURATION.observe(
+                    time.perf_counter() - start_time, api_type=api_type
+                )
+
+            if isinstance(result, RecordQueryResult):
+                metrics._DATA_API_RECORDS_PARSED.inc(
+                    len(result.records), api_type=api_type
+                )
+                span.set_attribute("salesforce.record_count", len(result.records))
+                if result.records:
+                    span.set_attribute("salesforce.sobject_type", result.records[0].type)
+
+            return result
+
+    async def _field_converters(self, object_type: str) -> dict[str, FieldConverter]:
+        converters = self._field_converters_cache.get(object_type)
+        metrics._record_cache_lookup("describe", converters is not None)
+
+        if converters is None:
+            # Aggregate query results aren't backed by a describable sObject.
+            if object_type == "AggregateResult":
+                converters = {}
+            else:
+                describe = await self._execute(
+                    DescribeSObjectRestApiRequest(object_type)
+                )
+                converters = _compile_field_converters(describe)
+
+            self._field_converters_cache[object_type] = converters
+
+        return converters
 
     async def _download_file(self, url: str) -> bytes:
         response = await self._connection.request(
@@ -256,9 +756,10 @@ class DataAPI:
         }
 
 
-def _json_serialize(data: Any) -> BytesPayload:
+def _json_serialize(data: Any) -> bytes:
     """
-    JSON serialize the provided data to bytes.
+    JSON serialize the provided data to bytes, sent with an `application/json`
+    `Content-Type` header.
 
     This is a replacement for aiohttp's default JSON implementation that uses `orjson` instead
     of the Python stdlib's `json` module, since `orjson` is faster:
@@ -267,9 +768,7 @@ def _json_serialize(data: Any) -> BytesPayload:
     We can't just implement this by passing `json_serialize` to `ClientSession`, due to:
     https://github.com/aio-libs/aiohttp/issues/4482
 
-    So instead this is based on `payload.JsonPayload`:
-    https://github.com/aio-libs/aiohttp/blob/v3.8.3/aiohttp/payload.py#L386-L403
+    Raw bytes are passed on instead of an `aiohttp` payload, so every transport can
+    send them.
     """
-    return BytesPayload(
-        orjson.dumps(data), encoding="utf-8", content_type="application/json"
-    )
+    return orjson.dumps(data)
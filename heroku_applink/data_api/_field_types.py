@@ -0,0 +1,106 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import json
+import orjson
+
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Callable
+
+FieldConverter = Callable[[Any], Any]
+
+
+def _parse_datetime(value: str) -> datetime:
+    # Salesforce renders datetimes as `2025-03-06T18:20:42.000+0000`. Python 3.10's
+    # `fromisoformat` doesn't accept offsets without a colon, so one is inserted here.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    elif value[-5] in "+-":
+        value = f"{value[:-2]}:{value[-2:]}"
+
+    return datetime.fromisoformat(value)
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def _parse_time(value: str) -> time:
+    # Salesforce renders times as `18:20:42.000Z`, always in UTC.
+    if value.endswith("Z"):
+        return time.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+
+    return time.fromisoformat(value)
+
+
+def _parse_decimal(value: Any) -> Decimal:
+    # Responses parsed by `_loads` with `exact_decimals` already hold the exact
+    # `Decimal`. Otherwise the number is a float, and going through `str` gives the
+    # shortest representation of it instead of the float's full binary expansion.
+    if isinstance(value, Decimal):
+        return value
+
+    return Decimal(str(value))
+
+
+def _loads(body: bytes, exact_decimals: bool = False) -> Any:
+    """
+    Parse a JSON response body with `orjson`.
+
+    With `exact_decimals`, the body is parsed with the standard library's parser
+    instead, with numbers that have a fraction or exponent as `Decimal`, so currency
+    and percent values with more significant digits than a float holds (about 15 to
+    17) keep all of them. `orjson` always parses such numbers to floats, but is several
+    times faster. Values that aren't converted to `Decimal` are turned back into floats
+    with `_restore_floats`.
+    """
+    if exact_decimals:
+        return json.loads(body, parse_float=Decimal)
+
+    return orjson.loads(body)
+
+
+def _restore_floats(value: Any) -> Any:
+    """
+    Turn the `Decimal`s parsed by `_loads` in a field value that isn't converted,
+    including within compound fields, back into the floats `orjson` would have parsed.
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+
+    if isinstance(value, dict):
+        return {key: _restore_floats(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_restore_floats(item) for item in value]
+
+    return value
+
+
+_CONVERTERS_BY_FIELD_TYPE: dict[str, FieldConverter] = {
+    "datetime": _parse_datetime,
+    "date": _parse_date,
+    "time": _parse_time,
+    "currency": _parse_decimal,
+    "percent": _parse_decimal,
+}
+
+
+def _compile_field_converters(describe: dict[str, Any]) -> dict[str, FieldConverter]:
+    """
+    Build the field name to converter mapping for a Salesforce object from its describe
+    metadata. Fields that don't need converting are left out of the mapping.
+    """
+    converters: dict[str, FieldConverter] = {}
+
+    for field in describe.get("fields", []):
+        converter = _CONVERTERS_BY_FIELD_TYPE.get(field.get("type"))
+        if converter is not None:
+            converters[field["name"]] = converter
+
+    return converters
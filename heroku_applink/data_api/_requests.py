@@ -6,24 +6,44 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 """
 
 from base64 import standard_b64encode
-from typing import Any, Awaitable, Callable, Generic, Literal, TypeVar, cast
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Generic, Literal, Mapping, TypeVar, cast
 from urllib.parse import urlencode
 
+import orjson
+
+from ._field_types import FieldConverter, _restore_floats
 from .exceptions import (
     InnerSalesforceRestApiError,
     MissingFieldError,
     SalesforceRestApiError,
     UnexpectedRestApiResponsePayload,
 )
-from .record import QueriedRecord, Record, RecordQueryResult
+from .record import QueriedRecord, Record, RecordQueryResult, TrackedRecord
 from .reference_id import ReferenceId
+from .statement import BoundStatement
 
 HttpMethod = Literal["GET", "POST", "PATCH", "DELETE"]
 Json = dict[str, Any] | list[Any]
 DownloadFileFunction = Callable[[str], Awaitable[bytes]]
+FieldConvertersFunction = Callable[[str], Awaitable[dict[str, FieldConverter]]]
 
 T = TypeVar("T")
 
+# The maximum number of sub-requests in a Composite Batch API request.
+COMPOSITE_BATCH_LIMIT = 25
+
+# The maximum number of records in an sObject Collections request.
+COLLECTION_LIMIT = 200
+
+# The maximum length of a query URL. Salesforce rejects URLs longer than 16,384
+# characters, so this leaves some room.
+QUERY_URL_LIMIT = 16_000
+
+# The maximum number of graphs, and of nodes across them, in a Composite Graph request.
+COMPOSITE_GRAPH_LIMIT = 75
+COMPOSITE_GRAPH_NODE_LIMIT = 500
+
 
 class RestApiRequest(Generic[T]):
     def url(self, org_domain_url: str, api_version: str) -> str:
@@ -38,14 +58,82 @@ class RestApiRequest(Generic[T]):
     async def process_response(self, status_code: int, json_body: Json | None) -> T:
         raise NotImplementedError  # pragma: no cover
 
+    def api_type(self) -> str:
+        """
+        The kind of Salesforce REST API call, for example `query` or `create`. Used to
+        name tracing spans.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def trace_attributes(self) -> dict[str, Any]:
+        """
+        Additional attributes describing this request for tracing spans.
+        """
+        return {}
+
+    def hedgeable(self) -> bool:
+        """
+        Whether sending this request twice is harmless, so slow responses can be
+        hedged with a duplicate request.
+        """
+        return False
+
+    def exact_decimals(self) -> bool:
+        """
+        Whether the response converts currency and percent fields to `Decimal`, and
+        should be parsed with `Decimal` numbers instead of floats if
+        `Config.exact_decimals` is set, so those values are exact.
+        """
+        return False
+
+    def local_result(self) -> T | None:
+        """
+        The result of this request if there's nothing to send, such as for the update
+        of a `TrackedRecord` without changes, otherwise `None`.
+        """
+        return None
+
+    def references(self) -> set[ReferenceId]:
+        """
+        The `ReferenceId`s of other operations this request refers to, such as in a
+        `UnitOfWork`.
+        """
+        return set()
+
 
 class QueryRecordsRestApiRequest(RestApiRequest[RecordQueryResult]):
-    def __init__(self, soql: str, download_file_fn: DownloadFileFunction):
+    def __init__(
+        self,
+        soql: str | BoundStatement,
+        download_file_fn: DownloadFileFunction,
+        field_converters_fn: FieldConvertersFunction | None = None,
+        include_deleted: bool = False,
+    ):
         self._soql = soql
         self._download_file_fn = download_file_fn
+        self._field_converters_fn = field_converters_fn
+        self._resource = "queryAll" if include_deleted else "query"
 
     def url(self, org_domain_url: str, api_version: str) -> str:
-        return f"{org_domain_url}/services/data/v{api_version}/query?{urlencode({'q': self._soql})}"
+        if isinstance(self._soql, BoundStatement):
+            return f"{org_domain_url}/services/data/v{api_version}/{self._resource}?q={self._soql.encoded_soql}"
+
+        return f"{org_domain_url}/services/data/v{api_version}/{self._resource}?{urlencode({'q': self._soql})}"
+
+    def api_type(self) -> str:
+        return self._resource
+
+    def hedgeable(self) -> bool:
+        return True
+
+    def exact_decimals(self) -> bool:
+        return self._field_converters_fn is not None
+
+    def trace_attributes(self) -> dict[str, Any]:
+        if isinstance(self._soql, BoundStatement):
+            return {"salesforce.query.offset": 0, "salesforce.query.statement": self._soql.key}
+
+        return {"salesforce.query.offset": 0}
 
     def http_method(self) -> HttpMethod:
         return "GET"
@@ -57,18 +145,39 @@ class QueryRecordsRestApiRequest(RestApiRequest[RecordQueryResult]):
         self, status_code: int, json_body: Json | None
     ) -> RecordQueryResult:
         return await _process_records_response(
-            status_code, json_body, self._download_file_fn
+            status_code, json_body, self._download_file_fn, self._field_converters_fn
         )
 
 
 class QueryNextRecordsRestApiRequest(RestApiRequest[RecordQueryResult]):
-    def __init__(self, next_records_path: str, download_file_fn: DownloadFileFunction):
+    def __init__(
+        self,
+        next_records_path: str,
+        download_file_fn: DownloadFileFunction,
+        field_converters_fn: FieldConvertersFunction | None = None,
+    ):
         self._next_records_path = next_records_path
         self._download_file_fn = download_file_fn
+        self._field_converters_fn = field_converters_fn
 
     def url(self, org_domain_url: str, api_version: str) -> str:
         return f"{org_domain_url}{self._next_records_path}"
 
+    def api_type(self) -> str:
+        return "queryMore"
+
+    def hedgeable(self) -> bool:
+        return True
+
+    def exact_decimals(self) -> bool:
+        return self._field_converters_fn is not None
+
+    def trace_attributes(self) -> dict[str, Any]:
+        # Next records URLs end in the offset of their first record, for example
+        # `/services/data/v62.0/query/01gRO0000016PIAYA2-2000`.
+        _, _, offset = self._next_records_path.rpartition("-")
+        return {"salesforce.query.offset": int(offset)} if offset.isdigit() else {}
+
     def http_method(self) -> HttpMethod:
         return "GET"
 
@@ -79,7 +188,7 @@ class QueryNextRecordsRestApiRequest(RestApiRequest[RecordQueryResult]):
         self, status_code: int, json_body: Json | None
     ) -> RecordQueryResult:
         return await _process_records_response(
-            status_code, json_body, self._download_file_fn
+            status_code, json_body, self._download_file_fn, self._field_converters_fn
         )
 
 
@@ -90,12 +199,21 @@ class CreateRecordRestApiRequest(RestApiRequest[str]):
     def url(self, org_domain_url: str, api_version: str) -> str:
         return f"{org_domain_url}/services/data/v{api_version}/sobjects/{self._record.type}"
 
+    def api_type(self) -> str:
+        return "create"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.sobject_type": self._record.type}
+
     def http_method(self) -> HttpMethod:
         return "POST"
 
     def request_body(self) -> Json | None:
         return _normalize_record_fields(self._record.fields)
 
+    def references(self) -> set[ReferenceId]:
+        return _references(self._record.fields)
+
     async def process_response(self, status_code: int, json_body: Json | None) -> str:
         if status_code != 201:
             raise SalesforceRestApiError(api_errors=_parse_errors(json_body))
@@ -116,21 +234,31 @@ class UpdateRecordRestApiRequest(RestApiRequest[str]):
             )
 
         self._record = record
+        self._fields = _update_fields(record)
 
     def url(self, org_domain_url: str, api_version: str) -> str:
         return f"{org_domain_url}/services/data/v{api_version}/sobjects/{self._record.type}/{self._record.fields['Id']}"
 
+    def api_type(self) -> str:
+        return "update"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.sobject_type": self._record.type}
+
     def http_method(self) -> HttpMethod:
         return "PATCH"
 
     def request_body(self) -> Json | None:
-        return _normalize_record_fields(
-            {
-                key: self._record.fields[key]
-                for key in self._record.fields
-                if key != "Id"
-            }
-        )
+        return _normalize_record_fields(self._fields)
+
+    def references(self) -> set[ReferenceId]:
+        return _references(self._fields)
+
+    def local_result(self) -> str | None:
+        if isinstance(self._record, TrackedRecord) and not self._fields:
+            return str(self._record.fields["Id"])
+
+        return None
 
     async def process_response(self, status_code: int, json_body: Json | None) -> str:
         if status_code != 204:
@@ -138,6 +266,9 @@ class UpdateRecordRestApiRequest(RestApiRequest[str]):
                 api_errors=_parse_errors(json_body)
             )  # pragma: no cover
 
+        if isinstance(self._record, TrackedRecord):
+            self._record._mark_saved(self._fields)
+
         return str(self._record.fields["Id"])
 
 
@@ -149,6 +280,12 @@ class DeleteRecordRestApiRequest(RestApiRequest[str]):
     def url(self, org_domain_url: str, api_version: str) -> str:
         return f"{org_domain_url}/services/data/v{api_version}/sobjects/{self._object_type}/{self._record_id}"
 
+    def api_type(self) -> str:
+        return "delete"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.sobject_type": self._object_type}
+
     def http_method(self) -> HttpMethod:
         return "DELETE"
 
@@ -162,39 +299,205 @@ class DeleteRecordRestApiRequest(RestApiRequest[str]):
         return self._record_id
 
 
+class DescribeSObjectRestApiRequest(RestApiRequest[dict[str, Any]]):
+    def __init__(self, object_type: str):
+        self._object_type = object_type
+
+    def url(self, org_domain_url: str, api_version: str) -> str:
+        return f"{org_domain_url}/services/data/v{api_version}/sobjects/{self._object_type}/describe"
+
+    def api_type(self) -> str:
+        return "describe"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.sobject_type": self._object_type}
+
+    def http_method(self) -> HttpMethod:
+        return "GET"
+
+    def request_body(self) -> Json | None:
+        return None
+
+    async def process_response(
+        self, status_code: int, json_body: Json | None
+    ) -> dict[str, Any]:
+        if status_code != 200:
+            raise SalesforceRestApiError(api_errors=_parse_errors(json_body))
+
+        if isinstance(json_body, dict):
+            return json_body
+
+        raise UnexpectedRestApiResponsePayload(
+            "The describe API response payload doesn't match the expected structure."
+        )  # pragma: no cover
+
+
+class GraphNode:
+    """
+    A sub-request of a composite graph, serialized once when it's created so building
+    the graph's request body doesn't normalize and encode the same fields again.
+    """
+
+    __slots__ = (
+        "reference_id",
+        "request",
+        "references",
+        "local_result",
+        "_body",
+        "_serialized",
+    )
+
+    def __init__(
+        self,
+        reference_id: ReferenceId,
+        request: RestApiRequest[str],
+        local_results: Mapping[ReferenceId, str] | None = None,
+    ):
+        """
+        `local_results` are the results of the nodes before this one that aren't sent,
+        which references to them are replaced with.
+        """
+        self.reference_id = reference_id
+        self.request = request
+        self.references = request.references()
+        self.local_result = request.local_result()
+
+        body = request.request_body()
+
+        resolved = self.references & local_results.keys() if local_results else set()
+        if resolved and isinstance(body, dict):
+            # Nodes that aren't sent can't be referred to, so their result is used.
+            replacements = {
+                _normalize_field_value(reference): local_results[reference]  # type: ignore[index]
+                for reference in resolved
+            }
+            body = {
+                key: replacements.get(value, value) if isinstance(value, str) else value
+                for key, value in body.items()
+            }
+            self.references = self.references - resolved
+
+        self._body = orjson.Fragment(orjson.dumps(body)) if body else None
+        self._serialized: tuple[str, orjson.Fragment] | None = None
+
+    @property
+    def local(self) -> bool:
+        """Whether there's nothing to send for this sub-request."""
+        return self.local_result is not None
+
+    def serialize(self, api_version: str) -> orjson.Fragment:
+        """
+        The sub-request as it appears in the graph, memoized per API version.
+        """
+        if self._serialized is None or self._serialized[0] != api_version:
+            node: dict[str, Any] = {
+                # Sub-requests use relative URLs, hence the empty-string `org_domain_url`.
+                "url": self.request.url("", api_version),
+                "method": self.request.http_method(),
+                "referenceId": self.reference_id.id,
+            }
+            if self._body is not None:
+                node["body"] = self._body
+
+            self._serialized = (api_version, orjson.Fragment(orjson.dumps(node)))
+
+        return self._serialized[1]
+
+
+def graph_nodes(sub_requests: dict[ReferenceId, RestApiRequest[str]]) -> list[GraphNode]:
+    """
+    Create the graph nodes of sub-requests, in order.
+    """
+    nodes: list[GraphNode] = []
+    local_results: dict[ReferenceId, str] = {}
+
+    for reference_id, sub_request in sub_requests.items():
+        node = GraphNode(reference_id, sub_request, local_results)
+        if node.local_result is not None:
+            local_results[reference_id] = node.local_result
+        nodes.append(node)
+
+    return nodes
+
+
+def graph_components(nodes: list[GraphNode]) -> list[list[GraphNode]]:
+    """
+    Split graph nodes into groups that don't refer to each other, in the order of their
+    first node. Each group keeps the order of `nodes`.
+    """
+    parents = {node.reference_id: node.reference_id for node in nodes}
+
+    def root(reference_id: ReferenceId) -> ReferenceId:
+        while parents[reference_id] != reference_id:
+            parents[reference_id] = parents[parents[reference_id]]
+            reference_id = parents[reference_id]
+        return reference_id
+
+    for node in nodes:
+        for reference in node.references:
+            if reference in parents:
+                parents[root(reference)] = root(node.reference_id)
+
+    components: dict[ReferenceId, list[GraphNode]] = {}
+    for node in nodes:
+        components.setdefault(root(node.reference_id), []).append(node)
+
+    return list(components.values())
+
+
 class CompositeGraphRestApiRequest(RestApiRequest[dict[ReferenceId, str]]):
     def __init__(
         self,
         api_version: str,
         sub_requests: dict[ReferenceId, RestApiRequest[str]],
+        nodes: list[GraphNode] | None = None,
     ):
+        """
+        `nodes` are the sub-requests already serialized, such as by a `UnitOfWork`.
+        They're created from `sub_requests` if not given.
+        """
         self._api_version = api_version
         self._sub_requests = sub_requests
+        self._nodes = nodes
 
     def url(self, org_domain_url: str, api_version: str) -> str:
         return f"{org_domain_url}/services/data/v{api_version}/composite/graph"
 
+    def api_type(self) -> str:
+        return "composite"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.record_count": len(self._sub_requests)}
+
     def http_method(self) -> HttpMethod:
         return "POST"
 
-    def request_body(self) -> Json | None:
-        json_sub_requests: list[dict[str, Any]] = []
-
-        for reference_id, sub_request in self._sub_requests.items():
-            json_sub_request: dict[str, Any] = {
-                # Sub-requests use relative URLs, hence the empty-string `org_domain_url`.
-                "url": sub_request.url("", self._api_version),
-                "method": sub_request.http_method(),
-                "referenceId": reference_id.id,
-            }
+    def local_result(self) -> dict[ReferenceId, str] | None:
+        results = {
+            reference_id: sub_request.local_result()
+            for reference_id, sub_request in self._sub_requests.items()
+        }
+        if any(result is None for result in results.values()):
+            return None
 
-            if sub_request.request_body():
-                json_sub_request["body"] = sub_request.request_body()
+        return cast(dict[ReferenceId, str], results)
 
-            json_sub_requests.append(json_sub_request)
+    def request_body(self) -> Json | None:
+        if self._nodes is None:
+            self._nodes = graph_nodes(self._sub_requests)
 
         return {
-            "graphs": [{"graphId": "graph0", "compositeRequest": json_sub_requests}]
+            "graphs": [
+                {
+                    "graphId": "graph0",
+                    # Nothing is sent for sub-requests without changes.
+                    "compositeRequest": [
+                        node.serialize(self._api_version)
+                        for node in self._nodes
+                        if not node.local
+                    ],
+                }
+            ]
         }
 
     async def process_response(
@@ -229,21 +532,324 @@ class CompositeGraphRestApiRequest(RestApiRequest[dict[ReferenceId, str]]):
             if errors:
                 raise SalesforceRestApiError(api_errors=errors)
 
-            return result
+            if len(result) == len(self._sub_requests):
+                return result
+
+            # Sub-requests without changes weren't sent.
+            return {
+                reference_id: (
+                    result[reference_id]
+                    if reference_id in result
+                    else sub_request.local_result()
+                )
+                for reference_id, sub_request in self._sub_requests.items()
+                if reference_id in result or sub_request.local_result() is not None
+            }
 
         raise UnexpectedRestApiResponsePayload(
             "The composite graph API response payload doesn't match the expected structure."
         )  # pragma: no cover
 
 
+class IndependentGraphsRestApiRequest(RestApiRequest[dict[ReferenceId, Any]]):
+    """
+    Groups of graph nodes that don't refer to each other, each sent as its own graph of
+    a Composite Graph request. Each graph is rolled back on its own if one of its
+    operations fails. The result has an entry per node: its result, or the
+    `SalesforceRestApiError` it failed with.
+    """
+
+    def __init__(self, api_version: str, graphs: list[list[GraphNode]]):
+        self._api_version = api_version
+        self._graphs = graphs
+
+    def url(self, org_domain_url: str, api_version: str) -> str:
+        return f"{org_domain_url}/services/data/v{api_version}/composite/graph"
+
+    def api_type(self) -> str:
+        return "composite"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {
+            "salesforce.record_count": sum(len(graph) for graph in self._graphs),
+            "salesforce.graph_count": len(self._graphs),
+        }
+
+    def http_method(self) -> HttpMethod:
+        return "POST"
+
+    def request_body(self) -> Json | None:
+        return {
+            "graphs": [
+                {
+                    "graphId": f"graph{index}",
+                    "compositeRequest": [
+                        node.serialize(self._api_version)
+                        for node in graph
+                        if not node.local
+                    ],
+                }
+                for index, graph in enumerate(self._graphs)
+            ]
+        }
+
+    async def process_response(
+        self, status_code: int, json_body: Json | None
+    ) -> dict[ReferenceId, Any]:
+        if status_code != 200:
+            raise SalesforceRestApiError(
+                api_errors=_parse_errors(json_body)
+            )  # pragma: no cover
+
+        if not isinstance(json_body, dict):
+            raise UnexpectedRestApiResponsePayload(
+                "The composite graph API response payload doesn't match the expected structure."
+            )  # pragma: no cover
+
+        responses = {
+            composite_response["referenceId"]: composite_response
+            for graph in json_body["graphs"]
+            for composite_response in graph["graphResponse"]["compositeResponse"]
+        }
+        results: dict[ReferenceId, Any] = {}
+
+        for graph in self._graphs:
+            for node in graph:
+                response = responses.get(node.reference_id.id)
+                if response is None:
+                    # Nodes without changes weren't sent.
+                    results[node.reference_id] = node.local_result
+                    continue
+
+                try:
+                    results[node.reference_id] = await node.request.process_response(
+                        response["httpStatusCode"], response.get("body")
+                    )
+                except SalesforceRestApiError as rest_api_error:
+                    results[node.reference_id] = rest_api_error
+
+        return results
+
+
+class CompositeBatchRestApiRequest(RestApiRequest[list[Any]]):
+    """
+    Up to `COMPOSITE_BATCH_LIMIT` independent sub-requests, executed with the
+    Composite Batch API. The result has one entry per sub-request, in order: its
+    result, or the `SalesforceRestApiError` it failed with.
+    """
+
+    def __init__(self, api_version: str, sub_requests: list[RestApiRequest[Any]]):
+        self._api_version = api_version
+        self._sub_requests = sub_requests
+
+    def url(self, org_domain_url: str, api_version: str) -> str:
+        return f"{org_domain_url}/services/data/v{api_version}/composite/batch"
+
+    def api_type(self) -> str:
+        return "compositeBatch"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.batch.size": len(self._sub_requests)}
+
+    def hedgeable(self) -> bool:
+        return all(sub_request.hedgeable() for sub_request in self._sub_requests)
+
+    def exact_decimals(self) -> bool:
+        return any(sub_request.exact_decimals() for sub_request in self._sub_requests)
+
+    def http_method(self) -> HttpMethod:
+        return "POST"
+
+    def request_body(self) -> Json | None:
+        batch_requests: list[dict[str, Any]] = []
+
+        for sub_request in self._sub_requests:
+            # Batch sub-request URLs are relative to `/services/data/`, e.g. `v62.0/query?q=...`.
+            json_sub_request: dict[str, Any] = {
+                "url": sub_request.url("", self._api_version).removeprefix(
+                    "/services/data/"
+                ),
+                "method": sub_request.http_method(),
+            }
+
+            body = sub_request.request_body()
+            if body:
+                json_sub_request["richInput"] = body
+
+            batch_requests.append(json_sub_request)
+
+        return {"batchRequests": batch_requests, "haltOnError": False}
+
+    async def process_response(
+        self, status_code: int, json_body: Json | None
+    ) -> list[Any]:
+        if status_code != 200:
+            raise SalesforceRestApiError(api_errors=_parse_errors(json_body))
+
+        if isinstance(json_body, dict) and len(json_body["results"]) == len(
+            self._sub_requests
+        ):
+            results: list[Any] = []
+
+            for sub_request, sub_response in zip(
+                self._sub_requests, json_body["results"]
+            ):
+                try:
+                    results.append(
+                        await sub_request.process_response(
+                            sub_response["statusCode"], sub_response.get("result")
+                        )
+                    )
+                except SalesforceRestApiError as rest_api_error:
+                    results.append(rest_api_error)
+
+            return results
+
+        raise UnexpectedRestApiResponsePayload(
+            "The composite batch API response payload doesn't match the expected structure."
+        )  # pragma: no cover
+
+
+class CollectionWriteRestApiRequest(RestApiRequest[list[Any]]):
+    """
+    Creates or updates up to `COLLECTION_LIMIT` records with the sObject Collections
+    API. Records succeed or fail individually: the result has one entry per record, in
+    order, with its ID or the `SalesforceRestApiError` it failed with.
+    """
+
+    def __init__(self, records: list[Record], creating: bool):
+        if not creating:
+            for record in records:
+                if "Id" not in record.fields:
+                    raise MissingFieldError(
+                        "The 'Id' field is required, but isn't present in the given Record."
+                    )
+
+        self._records = records
+        self._creating = creating
+        self._fields = [
+            record.fields if creating else _update_fields(record) for record in records
+        ]
+
+    def url(self, org_domain_url: str, api_version: str) -> str:
+        return f"{org_domain_url}/services/data/v{api_version}/composite/sobjects"
+
+    def api_type(self) -> str:
+        return "collectionCreate" if self._creating else "collectionUpdate"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.record_count": len(self._records)}
+
+    def http_method(self) -> HttpMethod:
+        return "POST" if self._creating else "PATCH"
+
+    def request_body(self) -> Json | None:
+        return {
+            "allOrNone": False,
+            "records": [
+                {
+                    "attributes": {"type": record.type},
+                    **({} if self._creating else {"Id": record.fields["Id"]}),
+                    **_normalize_record_fields(fields),
+                }
+                for record, fields in zip(self._records, self._fields)
+            ],
+        }
+
+    async def process_response(
+        self, status_code: int, json_body: Json | None
+    ) -> list[Any]:
+        results = _process_collection_response(status_code, json_body, len(self._records))
+
+        if not self._creating:
+            for record, fields, result in zip(self._records, self._fields, results):
+                if isinstance(record, TrackedRecord) and isinstance(result, str):
+                    record._mark_saved(fields)
+
+        return results
+
+
+class CollectionDeleteRestApiRequest(RestApiRequest[list[Any]]):
+    """
+    Deletes up to `COLLECTION_LIMIT` records with the sObject Collections API. The
+    result has one entry per record, in order, with its ID or the
+    `SalesforceRestApiError` it failed with.
+    """
+
+    def __init__(self, record_ids: list[str]):
+        self._record_ids = record_ids
+
+    def url(self, org_domain_url: str, api_version: str) -> str:
+        query = urlencode({"ids": ",".join(self._record_ids), "allOrNone": "false"})
+        return f"{org_domain_url}/services/data/v{api_version}/composite/sobjects?{query}"
+
+    def api_type(self) -> str:
+        return "collectionDelete"
+
+    def trace_attributes(self) -> dict[str, Any]:
+        return {"salesforce.record_count": len(self._record_ids)}
+
+    def http_method(self) -> HttpMethod:
+        return "DELETE"
+
+    def request_body(self) -> Json | None:
+        return None
+
+    async def process_response(
+        self, status_code: int, json_body: Json | None
+    ) -> list[Any]:
+        results = _process_collection_response(
+            status_code, json_body, len(self._record_ids)
+        )
+        # Results of records that don't exist don't carry an ID.
+        return [
+            result if isinstance(result, SalesforceRestApiError) else record_id
+            for record_id, result in zip(self._record_ids, results)
+        ]
+
+
+def _process_collection_response(
+    status_code: int, json_body: Json | None, record_count: int
+) -> list[Any]:
+    if status_code != 200:
+        raise SalesforceRestApiError(api_errors=_parse_errors(json_body))
+
+    if isinstance(json_body, list) and len(json_body) == record_count:
+        return [
+            str(result["id"])
+            if result["success"]
+            else SalesforceRestApiError(
+                api_errors=[
+                    InnerSalesforceRestApiError(
+                        message=error["message"],
+                        # Collections report the error code as `statusCode`.
+                        error_code=error["statusCode"],
+                        fields=error.get("fields", []),
+                    )
+                    for error in result["errors"]
+                ]
+            )
+            for result in json_body
+        ]
+
+    raise UnexpectedRestApiResponsePayload(
+        "The sObject Collections API response payload doesn't match the expected structure."
+    )  # pragma: no cover
+
+
 async def _process_records_response(
-    status_code: int, json_body: Json | None, download_file_fn: DownloadFileFunction
+    status_code: int,
+    json_body: Json | None,
+    download_file_fn: DownloadFileFunction,
+    field_converters_fn: FieldConvertersFunction | None = None,
 ) -> RecordQueryResult:
     if status_code != 200:
         raise SalesforceRestApiError(api_errors=_parse_errors(json_body))
 
     if isinstance(json_body, dict):
-        return await _parse_record_query_result(json_body, download_file_fn)
+        return await _parse_record_query_result(
+            json_body, download_file_fn, field_converters_fn
+        )
 
     raise UnexpectedRestApiResponsePayload(
         "The API response payload doesn't match the expected structure."
@@ -251,7 +857,9 @@ async def _process_records_response(
 
 
 async def _parse_record_query_result(
-    json_body: dict[str, Any], download_file_fn: DownloadFileFunction
+    json_body: dict[str, Any],
+    download_file_fn: DownloadFileFunction,
+    field_converters_fn: FieldConvertersFunction | None = None,
 ) -> RecordQueryResult:
     done: bool = json_body["done"]
     total_size: int = json_body["totalSize"]
@@ -259,7 +867,11 @@ async def _parse_record_query_result(
 
     records: list[QueriedRecord] = []
     for record_json in json_body["records"]:
-        records.append(await _parse_queried_record(record_json, download_file_fn))
+        records.append(
+            await _parse_queried_record(
+                record_json, download_file_fn, field_converters_fn
+            )
+        )
 
     return RecordQueryResult(
         done=done,
@@ -270,9 +882,16 @@ async def _parse_record_query_result(
 
 
 async def _parse_queried_record(
-    record_json: dict[str, Any], download_file_fn: DownloadFileFunction
+    record_json: dict[str, Any],
+    download_file_fn: DownloadFileFunction,
+    field_converters_fn: FieldConvertersFunction | None = None,
 ) -> QueriedRecord:
     salesforce_object_type = record_json["attributes"]["type"]
+    converters = (
+        await field_converters_fn(salesforce_object_type)
+        if field_converters_fn is not None
+        else None
+    )
 
     fields: dict[str, bytes | QueriedRecord | Any] = {}
     sub_query_results = {}
@@ -283,13 +902,22 @@ async def _parse_queried_record(
         if isinstance(value, dict):
             value = cast(dict[str, Any], value)
             if "attributes" in value:
-                fields[key] = await _parse_queried_record(value, download_file_fn)
-            else:
+                fields[key] = await _parse_queried_record(
+                    value, download_file_fn, field_converters_fn
+                )
+            elif "records" in value:
                 sub_query_results[key] = await _parse_record_query_result(
-                    value, download_file_fn
+                    value, download_file_fn, field_converters_fn
                 )
+            else:
+                # Compound fields, such as addresses and geolocations.
+                fields[key] = value if converters is None else _restore_floats(value)
         elif _is_binary_field(salesforce_object_type, key):
             fields[key] = await download_file_fn(value)
+        elif converters and value is not None and key in converters:
+            fields[key] = converters[key](value)
+        elif converters is not None and isinstance(value, Decimal):
+            fields[key] = float(value)
         else:
             fields[key] = value
 
@@ -302,10 +930,25 @@ def _is_binary_field(salesforce_object_type: str, field_name: str) -> bool:
     return salesforce_object_type == "ContentVersion" and field_name == "VersionData"
 
 
+def _update_fields(record: Record) -> dict[str, Any]:
+    """
+    The fields to send to update the given record: the changed ones of a
+    `TrackedRecord`, otherwise all of them except `Id`.
+    """
+    if isinstance(record, TrackedRecord):
+        return record.changed_fields
+
+    return {key: value for key, value in record.fields.items() if key != "Id"}
+
+
 def _normalize_record_fields(fields: dict[str, Any]) -> dict[str, Any]:
     return {key: _normalize_field_value(value) for (key, value) in fields.items()}
 
 
+def _references(fields: dict[str, Any]) -> set[ReferenceId]:
+    return {value for value in fields.values() if isinstance(value, ReferenceId)}
+
+
 def _normalize_field_value(value: Any) -> Any:
     if isinstance(value, ReferenceId):
         return f"@{{{value.id}.id}}"
@@ -0,0 +1,150 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import asyncio
+import contextvars
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Literal
+
+from heroku_applink.connection import deadline, get_deadline
+from heroku_applink.write_batching import WriteBatchingPolicy
+
+from ._requests import (
+    COLLECTION_LIMIT,
+    CollectionDeleteRestApiRequest,
+    CollectionWriteRestApiRequest,
+    RestApiRequest,
+)
+from .exceptions import SalesforceRestApiError
+from .record import Record
+
+Operation = Literal["create", "update", "delete"]
+ExecuteFunction = Callable[[RestApiRequest[Any], float | None], Awaitable[Any]]
+
+
+@dataclass(kw_only=True, slots=True)
+class _PendingWrite:
+    request: RestApiRequest[str]
+    """The request for this write alone, used if nothing else is batched with it."""
+
+    record: Record | None
+    record_id: str | None
+    timeout: float | None
+    deadline: float | None
+    future: "asyncio.Future[str]"
+
+
+class _WriteBatcher:
+    """
+    Collects concurrent writes of a `DataAPI` per operation and object type, and sends
+    them as sObject Collections requests once `WriteBatchingPolicy.max_batch_size`
+    writes were collected or `WriteBatchingPolicy.max_delay` seconds passed.
+    """
+
+    def __init__(self, policy: WriteBatchingPolicy, execute: ExecuteFunction):
+        self._max_delay = policy.max_delay
+        self._max_batch_size = max(1, min(policy.max_batch_size, COLLECTION_LIMIT))
+        self._execute = execute
+        self._pending: dict[tuple[Operation, str], list[_PendingWrite]] = {}
+        self._timers: dict[tuple[Operation, str], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        operation: Operation,
+        object_type: str,
+        request: RestApiRequest[str],
+        *,
+        record: Record | None = None,
+        record_id: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        key = (operation, object_type)
+        write = _PendingWrite(
+            request=request,
+            record=record,
+            record_id=record_id,
+            timeout=timeout,
+            deadline=get_deadline(),
+            future=loop.create_future(),
+        )
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            self._timers[key] = loop.call_later(self._max_delay, self._flush, key)
+
+        batch.append(write)
+        if len(batch) >= self._max_batch_size:
+            self._timers.pop(key).cancel()
+            self._flush(key)
+
+        return await write.future
+
+    def _flush(self, key: tuple[Operation, str]) -> None:
+        self._timers.pop(key, None)
+        batch = self._pending.pop(key)
+
+        # The batch is flushed from within one of its callers, whose context variables
+        # (request ID, deadline, trace span) don't apply to the other callers' writes.
+        # `_send()` sets the deadline that applies to the whole batch itself.
+        task = contextvars.Context().run(
+            asyncio.get_running_loop().create_task, self._send(key[0], batch)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, operation: Operation, batch: list[_PendingWrite]) -> None:
+        # Callers that gave up in the meantime don't need their write anymore.
+        batch = [write for write in batch if not write.future.cancelled()]
+        if not batch:
+            return
+
+        timeouts = [write.timeout for write in batch if write.timeout is not None]
+        timeout = min(timeouts) if timeouts else None
+        deadlines = [write.deadline for write in batch if write.deadline is not None]
+        deadline.set(min(deadlines) if deadlines else None)
+
+        try:
+            if len(batch) == 1:
+                results = [await self._execute(batch[0].request, timeout)]
+            else:
+                results = await self._execute(_collection_request(operation, batch), timeout)
+        except asyncio.CancelledError:
+            for write in batch:
+                write.future.cancel()
+            raise
+        except Exception as e:
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(e)
+            return
+
+        for write, result in zip(batch, results):
+            if write.future.done():
+                continue
+
+            if isinstance(result, SalesforceRestApiError):
+                write.future.set_exception(result)
+            else:
+                write.future.set_result(result)
+
+
+def _collection_request(
+    operation: Operation, batch: list[_PendingWrite]
+) -> RestApiRequest[list[Any]]:
+    if operation == "delete":
+        return CollectionDeleteRestApiRequest(
+            [write.record_id for write in batch if write.record_id is not None]
+        )
+
+    return CollectionWriteRestApiRequest(
+        [write.record for write in batch if write.record is not None],
+        creating=operation == "create",
+    )
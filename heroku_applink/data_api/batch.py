@@ -0,0 +1,141 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from ._requests import (
+    CreateRecordRestApiRequest,
+    DeleteRecordRestApiRequest,
+    QueryNextRecordsRestApiRequest,
+    QueryRecordsRestApiRequest,
+    RestApiRequest,
+    UpdateRecordRestApiRequest,
+)
+from .record import Record, RecordQueryResult
+from .reference_id import ReferenceId
+from .statement import BoundStatement
+
+if TYPE_CHECKING:
+    from . import DataAPI
+
+__all__ = ["Batch"]
+
+
+class Batch:
+    """
+    Represents a `Batch`.
+
+    A `Batch` collects independent Salesforce operations and sends them with the
+    Composite Batch API, so they take one round-trip instead of one each. Unlike a
+    `UnitOfWork`, the operations are not atomic and can't refer to each other's
+    results: each one succeeds or fails on its own.
+
+    Create a `Batch` with `DataAPI.batch()`, register operations using methods such as
+    `register_query`, then send them with `execute`. Batches with more than 25
+    operations are split into several Composite Batch API requests, which are sent
+    concurrently.
+
+    For example:
+
+    ```python
+    batch = context.org.data_api.batch()
+
+    accounts_reference_id = batch.register_query("SELECT Id, Name FROM Account")
+    contacts_reference_id = batch.register_query("SELECT Id, Name FROM Contact")
+
+    results = await batch.execute()
+
+    accounts = results[accounts_reference_id].records
+    ```
+    """
+
+    def __init__(self, data_api: "DataAPI") -> None:
+        self._data_api = data_api
+        self._sub_requests: dict[ReferenceId, RestApiRequest[Any]] = {}
+        self._next_reference_id = 0
+
+    def __len__(self) -> int:
+        return len(self._sub_requests)
+
+    def register_query(
+        self, soql: str | BoundStatement, convert_field_types: bool = False
+    ) -> ReferenceId:
+        """
+        Register a query for the `Batch`. Its result is a `RecordQueryResult`.
+
+        See `DataAPI.query()` for a description of `convert_field_types`.
+        """
+        return self._register(
+            QueryRecordsRestApiRequest(
+                soql,
+                self._data_api._download_file,
+                self._data_api._field_converters if convert_field_types else None,
+            )
+        )
+
+    def register_query_more(
+        self, result: RecordQueryResult, convert_field_types: bool = False
+    ) -> ReferenceId:
+        """
+        Register a query for the next records of the given `RecordQueryResult`, which
+        must not be `done`. Its result is a `RecordQueryResult`.
+        """
+        if result.next_records_url is None:
+            raise ValueError("The given RecordQueryResult has no more records.")
+
+        return self._register(
+            QueryNextRecordsRestApiRequest(
+                result.next_records_url,
+                self._data_api._download_file,
+                self._data_api._field_converters if convert_field_types else None,
+            )
+        )
+
+    def register_create(self, record: Record) -> ReferenceId:
+        """
+        Register a record creation for the `Batch`. Its result is the ID of the created
+        record.
+        """
+        return self._register(CreateRecordRestApiRequest(record))
+
+    def register_update(self, record: Record) -> ReferenceId:
+        """
+        Register a record update for the `Batch`. The given `Record` must contain an
+        `Id` field. Its result is the ID of the updated record.
+
+        If the given record is a `TrackedRecord`, only its changed fields are sent, and
+        nothing is sent if none changed.
+        """
+        return self._register(UpdateRecordRestApiRequest(record))
+
+    def register_delete(self, object_type: str, record_id: str) -> ReferenceId:
+        """
+        Register a deletion of an existing record of the given type and ID. Its result
+        is the ID of the deleted record.
+        """
+        return self._register(DeleteRecordRestApiRequest(object_type, record_id))
+
+    async def execute(self, timeout: float | None = None) -> dict[ReferenceId, Any]:
+        """
+        Send all registered operations and return their results, keyed with the
+        `ReferenceId` objects returned from the `register*` functions.
+
+        Since the operations are independent, an operation that failed doesn't fail
+        the others: its result is the `SalesforceRestApiError` describing the failure,
+        instead of being raised.
+        """
+        results = await self._data_api._execute_batch(
+            list(self._sub_requests.values()), timeout=timeout
+        )
+        return dict(zip(self._sub_requests, results))
+
+    def _register(self, request: RestApiRequest[Any]) -> ReferenceId:
+        reference_id = ReferenceId(id="batchRequest" + str(self._next_reference_id))
+        self._next_reference_id += 1
+
+        self._sub_requests[reference_id] = request
+        return reference_id
@@ -0,0 +1,124 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import asyncio
+
+from typing import TYPE_CHECKING, Iterable
+
+from .record import QueriedRecord
+
+if TYPE_CHECKING:
+    from . import DataAPI
+
+__all__ = ["RecordLoader"]
+
+
+class RecordLoader:
+    """
+    Loads records of one object type by ID, batching and memoizing the lookups.
+
+    All IDs requested in the same event loop iteration, such as by concurrent
+    handlers or with `asyncio.gather`, are fetched together with
+    `DataAPI.query_by_ids()`. Each record is fetched at most once: later loads of the
+    same ID return the same record without a request.
+
+    Get a loader for the current request with `ClientContext.loader()`. For example:
+
+    ```python
+    loader = context.loader("Account", ["Name", "Industry"])
+
+    # One query for all accounts, instead of one per contact.
+    accounts = await asyncio.gather(
+        *(loader.load(contact.get("AccountId")) for contact in contacts)
+    )
+    ```
+
+    Loads awaited one after the other in a loop can't be batched, use `load_many`
+    for those instead.
+    """
+
+    def __init__(
+        self,
+        data_api: "DataAPI",
+        object_type: str,
+        fields: Iterable[str],
+        timeout: float | None = None,
+    ) -> None:
+        """
+        `timeout` applies to each request.
+        """
+        self._data_api = data_api
+        self._object_type = object_type
+        self._fields = tuple(fields)
+        self._timeout = timeout
+        self._futures: dict[str, "asyncio.Future[QueriedRecord | None]"] = {}
+        self._queue: list[str] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, record_id: str) -> QueriedRecord | None:
+        """
+        Load the record with the given ID, or `None` if it doesn't exist.
+        """
+        future = self._futures.get(record_id)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[record_id] = loop.create_future()
+
+            if not self._queue:
+                # Runs after the other tasks that are ready, which may load more IDs.
+                loop.call_soon(self._dispatch)
+            self._queue.append(record_id)
+
+        # Callers that give up don't cancel the load for the others.
+        return await asyncio.shield(future)
+
+    async def load_many(self, record_ids: Iterable[str]) -> list[QueriedRecord | None]:
+        """
+        Load the records with the given IDs, in the same order. Records that don't
+        exist are `None`.
+        """
+        return list(await asyncio.gather(*(self.load(record_id) for record_id in record_ids)))
+
+    def clear(self, record_id: str | None = None) -> None:
+        """
+        Forget the loaded record with the given ID, or all of them, so the next load
+        fetches it again, such as after updating it.
+        """
+        if record_id is None:
+            self._futures = {key: self._futures[key] for key in self._queue}
+        elif record_id not in self._queue:
+            self._futures.pop(record_id, None)
+
+    def _dispatch(self) -> None:
+        record_ids, self._queue = self._queue, []
+
+        task = asyncio.get_running_loop().create_task(self._fetch(record_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, record_ids: list[str]) -> None:
+        futures = [self._futures[record_id] for record_id in record_ids]
+
+        try:
+            records = await self._data_api.query_by_ids(
+                self._object_type, self._fields, record_ids, timeout=self._timeout
+            )
+        except BaseException as e:
+            # Failed loads are retried by the next load of the same ID.
+            for record_id, future in zip(record_ids, futures):
+                if self._futures.get(record_id) is future:
+                    del self._futures[record_id]
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+
+        for record_id, future in zip(record_ids, futures):
+            if not future.done():
+                future.set_result(records.get(record_id))
@@ -5,10 +5,12 @@ SPDX-License-Identifier: BSD-3-Clause
 For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
 """
 
+import copy
+
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Mapping
 
-__all__ = ["Record", "QueriedRecord", "RecordQueryResult"]
+__all__ = ["Record", "QueriedRecord", "TrackedRecord", "RecordQueryResult"]
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -50,6 +52,83 @@ class QueriedRecord(Record):
     """Additional query results from sub queries."""
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TrackedRecord(QueriedRecord):
+    """
+    A `QueriedRecord` that remembers the original values of its fields, so updates
+    only send the fields that changed.
+
+    Create one from a queried record with `TrackedRecord.track()`, then change its
+    fields with `set()` or through `fields`:
+
+    ```python
+    result = await context.org.data_api.query("SELECT Id, Name, Phone FROM Account")
+    account = TrackedRecord.track(result.records[0])
+
+    account.set("Phone", "(415) 555-1212")
+
+    # Only sends the `Phone` field. Updates of unchanged records aren't sent at all.
+    await context.org.data_api.update(account)
+    ```
+
+    Once an update succeeded, the sent values become the original values. To clear a
+    field, set it to `None`; removing it from `fields` doesn't count as a change.
+    """
+
+    _original_fields: dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._original_fields.update(copy.deepcopy(self.fields))
+
+    @classmethod
+    def track(cls, record: Record) -> "TrackedRecord":
+        """
+        Start tracking changes to a copy of the given record's fields.
+        """
+        return cls(
+            type=record.type,
+            fields=dict(record.fields),
+            sub_query_results=(
+                dict(record.sub_query_results)
+                if isinstance(record, QueriedRecord)
+                else {}
+            ),
+        )
+
+    def set(self, field_name: str, value: Any) -> None:
+        """
+        Set the value of a field of the record.
+        """
+        self.fields[field_name] = value
+
+    @property
+    def changed_fields(self) -> dict[str, Any]:
+        """
+        The fields whose values differ from the original ones, except `Id`.
+        """
+        return {
+            name: value
+            for name, value in self.fields.items()
+            if name != "Id"
+            and (
+                name not in self._original_fields
+                or self._original_fields[name] != value
+            )
+        }
+
+    @property
+    def is_changed(self) -> bool:
+        """
+        Whether any field differs from its original value.
+        """
+        return bool(self.changed_fields)
+
+    def _mark_saved(self, fields: Mapping[str, Any]) -> None:
+        self._original_fields.update(copy.deepcopy(dict(fields)))
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class RecordQueryResult:
     """The result of a record query."""
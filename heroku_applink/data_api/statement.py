@@ -0,0 +1,233 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import datetime
+import functools
+import re
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+from urllib.parse import quote_plus
+
+__all__ = ["PreparedStatement", "BoundStatement"]
+
+_NEEDS_ESCAPING = re.compile(r"[\\'\"\n\r\t\b\f]")
+_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "'": "\\'",
+        '"': '\\"',
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+        "\b": "\\b",
+        "\f": "\\f",
+    }
+)
+
+# Literals made of these characters, such as lists of IDs, are URL-encoded with a
+# few replacements instead of `quote_plus`, which is several times slower.
+_SIMPLE_LITERAL = re.compile(r"[\w.~' ,():-]*", re.ASCII)
+_URL_ESCAPES = (
+    ("'", "%27"), (" ", "+"), (",", "%2C"), ("(", "%28"), (")", "%29"), (":", "%3A")
+)
+
+
+class PreparedStatement:
+    """
+    A SOQL query with named bind parameters, such as
+    `SELECT Id, Name FROM Account WHERE Id IN :ids`, compiled once and bound to
+    values for each query. Create one with `DataAPI.prepare()`.
+
+    Values are escaped when they're bound, so they can't change the structure of the
+    query. The static parts of the query are URL-encoded once, when it's compiled.
+    """
+
+    __slots__ = ("key", "parameters", "_parts", "_encoded_parts")
+
+    def __init__(self, soql: str) -> None:
+        parts, parameters = _parse(soql)
+
+        self.key: str = parts[0] + "".join(
+            f":{name}{part}" for name, part in zip(parameters, parts[1:])
+        )
+        """
+        The normalized query, with its whitespace collapsed and its bind parameters
+        left in place. Queries of the same shape have the same key, which makes it
+        suitable to group them, such as in metrics.
+        """
+
+        self.parameters: tuple[str, ...] = parameters
+        """The names of the bind parameters, in the order they appear in the query."""
+
+        self._parts = tuple(parts)
+        self._encoded_parts = tuple(quote_plus(part) for part in parts)
+
+    def __repr__(self) -> str:
+        return f"PreparedStatement({self.key!r})"
+
+    def bind(self, **values: Any) -> "BoundStatement":
+        """
+        Bind values to all parameters, returning a query for `DataAPI.query()` and
+        related methods.
+
+        Strings, numbers, booleans, `None`, `datetime.date` and timezone-aware
+        `datetime.datetime` values are supported, as well as lists, tuples and sets of
+        them for `IN` conditions.
+        """
+        missing = [name for name in self.parameters if name not in values]
+        if missing:
+            raise ValueError(f"Missing values for bind parameters: {', '.join(missing)}")
+
+        unknown = [name for name in values if name not in self.parameters]
+        if unknown:
+            raise ValueError(f"Unknown bind parameters: {', '.join(unknown)}")
+
+        soql = [self._parts[0]]
+        encoded = [self._encoded_parts[0]]
+        for name, part, encoded_part in zip(
+            self.parameters, self._parts[1:], self._encoded_parts[1:]
+        ):
+            literal = _soql_literal(values[name])
+            soql += (literal, part)
+            encoded += (_url_encode(literal), encoded_part)
+
+        return BoundStatement(statement=self, soql="".join(soql), encoded_soql="".join(encoded))
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class BoundStatement:
+    """
+    A `PreparedStatement` with values bound to its parameters, ready to be queried.
+    """
+
+    statement: PreparedStatement
+    """The statement the values were bound to."""
+
+    soql: str
+    """The SOQL query with the values in place of the bind parameters."""
+
+    encoded_soql: str
+    """The SOQL query, URL-encoded for the `q` query parameter."""
+
+    @property
+    def key(self) -> str:
+        """The normalized query of the statement. See `PreparedStatement.key`."""
+        return self.statement.key
+
+    def __str__(self) -> str:
+        return self.soql
+
+
+@functools.lru_cache(maxsize=1024)
+def _prepare(soql: str) -> PreparedStatement:
+    return PreparedStatement(soql)
+
+
+def _parse(soql: str) -> tuple[list[str], tuple[str, ...]]:
+    """
+    Split a query into its static parts and the names of the bind parameters between
+    them, collapsing whitespace outside of string literals.
+    """
+    parts: list[str] = []
+    parameters: list[str] = []
+    current: list[str] = []
+    index = 0
+
+    while index < len(soql):
+        char = soql[index]
+
+        if char == "'":
+            # String literals are copied as is, including escaped quotes.
+            end = index + 1
+            while end < len(soql) and soql[end] != "'":
+                end += 2 if soql[end] == "\\" else 1
+            current.append(soql[index : end + 1])
+            index = end + 1
+        elif char.isspace():
+            while index < len(soql) and soql[index].isspace():
+                index += 1
+            current.append(" ")
+        elif char == ":" and index + 1 < len(soql) and (
+            soql[index + 1].isalpha() or soql[index + 1] == "_"
+        ):
+            end = index + 1
+            while end < len(soql) and (soql[end].isalnum() or soql[end] == "_"):
+                end += 1
+            parts.append("".join(current))
+            parameters.append(soql[index + 1 : end])
+            current = []
+            index = end
+        else:
+            current.append(char)
+            index += 1
+
+    parts.append("".join(current))
+    parts[0] = parts[0].lstrip()
+    parts[-1] = parts[-1].rstrip()
+    return parts, tuple(parameters)
+
+
+def _url_encode(literal: str) -> str:
+    if _SIMPLE_LITERAL.fullmatch(literal):
+        for char, escape in _URL_ESCAPES:
+            literal = literal.replace(char, escape)
+        return literal
+
+    return quote_plus(literal)
+
+
+def _soql_literal(value: Any) -> str:
+    # Strings and lists of IDs are by far the most common values.
+    if type(value) is str:
+        return _soql_string(value)
+
+    if value is None:
+        return "null"
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    if isinstance(value, int):
+        return str(value)
+
+    if isinstance(value, (float, Decimal)):
+        # SOQL has no literals for NaN or infinity, nor exponent notation.
+        number = value if isinstance(value, Decimal) else Decimal(repr(value))
+        if not number.is_finite():
+            raise ValueError(f"Numeric values must be finite: {value!r}")
+
+        return format(number, "f")
+
+    if isinstance(value, str):
+        return _soql_string(value)
+
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            raise ValueError(f"Datetime values must be timezone-aware: {value!r}")
+
+        utc = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return utc.isoformat(timespec="milliseconds") + "Z"
+
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if not value:
+            raise ValueError("Values for IN conditions must not be empty.")
+
+        return "(" + ", ".join(_soql_literal(item) for item in value) + ")"
+
+    raise TypeError(f"Unsupported bind parameter value: {value!r}")
+
+
+def _soql_string(value: str) -> str:
+    if _NEEDS_ESCAPING.search(value):
+        value = value.translate(_ESCAPES)
+
+    return "'" + value + "'"
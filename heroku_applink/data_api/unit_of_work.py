@@ -8,6 +8,7 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 from ._requests import (
     CreateRecordRestApiRequest,
     DeleteRecordRestApiRequest,
+    GraphNode,
     RestApiRequest,
     UpdateRecordRestApiRequest,
 )
@@ -27,7 +28,8 @@ class UnitOfWork:
 
     First, register the create, update, or delete operations that make up the `UnitOfWork`
     using their corresponding methods, such as `register_create`. Then submit the `UnitOfWork`
-    with the `commit_unit_of_work` method of `DataAPI`.
+    with the `commit_unit_of_work` method of `DataAPI`. Each operation is serialized when
+    it's registered, so changes made to a record after registering it aren't sent.
 
     For example:
 
@@ -64,6 +66,8 @@ class UnitOfWork:
 
     def __init__(self) -> None:
         self._sub_requests: dict[ReferenceId, RestApiRequest[str]] = {}
+        self._nodes: list[GraphNode] = []
+        self._local_results: dict[ReferenceId, str] = {}
         self._next_reference_id = 0
 
     def register_create(self, record: Record) -> ReferenceId:
@@ -94,7 +98,8 @@ class UnitOfWork:
         """
         Register a record update for the `UnitOfWork`.
 
-        The given `Record` must contain an `Id` field.
+        The given `Record` must contain an `Id` field. If it's a `TrackedRecord`, only
+        its changed fields are sent, and nothing is sent if none changed.
 
         Returns a `ReferenceId` that you can use to refer to the updated record in subsequent operations in this
         `UnitOfWork`.
@@ -139,4 +144,8 @@ class UnitOfWork:
         self._next_reference_id += 1
 
         self._sub_requests[reference_id] = request
+        node = GraphNode(reference_id, request, self._local_results)
+        if node.local_result is not None:
+            self._local_results[reference_id] = node.local_result
+        self._nodes.append(node)
         return reference_id
@@ -12,3 +12,24 @@ class ClientError(Exception):
 class UnexpectedRestApiResponsePayload(Exception):
     """Raised when the API response is not in the expected format."""
     pass
+
+class DeadlineExceededError(ClientError):
+    """
+    Raised when the deadline of the current request ran out before an outbound
+    request could be made or finished.
+    """
+    pass
+
+class CircuitOpenError(ClientError):
+    """
+    Raised without making a request when the circuit breaker for the org is open,
+    because its recent requests kept failing. See `CircuitBreakerPolicy`.
+    """
+    pass
+
+class StreamingError(ClientError):
+    """
+    Raised when the Streaming API rejects a handshake, subscription or connection, or
+    a `StreamingClient` couldn't reconnect to it.
+    """
+    pass
@@ -0,0 +1,83 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import math
+import threading
+
+from collections import deque
+from dataclasses import dataclass
+
+__all__ = ["HedgingPolicy"]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class HedgingPolicy:
+    """
+    Configures hedged requests for Data API queries. If a query (or a request for its
+    next records) hasn't been answered after the observed `quantile` of recent query
+    latencies for the same org, a duplicate request is sent on another pooled
+    connection. The first response wins and the other request is cancelled.
+
+    By construction, about `1 - quantile` of all queries are hedged, which trades a
+    few percent of extra API requests for a shorter tail latency.
+
+    ```python
+    config = sdk.Config(hedging=sdk.HedgingPolicy(quantile=0.95))
+    ```
+    """
+
+    quantile: float = 0.95
+    """The latency quantile, between `0` and `1`, after which a request is hedged."""
+
+    min_delay: float = 0.01
+    """Never hedge sooner than this many seconds after sending the first request."""
+
+    min_samples: int = 20
+    """Don't hedge until this many latencies were observed for an org."""
+
+    window_size: int = 200
+    """How many recent latencies per org the quantile is computed from."""
+
+
+class _LatencyWindow:
+    """
+    The most recent latencies observed for an org, with a cached quantile that's
+    recomputed at most every `_REFRESH_EVERY` observations.
+    """
+
+    _REFRESH_EVERY = 10
+
+    def __init__(self, size: int):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._observations_since_refresh = 0
+        self._quantiles: dict[float, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+            self._observations_since_refresh += 1
+
+            if self._observations_since_refresh >= self._REFRESH_EVERY:
+                self._quantiles.clear()
+                self._observations_since_refresh = 0
+
+    def quantile(self, quantile: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+
+            value = self._quantiles.get(quantile)
+            if value is None:
+                ordered = sorted(self._samples)
+                index = min(len(ordered) - 1, math.ceil(quantile * len(ordered)) - 1)
+                value = self._quantiles[quantile] = ordered[max(index, 0)]
+
+            return value
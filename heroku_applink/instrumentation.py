@@ -0,0 +1,313 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import aiohttp
+import bisect
+import threading
+import time
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+__all__ = [
+    "Instrumentation",
+    "RequestEvent",
+    "Histogram",
+    "HistogramCollector",
+]
+
+
+@dataclass(kw_only=True, slots=True)
+class RequestEvent:
+    """
+    Information about a single attempt of an outbound HTTP request made by a
+    `Connection`.
+
+    Timings are in seconds and are `None` when the corresponding phase didn't happen,
+    for example `dns` and `connect` are `None` when a pooled connection was reused.
+    """
+
+    method: str
+    """The HTTP method of the request."""
+
+    url: str
+    """The URL of the request."""
+
+    request_id: str
+    """The `X-Request-Id` header sent with the request."""
+
+    attempt: int = 1
+    """The attempt number, starting at `1`. Retries have higher attempt numbers."""
+
+    start_time: float = 0.0
+    """When the attempt started, as a `time.perf_counter()` value."""
+
+    end_time: float | None = None
+    """When the attempt finished, as a `time.perf_counter()` value."""
+
+    pool_wait: float | None = None
+    """Time spent waiting for a free connection in the connection pool."""
+
+    dns: float | None = None
+    """Time spent resolving the host name."""
+
+    connect: float | None = None
+    """Time spent establishing a new connection, including the TLS handshake."""
+
+    reused_connection: bool = False
+    """Whether a pooled connection was reused for the request."""
+
+    server: float | None = None
+    """Time between sending the request headers and receiving the response headers."""
+
+    status: int | None = None
+    """The HTTP status code of the response, if one was received."""
+
+    response_size: int | None = None
+    """The size of the response body in bytes, if one was received."""
+
+    error: BaseException | None = None
+    """The exception that failed the attempt, if any."""
+
+    hedge: bool = False
+    """Whether this is a hedged duplicate of a slow attempt (see `HedgingPolicy`)."""
+
+    _headers_sent_time: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        """The total duration of the attempt, including reading the response body."""
+        if self.end_time is None:
+            return None
+
+        return self.end_time - self.start_time
+
+
+class Instrumentation:
+    """
+    Base class for receiving callbacks about outbound HTTP requests.
+
+    Subclass this and override the callbacks you're interested in, then pass an
+    instance as `Config.instrumentation`. Callbacks are invoked inline with the
+    request, so they should be fast and must not raise.
+
+    ```python
+    class SlowRequestLogger(sdk.Instrumentation):
+        def on_request_end(self, event):
+            if event.duration > 1:
+                print(f"{event.method} {event.url} took {event.duration:.2f}s")
+
+    config = sdk.Config(instrumentation=SlowRequestLogger())
+    ```
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Called before each attempt of a request is sent."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """
+        Called after each attempt of a request finished, either with the response body
+        read or with an error.
+        """
+
+    def on_retry(self, event: RequestEvent, delay: float) -> None:
+        """
+        Called when the attempt described by `event` failed and is retried after
+        `delay` seconds.
+        """
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram that is cheap to update from hot paths.
+    """
+
+    DEFAULT_BUCKETS: tuple[float, ...] = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75,
+        1.0, 2.5, 5.0, 7.5, 10.0, 30.0, 60.0,
+    )
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra bucket for values above the largest bound.
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def percentile(self, quantile: float) -> float | None:
+        """
+        Estimate the value below which `quantile` (between `0` and `1`) of the recorded
+        values fall, as the upper bound of the matching bucket. Returns `None` if
+        nothing was recorded yet.
+        """
+        if self.count == 0:
+            return None
+
+        threshold = quantile * self.count
+        cumulative = 0
+
+        for index, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= threshold and bucket_count:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+
+        return float("inf")  # pragma: no cover
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Summarize the histogram as count, sum, and common percentiles."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class HistogramCollector(Instrumentation):
+    """
+    An `Instrumentation` that records request timings and response sizes into
+    in-process histograms.
+
+    ```python
+    collector = sdk.HistogramCollector()
+    config = sdk.Config(instrumentation=collector)
+
+    # ... later, for example in a debug endpoint:
+    collector.snapshot()["total"]["p99"]
+    ```
+    """
+
+    TIMINGS = ("total", "pool_wait", "dns", "connect", "server")
+
+    SIZE_BUCKETS: tuple[float, ...] = (
+        256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+    )
+
+    def __init__(self) -> None:
+        self.timings = {name: Histogram() for name in self.TIMINGS}
+        self.response_size = Histogram(self.SIZE_BUCKETS)
+        self.status_counts: dict[int, int] = {}
+        self.errors = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        self.timings["total"].observe(event.duration or 0.0)
+
+        for name, value in (
+            ("pool_wait", event.pool_wait),
+            ("dns", event.dns),
+            ("connect", event.connect),
+            ("server", event.server),
+        ):
+            if value is not None:
+                self.timings[name].observe(value)
+
+        if event.response_size is not None:
+            self.response_size.observe(event.response_size)
+
+        with self._lock:
+            if event.status is not None:
+                self.status_counts[event.status] = self.status_counts.get(event.status, 0) + 1
+            if event.error is not None:
+                self.errors += 1
+
+    def on_retry(self, event: RequestEvent, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> dict:
+        """
+        Summarize everything recorded so far as plain data, for example to serialize
+        it as JSON.
+        """
+        with self._lock:
+            status_counts = dict(self.status_counts)
+            errors = self.errors
+            retries = self.retries
+
+        return {
+            **{name: histogram.summary() for name, histogram in self.timings.items()},
+            "response_size": self.response_size.summary(),
+            "status_counts": status_counts,
+            "errors": errors,
+            "retries": retries,
+        }
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """
+    Build an `aiohttp.TraceConfig` that fills in the phase timings of the
+    `RequestEvent` passed as `trace_request_ctx` of a request.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    def _event(trace_config_ctx: SimpleNamespace) -> RequestEvent | None:
+        event = trace_config_ctx.trace_request_ctx
+        return event if isinstance(event, RequestEvent) else None
+
+    async def on_connection_queued_start(session, trace_config_ctx, params):
+        trace_config_ctx.queued_start = time.perf_counter()
+
+    async def on_connection_queued_end(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None:
+            event.pool_wait = time.perf_counter() - trace_config_ctx.queued_start
+
+    async def on_dns_resolvehost_start(session, trace_config_ctx, params):
+        trace_config_ctx.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None:
+            event.dns = time.perf_counter() - trace_config_ctx.dns_start
+
+    async def on_connection_create_start(session, trace_config_ctx, params):
+        trace_config_ctx.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None:
+            event.connect = time.perf_counter() - trace_config_ctx.connect_start
+
+    async def on_connection_reuseconn(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None:
+            event.reused_connection = True
+
+    async def on_request_headers_sent(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None:
+            event._headers_sent_time = time.perf_counter()
+
+    async def on_request_end(session, trace_config_ctx, params):
+        event = _event(trace_config_ctx)
+        if event is not None and event._headers_sent_time is not None:
+            event.server = time.perf_counter() - event._headers_sent_time
+
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_request_headers_sent.append(on_request_headers_sent)
+    trace_config.on_request_end.append(on_request_end)
+
+    return trace_config
@@ -0,0 +1,401 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import math
+import threading
+
+from typing import Callable, Iterator
+
+from .instrumentation import Histogram
+
+__all__ = [
+    "MetricsRegistry",
+    "CounterMetric",
+    "GaugeMetric",
+    "HistogramMetric",
+    "MetricsAsgiApp",
+    "REGISTRY",
+]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], labelvalues: tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(labelnames, labelvalues)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError  # pragma: no cover
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self._samples(),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class CounterMetric(_Metric):
+    """
+    A monotonically increasing value, such as a number of requests.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the counter for the given labels by `amount`."""
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        """Get the current value for the given labels."""
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class GaugeMetric(_Metric):
+    """
+    A value that can go up and down, such as a number of in-flight requests.
+
+    Instead of being set explicitly, a gauge without labels can compute its value
+    with a `callback` whenever it's rendered.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        callback: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for the given labels to `value`."""
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the gauge for the given labels by `amount`."""
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease the gauge for the given labels by `amount`."""
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: str) -> float:
+        """Get the current value for the given labels."""
+        if self._callback is not None:
+            return self._callback()
+
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterator[str]:
+        if self._callback is not None:
+            yield f"{self.name} {_format_value(self._callback())}"
+            return
+
+        with self._lock:
+            values = list(self._values.items())
+
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class HistogramMetric(_Metric):
+    """
+    A distribution of observed values, such as request durations, in fixed buckets.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._buckets = buckets
+        self._histograms: dict[tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record `value` for the given labels."""
+        key = self._key(labels)
+        histogram = self._histograms.get(key)
+
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self._buckets))
+
+        histogram.observe(value)
+
+    def get(self, **labels: str) -> Histogram | None:
+        """Get the underlying `Histogram` for the given labels, if any."""
+        return self._histograms.get(self._key(labels))
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            histograms = list(self._histograms.items())
+
+        for key, histogram in histograms:
+            labelnames = (*self.labelnames, "le")
+            cumulative = 0
+
+            for bound, bucket_count in zip(
+                (*histogram.buckets, math.inf), histogram.bucket_counts
+            ):
+                cumulative += bucket_count
+                labels = _format_labels(labelnames, (*key, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(histogram.sum)}"
+            yield f"{self.name}_count{labels} {histogram.count}"
+
+
+class MetricsRegistry:
+    """
+    A collection of metrics that can be rendered in the Prometheus text exposition
+    format.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> CounterMetric:
+        """Get or create the counter with the given name."""
+        return self._register(CounterMetric(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        callback: Callable[[], float] | None = None,
+    ) -> GaugeMetric:
+        """Get or create the gauge with the given name."""
+        return self._register(GaugeMetric(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS,
+    ) -> HistogramMetric:
+        """Get or create the histogram with the given name."""
+        return self._register(HistogramMetric(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        return "".join(metric.render() for metric in metrics)
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered differently")
+
+        return existing
+
+
+class MetricsAsgiApp:
+    """
+    An ASGI app serving the metrics of a `MetricsRegistry` in the Prometheus text
+    exposition format.
+
+    Mount it next to `IntegrationAsgiMiddleware`, for example with FastAPI:
+
+    ```python
+    app = FastAPI()
+    app.add_middleware(sdk.IntegrationAsgiMiddleware, metrics_path="/metrics")
+    ```
+
+    or, to serve it from a separate app:
+
+    ```python
+    metrics_app = FastAPI()
+    metrics_app.mount("/metrics", sdk.MetricsAsgiApp())
+    ```
+    """
+
+    CONTENT_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, registry: "MetricsRegistry | None" = None):
+        self.registry = registry if registry is not None else REGISTRY
+
+    async def __call__(self, scope, receive, send):
+        body = self.registry.render().encode("utf-8")
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", self.CONTENT_TYPE),
+                    (b"content-length", str(len(body)).encode("latin1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+REGISTRY = MetricsRegistry()
+"""The registry all SDK metrics are recorded in."""
+
+_HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "heroku_applink_http_requests_in_flight",
+    "Outbound HTTP requests currently in flight, per org host.",
+    ("org",),
+)
+_HTTP_RESPONSE_BYTES = REGISTRY.counter(
+    "heroku_applink_http_response_bytes_total",
+    "Bytes of response bodies downloaded, per org host.",
+    ("org",),
+)
+_HTTP_RETRIES = REGISTRY.counter(
+    "heroku_applink_http_retries_total",
+    "Outbound HTTP request attempts that were retried, per org host.",
+    ("org",),
+)
+_HTTP_HEDGED_REQUESTS = REGISTRY.counter(
+    "heroku_applink_http_hedged_requests_total",
+    "Outbound requests that were hedged with a duplicate request, per org host.",
+    ("org",),
+)
+_HTTP_HEDGE_WINS = REGISTRY.counter(
+    "heroku_applink_http_hedge_wins_total",
+    "Hedged requests where the duplicate request answered first, per org host.",
+    ("org",),
+)
+_CIRCUIT_BREAKER_STATE = REGISTRY.gauge(
+    "heroku_applink_circuit_breaker_state",
+    "Circuit breaker state per org host: 0 closed, 1 open, 2 half-open.",
+    ("org",),
+)
+_CIRCUIT_BREAKER_OPENED = REGISTRY.counter(
+    "heroku_applink_circuit_breaker_opened_total",
+    "Times the circuit breaker opened, per org host.",
+    ("org",),
+)
+_CIRCUIT_BREAKER_REJECTED = REGISTRY.counter(
+    "heroku_applink_circuit_breaker_rejected_total",
+    "Outbound requests rejected because the circuit breaker was open, per org host.",
+    ("org",),
+)
+_DATA_API_REQUEST_DURATION = REGISTRY.histogram(
+    "heroku_applink_data_api_request_duration_seconds",
+    "Duration of Data API calls, including parsing the response, per API type.",
+    ("api_type",),
+)
+_DATA_API_RECORDS_PARSED = REGISTRY.counter(
+    "heroku_applink_data_api_records_parsed_total",
+    "Records parsed from query results, per API type.",
+    ("api_type",),
+)
+_CACHE_REQUESTS = REGISTRY.counter(
+    "heroku_applink_cache_requests_total",
+    "Cache lookups, per cache and result (hit or miss).",
+    ("cache", "result"),
+)
+_SALESFORCE_API_USAGE = REGISTRY.gauge(
+    "heroku_applink_salesforce_api_usage",
+    "API requests used in the last 24 hours, from the Sforce-Limit-Info header.",
+    ("org",),
+)
+_SALESFORCE_API_LIMIT = REGISTRY.gauge(
+    "heroku_applink_salesforce_api_limit",
+    "API request limit for 24 hours, from the Sforce-Limit-Info header.",
+    ("org",),
+)
+
+
+def _record_cache_lookup(cache: str, hit: bool) -> None:
+    _CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _record_limit_info(org: str, limit_info: str) -> None:
+    """
+    Record the `Sforce-Limit-Info` response header, such as `api-usage=25/5000`.
+    """
+    for part in limit_info.split(","):
+        name, _, value = part.strip().partition("=")
+        if name != "api-usage":
+            continue
+
+        used, _, limit = value.partition("/")
+        if used.isdigit() and limit.isdigit():
+            _SALESFORCE_API_USAGE.set(int(used), org=org)
+            _SALESFORCE_API_LIMIT.set(int(limit), org=org)
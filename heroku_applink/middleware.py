@@ -7,15 +7,20 @@ For full license text, see the LICENSE file in the repo root or https://opensour
 
 import uuid
 
+from . import _tracing
 from .config import Config
-from .context import ClientContext, set_client_context
-from .connection import Connection, set_request_id
+from .context import ClientContext, DataAPIPool, set_client_context
+from .connection import Connection, set_deadline, set_request_id
+from .metrics import MetricsAsgiApp
 
 class IntegrationWsgiMiddleware:
     def __init__(self, app, config=Config.default()):
         self.app = app
         self.config = config
         self.connection = Connection(self.config)
+        self.data_api_pool = DataAPIPool(
+            self.connection, max_size=self.config.data_api_pool_size
+        )
 
     def __call__(self, environ, start_response):
         header = environ.get("HTTP_X_CLIENT_CONTEXT")
@@ -23,30 +28,187 @@ class IntegrationWsgiMiddleware:
         if not header:
             raise ValueError("x-client-context not set")
 
-        set_client_context(ClientContext.from_header(header, self.connection))
+        client_context = ClientContext.from_header(
+            header, self.connection, self.data_api_pool
+        )
+        set_client_context(client_context)
         set_request_id(environ.get("HTTP_X_REQUEST_ID", str(uuid.uuid4())))
+        set_deadline(
+            _request_timeout(
+                self.config,
+                environ.get(_wsgi_header_key(self.config.deadline_header))
+                if self.config.deadline_header
+                else None,
+            )
+        )
 
-        return self.app(environ, start_response)
+        trace_context = None
+        if _tracing.ENABLED:
+            trace_context = _tracing.extract(
+                {
+                    name: environ[key]
+                    for name, key in (
+                        ("traceparent", "HTTP_TRACEPARENT"),
+                        ("tracestate", "HTTP_TRACESTATE"),
+                    )
+                    if key in environ
+                }
+            )
+
+        # The server sends the response body after the app returns, so the span is
+        # ended once the server closes the body.
+        with _tracing.start_span(
+            environ.get("REQUEST_METHOD", "HTTP"),
+            _request_span_attributes(
+                client_context, environ.get("REQUEST_METHOD"), environ.get("PATH_INFO")
+            ),
+            kind="server",
+            context=trace_context,
+            end_on_exit=False,
+        ) as span:
+            body = self.app(environ, start_response)
+
+        if not _tracing.ENABLED:
+            return body
+
+        return _TracedBody(body, span)
+
+class _TracedBody:
+    """
+    The response body of a WSGI app, which ends the request's span when the server
+    closes it. Servers close the body once it was sent, the client disconnected, or
+    iterating it failed (see PEP 3333).
+    """
+
+    __slots__ = ("_body", "_span", "_error")
+
+    def __init__(self, body, span):
+        self._body = body
+        self._span = span
+        self._error = None
+
+    def __iter__(self):
+        try:
+            yield from self._body
+        except BaseException as e:
+            self._error = e
+            raise
+
+    def close(self):
+        try:
+            if hasattr(self._body, "close"):
+                self._body.close()
+        finally:
+            _tracing.end_span(self._span, self._error)
 
 class IntegrationAsgiMiddleware:
-    def __init__(self, app, config=Config.default()):
+    def __init__(self, app, config=Config.default(), metrics_path: str | None = None):
+        """
+        If `metrics_path` is set, requests to that path are answered with the SDK
+        metrics in the Prometheus text format (see `MetricsAsgiApp`) instead of being
+        passed to `app`. These requests don't need an `x-client-context` header.
+        """
         self.app = app
         self.config = config
+        self.metrics_path = metrics_path
+        self.metrics_app = MetricsAsgiApp() if metrics_path else None
         self.connection = Connection(self.config)
+        self.data_api_pool = DataAPIPool(
+            self.connection, max_size=self.config.data_api_pool_size
+        )
+        self.header_names = frozenset(
+            name.lower().encode("latin1")
+            for name in ("x-client-context", "x-request-id", config.deadline_header)
+            if name
+        )
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        # Use the Connection's header decoding
-        headers = self.connection._decode_headers(dict(scope["headers"]))
+        if self.metrics_app is not None and scope.get("path") == self.metrics_path:
+            await self.metrics_app(scope, receive, send)
+            return
+
+        header_names = self.header_names
+        if _tracing.ENABLED:
+            header_names = header_names | _tracing.propagation_headers()
+
+        headers = _asgi_headers(scope["headers"], header_names)
         header = headers.get("x-client-context")
         if not header:
             raise ValueError("x-client-context not set")
 
-        set_client_context(ClientContext.from_header(header, self.connection))
-        # No b prefix needed since headers are already decoded
+        client_context = ClientContext.from_header(
+            header, self.connection, self.data_api_pool
+        )
+        set_client_context(client_context)
         set_request_id(headers.get("x-request-id", str(uuid.uuid4())))
+        set_deadline(
+            _request_timeout(
+                self.config,
+                headers.get(self.config.deadline_header.lower())
+                if self.config.deadline_header
+                else None,
+            )
+        )
+
+        with _tracing.start_span(
+            scope.get("method", "HTTP"),
+            _request_span_attributes(
+                client_context, scope.get("method"), scope.get("path")
+            ),
+            kind="server",
+            context=_tracing.extract(headers),
+        ):
+            await self.app(scope, receive, send)
+
+def _request_span_attributes(
+    client_context: ClientContext, method: str | None, path: str | None
+) -> dict[str, str] | None:
+    if not _tracing.ENABLED:
+        return None
+
+    return {
+        "http.request.method": method or "",
+        "url.path": path or "",
+        "salesforce.org.id": client_context.org.id,
+        "salesforce.org.domain_url": client_context.org.domain_url,
+        "salesforce.request_id": client_context.request_id,
+    }
+
+def _asgi_headers(raw_headers, names: frozenset[bytes]) -> dict[str, str]:
+    """
+    Decode just the headers in `names` from the raw ASGI header list. ASGI servers send
+    lower-case header names, so they can be compared without decoding every header.
+    """
+    headers = {}
+
+    for name, value in raw_headers:
+        if name in names:
+            headers[name.decode("latin1")] = value.decode("latin1")
+
+    return headers
+
+def _wsgi_header_key(header: str) -> str:
+    return "HTTP_" + header.upper().replace("-", "_")
+
+def _request_timeout(config: Config, header_value: str | None) -> float | None:
+    """
+    The time budget of an incoming request: the shorter of `Config.request_deadline`
+    and the caller's budget from `Config.deadline_header`, if any.
+    """
+    timeouts = []
+
+    if config.request_deadline is not None:
+        timeouts.append(config.request_deadline)
+
+    if header_value:
+        try:
+            timeouts.append(float(header_value))
+        except ValueError:
+            # An invalid header shouldn't fail the request, it just doesn't set a budget.
+            pass
 
-        await self.app(scope, receive, send)
+    return min(timeouts) if timeouts else None
@@ -0,0 +1,431 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import asyncio
+
+from collections import deque
+from dataclasses import dataclass, field
+from http.cookies import CookieError, SimpleCookie
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+import aiohttp
+import orjson
+
+from .exceptions import StreamingError
+
+if TYPE_CHECKING:
+    from .data_api import DataAPI
+
+__all__ = [
+    "CheckpointStore",
+    "MemoryCheckpointStore",
+    "StreamingClient",
+    "StreamingEvent",
+]
+
+# Salesforce holds a long-poll `/meta/connect` for up to 110 seconds.
+_DEFAULT_POLL_TIMEOUT = 110.0
+
+# Extra time for the long-poll response to arrive, on top of the server's timeout.
+_POLL_TIMEOUT_MARGIN = 10.0
+
+_MAX_RECONNECT_DELAY = 30.0
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StreamingEvent:
+    """
+    An event received on a Streaming API channel, such as a change event, a platform
+    event or a PushTopic notification.
+    """
+
+    channel: str
+    """The channel the event was received on, such as `/data/AccountChangeEvent`."""
+
+    replay_id: int
+    """The durable ID of the event on its channel, used to resume after it."""
+
+    data: dict[str, Any] = field(default_factory=dict)
+    """The `data` of the Bayeux message, as sent by Salesforce."""
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        """
+        The payload of a change or platform event, or the `sobject` of a PushTopic
+        notification.
+        """
+        return self.data.get("payload") or self.data.get("sobject") or {}
+
+    @property
+    def change_event_header(self) -> dict[str, Any] | None:
+        """
+        The `ChangeEventHeader` of a Change Data Capture event, with the `entityName`,
+        `changeType` and `recordIds` of the change, or `None` for other events.
+        """
+        return self.payload.get("ChangeEventHeader")
+
+
+class CheckpointStore:
+    """
+    Persists the replay ID of the last event processed on each channel, so a
+    `StreamingClient` resumes after it instead of missing or redelivering events when
+    it's restarted. Implement `load` and `save` to keep them in a database or cache.
+    """
+
+    async def load(self, channel: str) -> int | None:
+        """
+        Get the replay ID stored for the channel, or `None` if there is none.
+        """
+        raise NotImplementedError
+
+    async def save(self, channel: str, replay_id: int) -> None:
+        """
+        Store the replay ID of the last event processed on the channel.
+        """
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """
+    Keeps replay IDs in memory, so they only survive reconnects within the process.
+    """
+
+    def __init__(self) -> None:
+        self.replay_ids: dict[str, int] = {}
+
+    async def load(self, channel: str) -> int | None:
+        return self.replay_ids.get(channel)
+
+    async def save(self, channel: str, replay_id: int) -> None:
+        self.replay_ids[channel] = replay_id
+
+
+class StreamingClient:
+    """
+    Subscribes to Streaming API channels of an org, such as Change Data Capture,
+    platform event and PushTopic channels, using the CometD (Bayeux) long-polling
+    protocol.
+
+    Requests are sent with the `Connection` and access token of the given `DataAPI`.
+    Iterate over the client to receive the events of all subscribed channels:
+
+    ```python
+    async with StreamingClient(
+        context.org.data_api, checkpoint_store=checkpoint_store
+    ) as client:
+        await client.subscribe("/data/AccountChangeEvent")
+
+        async for event in client:
+            header = event.change_event_header
+            print(header["changeType"], header["recordIds"])
+    ```
+
+    The replay ID of an event is saved to the `CheckpointStore` once the loop asks
+    for the next event, so events are processed at least once: after a restart,
+    subscriptions resume after the last event that was processed completely. Without
+    a stored replay ID, subscriptions start at `replay_id`, which is either
+    `REPLAY_NEW` for new events only, `REPLAY_ALL` for all retained events, or the
+    replay ID of an event to resume after.
+
+    If Salesforce drops the client, for example after a network error, the client
+    handshakes again and resubscribes after the last event it delivered. It gives up
+    with a `StreamingError` after `max_reconnects` consecutive failed attempts.
+
+    For more information, see the [Streaming API documentation](https://developer.salesforce.com/docs/atlas.en-us.api_streaming.meta/api_streaming/intro_stream.htm).
+    """  # noqa: E501 pylint: disable=line-too-long
+
+    REPLAY_NEW = -1
+    """Receive only events published after subscribing."""
+
+    REPLAY_ALL = -2
+    """Receive all events retained by Salesforce (up to 3 days), then new ones."""
+
+    def __init__(
+        self,
+        data_api: "DataAPI",
+        *,
+        checkpoint_store: CheckpointStore | None = None,
+        replay_id: int = REPLAY_NEW,
+        max_reconnects: int = 5,
+    ) -> None:
+        self._data_api = data_api
+        self._url = f"{data_api._org_domain_url}/cometd/{data_api._api_version}"
+        self._checkpoint_store = checkpoint_store
+        self._default_replay_id = replay_id
+        self._max_reconnects = max_reconnects
+
+        self._client_id: str | None = None
+        self._cookies: dict[str, str] = {}
+        self._replay_ids: dict[str, int] = {}
+        self._events: deque[StreamingEvent] = deque()
+        self._poll_timeout = _DEFAULT_POLL_TIMEOUT
+        self._interval = 0.0
+        self._next_message_id = 0
+
+    async def __aenter__(self) -> "StreamingClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[StreamingEvent]:
+        return self.events()
+
+    @property
+    def channels(self) -> list[str]:
+        """The subscribed channels."""
+        return list(self._replay_ids)
+
+    async def subscribe(self, channel: str, replay_id: int | None = None) -> None:
+        """
+        Subscribe to a channel, such as `/data/ChangeEvents` for all change events or
+        `/event/Order_Event__e` for a platform event.
+
+        The subscription resumes after `replay_id` if given, otherwise after the
+        replay ID stored in the `CheckpointStore` for the channel, otherwise it starts
+        at the client's default.
+        """
+        if replay_id is None and self._checkpoint_store is not None:
+            replay_id = await self._checkpoint_store.load(channel)
+        if replay_id is None:
+            replay_id = self._default_replay_id
+
+        if self._client_id is None:
+            await self._handshake()
+
+        await self._subscribe(channel, replay_id)
+        self._replay_ids[channel] = replay_id
+
+    async def unsubscribe(self, channel: str) -> None:
+        """
+        Stop receiving events from a channel.
+        """
+        if self._replay_ids.pop(channel, None) is None or self._client_id is None:
+            return
+
+        await self._send_one({"channel": "/meta/unsubscribe", "subscription": channel})
+
+    async def events(self) -> AsyncIterator[StreamingEvent]:
+        """
+        Receive the events of the subscribed channels, long-polling for new ones.
+        Events are saved to the `CheckpointStore` when the next one is requested.
+        """
+        if not self._replay_ids:
+            raise StreamingError("Subscribe to a channel before receiving events.")
+
+        while True:
+            while self._events:
+                event = self._events.popleft()
+                self._replay_ids[event.channel] = event.replay_id
+                yield event
+
+                # The consumer is done with the event once it asks for the next one.
+                if self._checkpoint_store is not None:
+                    await self._checkpoint_store.save(event.channel, event.replay_id)
+
+            await self._poll()
+
+    async def close(self) -> None:
+        """
+        Disconnect from the Streaming API. Subscriptions end with the client.
+        """
+        if self._client_id is None:
+            return
+
+        try:
+            await self._send([{"channel": "/meta/disconnect"}])
+        except (StreamingError, aiohttp.ClientError, asyncio.TimeoutError):
+            # The server forgets clients that stop polling anyway.
+            pass
+        finally:
+            self._client_id = None
+            self._cookies.clear()
+
+    async def _poll(self) -> None:
+        failures = 0
+
+        while True:
+            try:
+                if self._client_id is None:
+                    await self._reconnect()
+
+                await self._connect()
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, _Rehandshake) as e:
+                failures += 1
+                if failures > self._max_reconnects:
+                    raise StreamingError(
+                        f"Couldn't reconnect to the Streaming API: {e.__class__.__name__}: {e}"
+                    ) from e
+
+                # Resubscribing replays whatever wasn't handed out yet.
+                self._client_id = None
+                self._cookies.clear()
+                self._events.clear()
+
+                if not isinstance(e, _Rehandshake):
+                    await asyncio.sleep(min(2 ** (failures - 1), _MAX_RECONNECT_DELAY))
+
+    async def _reconnect(self) -> None:
+        await self._handshake()
+        for channel, replay_id in self._replay_ids.items():
+            await self._subscribe(channel, replay_id)
+
+    async def _handshake(self) -> None:
+        reply = await self._send_one(
+            {
+                "channel": "/meta/handshake",
+                "version": "1.0",
+                "minimumVersion": "1.0",
+                "supportedConnectionTypes": ["long-polling"],
+                "ext": {"replay": True},
+            }
+        )
+        self._client_id = reply["clientId"]
+        self._apply_advice(reply.get("advice"))
+
+    async def _subscribe(self, channel: str, replay_id: int) -> None:
+        await self._send_one(
+            {
+                "channel": "/meta/subscribe",
+                "subscription": channel,
+                "ext": {"replay": {channel: replay_id}},
+            }
+        )
+
+    async def _connect(self) -> None:
+        if self._interval > 0:
+            await asyncio.sleep(self._interval)
+
+        messages = await self._send(
+            [{"channel": "/meta/connect", "connectionType": "long-polling"}],
+            timeout=self._poll_timeout + _POLL_TIMEOUT_MARGIN,
+        )
+
+        for message in messages:
+            channel = message.get("channel", "")
+
+            if channel == "/meta/connect":
+                self._apply_advice(message.get("advice"))
+                if not message.get("successful"):
+                    self._raise_for_reply(message)
+            elif not channel.startswith("/meta/") and "data" in message:
+                data = message["data"]
+                self._events.append(
+                    StreamingEvent(
+                        channel=channel,
+                        replay_id=data.get("event", {}).get("replayId", 0),
+                        data=data,
+                    )
+                )
+
+    async def _send_one(self, message: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a meta message and return the server's reply to it, raising if it
+        wasn't successful.
+        """
+        replies = await self._send([message])
+        reply = next(
+            (reply for reply in replies if reply.get("channel") == message["channel"]),
+            None,
+        )
+
+        if reply is None:
+            raise StreamingError(f"No reply to {message['channel']}.")
+        if not reply.get("successful"):
+            self._raise_for_reply(reply)
+
+        return reply
+
+    async def _send(
+        self, messages: list[dict[str, Any]], timeout: float | None = None
+    ) -> list[dict[str, Any]]:
+        for message in messages:
+            self._next_message_id += 1
+            message["id"] = str(self._next_message_id)
+            if self._client_id is not None and message["channel"] != "/meta/handshake":
+                message["clientId"] = self._client_id
+
+        headers = {
+            "Authorization": f"Bearer {self._data_api.access_token}",
+            "Content-Type": "application/json",
+        }
+        if self._cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={value}" for name, value in self._cookies.items()
+            )
+
+        response = await self._data_api._connection.request(
+            "POST",
+            self._url,
+            headers=headers,
+            data=orjson.dumps(messages),
+            timeout=timeout,
+        )
+        body = await response.read()
+        self._store_cookies(response.headers)
+
+        if not response.ok:
+            raise StreamingError(
+                f"The Streaming API responded with {response.status} {response.reason}: "
+                f"{body.decode(errors='replace')}"
+            )
+
+        try:
+            replies = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise StreamingError(
+                f"The Streaming API didn't respond with valid JSON: {e}"
+            ) from e
+
+        if not isinstance(replies, list):
+            raise StreamingError(f"Unexpected Streaming API response: {replies!r}")
+
+        return replies
+
+    def _store_cookies(self, headers: Any) -> None:
+        # Transports don't keep cookies, but CometD servers route a client's requests
+        # with them, so they're kept per client here.
+        getall = getattr(headers, "getall", None)
+        if getall is None:
+            return
+
+        for header in getall("Set-Cookie", ()):
+            try:
+                cookie = SimpleCookie(header)
+            except CookieError:
+                continue
+
+            for name, morsel in cookie.items():
+                self._cookies[name] = morsel.value
+
+    def _apply_advice(self, advice: dict[str, Any] | None) -> None:
+        if not advice:
+            return
+
+        if "timeout" in advice:
+            self._poll_timeout = advice["timeout"] / 1000
+        if "interval" in advice:
+            self._interval = advice["interval"] / 1000
+
+    def _raise_for_reply(self, reply: dict[str, Any]) -> None:
+        error = reply.get("error") or ""
+        reconnect = (reply.get("advice") or {}).get("reconnect")
+
+        if reply.get("channel") == "/meta/connect" and (
+            reconnect == "handshake" or error.startswith("403::")
+        ):
+            raise _Rehandshake(error or "The server asked to handshake again")
+
+        failure = (reply.get("ext") or {}).get("sfdc", {}).get("failureReason")
+        raise StreamingError(
+            f"{reply.get('channel')} failed: {error or failure or 'unknown error'}"
+        )
+
+
+class _Rehandshake(Exception):
+    """The server no longer knows the client, which needs to handshake again."""
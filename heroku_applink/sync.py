@@ -0,0 +1,417 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import asyncio
+import re
+import sqlite3
+import threading
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+import orjson
+
+from .data_api.exceptions import SalesforceRestApiError
+from .data_api.record import RecordQueryResult
+
+if TYPE_CHECKING:
+    from .data_api import DataAPI
+
+__all__ = ["SyncEngine", "SyncedObject", "SyncResult"]
+
+_NAME = re.compile(r"^\w+$")
+_UTC_OFFSET = re.compile(r"([+-]\d\d)(\d\d)$")
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SyncedObject:
+    """
+    An sObject type to mirror with a `SyncEngine`.
+    """
+
+    name: str
+    """The sObject type, for example `Account`. It's also the name of its table."""
+
+    fields: tuple[str, ...]
+    """
+    The fields to mirror, each a column of the table. `Id` and `SystemModstamp` are
+    always mirrored. Parent relationship fields such as `Account.Name` aren't
+    supported, mirror the parent's ID field instead.
+    """
+
+    where: str | None = None
+    """
+    A SOQL condition restricting the mirrored records, such as `Type = 'Customer'`.
+    Records that are changed to no longer match it are removed from the table.
+    """
+
+    indexes: tuple[str, ...] = ()
+    """Fields to index in the local table, for the lookups the app makes."""
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SyncResult:
+    """The outcome of syncing one sObject type."""
+
+    upserted: int
+    """The number of records inserted or updated in the local table."""
+
+    deleted: int
+    """The number of records removed from the local table."""
+
+    watermark: str | None
+    """The `SystemModstamp` the next sync pulls changes from."""
+
+
+@dataclass(kw_only=True, slots=True)
+class _State:
+    fields: str | None = None
+    watermark: str | None = None
+    next_records_url: str | None = None
+    pending_watermark: str | None = None
+
+
+class SyncEngine:
+    """
+    Mirrors sObject types into a local SQLite database, so read-heavy code can serve
+    lookups from an indexed local copy instead of querying the org every time.
+
+    The first `sync()` of a type loads all its records, later ones pull the records
+    whose `SystemModstamp` is at or after the newest one seen so far with the
+    QueryAll API, and remove the local copies of records that were deleted.
+    Progress is checkpointed in the database after every result page: a sync that
+    was interrupted resumes from the saved next records URL, or pulls the changes
+    again if the URL expired.
+
+    ```python
+    engine = SyncEngine(
+        context.org.data_api,
+        "mirror.db",
+        [SyncedObject(name="Account", fields=("Name", "Industry"), indexes=("Name",))],
+    )
+
+    await engine.sync()
+
+    account = engine.get("Account", "001B000000LlNcOIAV")
+    rows = engine.database.execute(
+        'SELECT "Id", "Name" FROM "Account" WHERE "Industry" = ?', ("Energy",)
+    ).fetchall()
+    ```
+
+    Each table has a column per field. Compound fields such as addresses are stored
+    as JSON text. Changing the fields of a `SyncedObject` reloads it completely on
+    the next sync.
+
+    Deleted records are only returned by the QueryAll API while they're in the
+    org's Recycle Bin, so sync at least as often as it's emptied.
+
+    Database writes run in a worker thread, one at a time, so they don't block the
+    event loop. Queries of `database` made while a sync is running may see the
+    page it's writing.
+    """
+
+    def __init__(
+        self,
+        data_api: "DataAPI",
+        database: str | sqlite3.Connection,
+        objects: Iterable[SyncedObject],
+        *,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        `database` is the path of the SQLite database, or an open connection. As it's
+        written to from a worker thread, the connection must be opened with
+        `check_same_thread=False`. `timeout` applies to each request.
+        """
+        self._data_api = data_api
+        self._timeout = timeout
+        self._objects = {synced.name: synced for synced in objects}
+
+        for synced in self._objects.values():
+            for name in (synced.name, *synced.fields, *synced.indexes):
+                if not _NAME.match(name):
+                    raise ValueError(f"Unsupported name for a mirrored object or field: {name}")
+
+        # The local database is public, for queries of the mirrored tables.
+        self._owns_database = not isinstance(database, sqlite3.Connection)
+        self.database: sqlite3.Connection = (
+            sqlite3.connect(database, check_same_thread=False)
+            if self._owns_database
+            else database
+        )
+        self.database.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def close(self) -> None:
+        """
+        Close the database, unless it was passed in as a connection.
+        """
+        if self._owns_database:
+            self.database.close()
+
+    async def sync(self, *names: str) -> dict[str, SyncResult]:
+        """
+        Pull the changes of the given sObject types, or of all of them, concurrently.
+        """
+        objects = [self._objects[name] for name in names] if names else list(self._objects.values())
+        results = await asyncio.gather(*(self._sync(synced) for synced in objects))
+        return {synced.name: result for synced, result in zip(objects, results)}
+
+    async def run(self, interval: float) -> None:
+        """
+        Sync all sObject types every `interval` seconds, until cancelled.
+        """
+        while True:
+            await self.sync()
+            await asyncio.sleep(interval)
+
+    def get(self, name: str, record_id: str) -> dict[str, Any] | None:
+        """
+        Get the mirrored fields of a record, or `None` if it's not in the mirror.
+        """
+        with self._lock:
+            row = self.database.execute(
+                f'SELECT * FROM "{self._objects[name].name}" WHERE "Id" = ?', (record_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def watermark(self, name: str) -> str | None:
+        """
+        The `SystemModstamp` the next sync of the sObject type pulls changes from, or
+        `None` if it wasn't loaded yet.
+        """
+        with self._lock:
+            return self._load_state(name).watermark
+
+    async def _sync(self, synced: SyncedObject) -> SyncResult:
+        fields = _fields(synced)
+        state = await self._run(self._load_state, synced.name)
+
+        if state.fields != ",".join(fields):
+            # The columns changed, so all records are loaded again.
+            await self._run(self._reset, synced, fields)
+            state = _State(fields=",".join(fields))
+
+        result = None
+        if state.next_records_url is not None:
+            try:
+                result = await self._data_api.query_more(
+                    RecordQueryResult(
+                        done=False,
+                        total_size=0,
+                        records=[],
+                        next_records_url=state.next_records_url,
+                    ),
+                    timeout=self._timeout,
+                )
+            except SalesforceRestApiError as e:
+                if not any(error.error_code == "INVALID_QUERY_LOCATOR" for error in e.api_errors):
+                    raise
+
+                # The query expired; changes that were already applied are pulled again.
+                state.pending_watermark = None
+
+        if result is None:
+            result = await self._data_api.query(
+                _soql(synced, fields, state.watermark),
+                timeout=self._timeout,
+                include_deleted=state.watermark is not None,
+            )
+
+        upserted = deleted = 0
+
+        while True:
+            stale_ids: list[str] = []
+            if (
+                synced.where
+                and state.watermark is not None
+                and (result.done or result.next_records_url is None)
+            ):
+                # Before the watermark moves past them, look up the records that were
+                # changed to no longer match `where`, which the query above skipped.
+                stale_ids = await self._stale_ids(synced, state.watermark)
+
+            page_upserted, page_deleted = await self._run(
+                self._apply, synced, fields, state, result, stale_ids
+            )
+            upserted += page_upserted
+            deleted += page_deleted
+
+            if state.next_records_url is None:
+                return SyncResult(upserted=upserted, deleted=deleted, watermark=state.watermark)
+
+            result = await self._data_api.query_more(result, timeout=self._timeout)
+
+    async def _stale_ids(self, synced: SyncedObject, watermark: str) -> list[str]:
+        result = await self._data_api.query(
+            f"SELECT Id FROM {synced.name} "
+            f"WHERE SystemModstamp >= {_soql_datetime(watermark)} AND (NOT ({synced.where}))",
+            timeout=self._timeout,
+        )
+        stale_ids = [record.fields["Id"] for record in result.records]
+
+        while not result.done:
+            result = await self._data_api.query_more(result, timeout=self._timeout)
+            stale_ids.extend(record.fields["Id"] for record in result.records)
+
+        return stale_ids
+
+    async def _run(self, function, *args):
+        """
+        Run database work in a worker thread, one at a time.
+        """
+        return await asyncio.to_thread(self._locked, function, *args)
+
+    def _locked(self, function, *args):
+        with self._lock:
+            return function(*args)
+
+    def _apply(
+        self,
+        synced: SyncedObject,
+        fields: tuple[str, ...],
+        state: _State,
+        result: RecordQueryResult,
+        stale_ids: list[str],
+    ) -> tuple[int, int]:
+        """
+        Write a result page, the removal of `stale_ids` and the checkpoint after them
+        in one transaction.
+        """
+        rows = []
+        deleted_ids = [(record_id,) for record_id in stale_ids]
+        watermark = state.pending_watermark or state.watermark
+
+        for record in result.records:
+            values = record.fields
+            modstamp = values.get("SystemModstamp")
+            if modstamp is not None and (watermark is None or modstamp > watermark):
+                watermark = modstamp
+
+            if values.get("IsDeleted"):
+                deleted_ids.append((values["Id"],))
+            else:
+                rows.append(tuple(_column_value(values.get(field)) for field in fields))
+
+        if result.done or result.next_records_url is None:
+            state.watermark, state.next_records_url, state.pending_watermark = watermark, None, None
+        else:
+            state.next_records_url, state.pending_watermark = result.next_records_url, watermark
+
+        columns = ", ".join(f'"{field}"' for field in fields)
+        placeholders = ", ".join("?" for _ in fields)
+
+        with self.database:
+            if rows:
+                self.database.executemany(
+                    f'INSERT OR REPLACE INTO "{synced.name}" ({columns}) VALUES ({placeholders})',
+                    rows,
+                )
+
+            deleted = 0
+            if deleted_ids:
+                deleted = self.database.executemany(
+                    f'DELETE FROM "{synced.name}" WHERE "Id" = ?', deleted_ids
+                ).rowcount
+
+            self._save_state(synced.name, state)
+
+        return len(rows), deleted
+
+    def _create_tables(self) -> None:
+        with self.database:
+            self.database.execute(
+                'CREATE TABLE IF NOT EXISTS "_sync_state" ('
+                '"object" TEXT PRIMARY KEY, "fields" TEXT, "watermark" TEXT, '
+                '"next_records_url" TEXT, "pending_watermark" TEXT)'
+            )
+
+            for synced in self._objects.values():
+                fields = _fields(synced)
+                existing = {
+                    row[1]
+                    for row in self.database.execute(f'PRAGMA table_info("{synced.name}")')
+                }
+
+                if not existing:
+                    columns = ", ".join(
+                        '"Id" TEXT PRIMARY KEY' if field == "Id" else f'"{field}"'
+                        for field in fields
+                    )
+                    self.database.execute(f'CREATE TABLE "{synced.name}" ({columns})')
+                else:
+                    for field in fields:
+                        if field not in existing:
+                            self.database.execute(
+                                f'ALTER TABLE "{synced.name}" ADD COLUMN "{field}"'
+                            )
+
+                for field in ("SystemModstamp", *synced.indexes):
+                    self.database.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{synced.name}_{field}" '
+                        f'ON "{synced.name}" ("{field}")'
+                    )
+
+    def _reset(self, synced: SyncedObject, fields: tuple[str, ...]) -> None:
+        with self.database:
+            self.database.execute(f'DELETE FROM "{synced.name}"')
+            self._save_state(synced.name, _State(fields=",".join(fields)))
+
+    def _load_state(self, name: str) -> _State:
+        row = self.database.execute(
+            'SELECT "fields", "watermark", "next_records_url", "pending_watermark" '
+            'FROM "_sync_state" WHERE "object" = ?',
+            (name,),
+        ).fetchone()
+        return _State(**dict(row)) if row is not None else _State()
+
+    def _save_state(self, name: str, state: _State) -> None:
+        self.database.execute(
+            'INSERT OR REPLACE INTO "_sync_state" '
+            '("object", "fields", "watermark", "next_records_url", "pending_watermark") '
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, state.fields, state.watermark, state.next_records_url, state.pending_watermark),
+        )
+
+
+def _fields(synced: SyncedObject) -> tuple[str, ...]:
+    fields = ("Id", "SystemModstamp", *synced.fields)
+    return tuple(dict.fromkeys(field for field in fields if field != "IsDeleted"))
+
+
+def _soql(synced: SyncedObject, fields: tuple[str, ...], watermark: str | None) -> str:
+    conditions = []
+    if watermark is not None:
+        # At or after, so records changed within the same timestamp as the newest one
+        # seen so far aren't missed. Pulling that one again is harmless.
+        conditions.append(f"SystemModstamp >= {_soql_datetime(watermark)}")
+    if synced.where:
+        conditions.append(f"({synced.where})")
+
+    soql = f"SELECT {', '.join((*fields, 'IsDeleted'))} FROM {synced.name}"
+    if conditions:
+        soql += " WHERE " + " AND ".join(conditions)
+    return soql + " ORDER BY SystemModstamp"
+
+
+def _soql_datetime(value: str) -> str:
+    """
+    Format a datetime field value, such as `2025-03-06T18:20:42.000+0000`, as a
+    SOQL datetime literal.
+    """
+    if value.endswith("+0000"):
+        return value[:-5] + "Z"
+
+    return _UTC_OFFSET.sub(r"\1:\2", value)
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+
+    return value
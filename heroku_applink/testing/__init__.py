@@ -0,0 +1,19 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+
+Utilities for testing apps built with the SDK without a live Salesforce org.
+
+`FakeSalesforce` is a local stand-in for the Salesforce REST API and the Heroku
+AppLink API. It can also be started from the command line, for load testing:
+
+```bash
+python -m heroku_applink.testing --port 8080 --records Account=10000 --latency 0.05
+```
+"""
+
+from .fake_salesforce import FakeSalesforce
+
+__all__ = ["FakeSalesforce"]
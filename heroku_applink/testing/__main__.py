@@ -0,0 +1,75 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import argparse
+import asyncio
+
+from .fake_salesforce import FakeSalesforce
+
+
+def _parse_records(value: str) -> tuple[str, int]:
+    object_type, _, count = value.partition("=")
+    if not object_type or not count.isdigit():
+        raise argparse.ArgumentTypeError("expected OBJECT_TYPE=COUNT, for example Account=1000")
+
+    return object_type, int(count)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    salesforce = FakeSalesforce(
+        api_version=args.api_version,
+        page_size=args.page_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+
+    for object_type, count in args.records:
+        salesforce.add_records(
+            object_type, ({"Name": f"{object_type} {i}"} for i in range(count))
+        )
+
+    async with salesforce:
+        print(f"Fake Salesforce listening on {salesforce.url}")
+        print(f"x-client-context: {salesforce.client_context_header()}")
+        for name, value in salesforce.addon_config().items():
+            print(f"{name}={value}")
+
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m heroku_applink.testing",
+        description="Serve a fake Salesforce REST API and Heroku AppLink API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--api-version", default="62.0")
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--records",
+        type=_parse_records,
+        action="append",
+        default=[],
+        metavar="OBJECT_TYPE=COUNT",
+        help="records to create at startup, can be repeated",
+    )
+
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
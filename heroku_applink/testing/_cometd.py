@@ -0,0 +1,220 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+
+The Streaming API part of `FakeSalesforce`: a CometD (Bayeux) long-polling server
+with durable replay IDs.
+"""
+
+import asyncio
+import re
+import uuid
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+BROWSER_COOKIE = "BAYEUX_BROWSER"
+
+_CHANNEL = re.compile(r"^/(?:data|event|topic|u)/\w+$")
+
+_REPLAY_NEW = -1
+_REPLAY_ALL = -2
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class _Event:
+    channels: tuple[str, ...]
+    replay_id: int
+    data: dict[str, Any]
+
+
+@dataclass(kw_only=True, slots=True)
+class _Client:
+    browser_id: str
+    subscriptions: dict[str, int] = field(default_factory=dict)
+    """The replay ID of the last event delivered, per subscribed channel."""
+
+
+class _CometdServer:
+    def __init__(self, *, timeout: float, retention: int = 10000):
+        self.timeout = timeout
+        self._events: deque[_Event] = deque(maxlen=retention)
+        self._next_replay_id = 0
+        self._clients: dict[str, _Client] = {}
+        self._published = asyncio.Event()
+        self._closed = False
+
+    def publish(self, channels: tuple[str, ...], data: Mapping[str, Any]) -> int:
+        self._next_replay_id += 1
+        replay_id = self._next_replay_id
+
+        self._events.append(
+            _Event(
+                channels=channels,
+                replay_id=replay_id,
+                data={**data, "event": {"replayId": replay_id}},
+            )
+        )
+        self._wake()
+        return replay_id
+
+    def drop_clients(self) -> None:
+        self._clients.clear()
+        self._wake()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        self._published.set()
+        self._published = asyncio.Event()
+
+    async def handle(
+        self, messages: list[dict[str, Any]], browser_id: str | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Handle the messages of a request, returning the reply messages and the browser
+        ID to set as a cookie, if any.
+        """
+        replies: list[dict[str, Any]] = []
+        new_browser_id = None
+
+        for message in messages:
+            channel = message.get("channel")
+            reply = {"channel": channel, "id": message.get("id")}
+
+            if channel == "/meta/handshake":
+                new_browser_id = browser_id or uuid.uuid4().hex
+                client_id = uuid.uuid4().hex
+                self._clients[client_id] = _Client(browser_id=new_browser_id)
+                replies.append(
+                    {
+                        **reply,
+                        "successful": True,
+                        "clientId": client_id,
+                        "version": "1.0",
+                        "minimumVersion": "1.0",
+                        "supportedConnectionTypes": ["long-polling"],
+                        "ext": {"replay": True, "payload.format": True},
+                        "advice": self._advice(),
+                    }
+                )
+                continue
+
+            client_id = message.get("clientId")
+            client = self._clients.get(client_id) if client_id else None
+            if client is None or client.browser_id != browser_id:
+                replies.append(_unknown_client(reply))
+                continue
+
+            reply["clientId"] = client_id
+
+            if channel == "/meta/subscribe":
+                replies.append(self._subscribe(client, message, reply))
+            elif channel == "/meta/unsubscribe":
+                client.subscriptions.pop(message.get("subscription"), None)
+                replies.append({**reply, "successful": True})
+            elif channel == "/meta/connect":
+                events = await self._connect(client_id, client)
+                if self._clients.get(client_id) is client:
+                    replies.extend(events)
+                    replies.append({**reply, "successful": True, "advice": self._advice()})
+                else:
+                    replies.append(_unknown_client(reply))
+            elif channel == "/meta/disconnect":
+                del self._clients[client_id]
+                replies.append({**reply, "successful": True})
+            else:
+                replies.append(
+                    {**reply, "successful": False, "error": "400::Publishing isn't supported"}
+                )
+
+        return replies, new_browser_id
+
+    def _advice(self) -> dict[str, Any]:
+        return {
+            "reconnect": "retry",
+            "interval": 0,
+            "timeout": int(self.timeout * 1000),
+        }
+
+    def _subscribe(
+        self, client: _Client, message: dict[str, Any], reply: dict[str, Any]
+    ) -> dict[str, Any]:
+        channel = message.get("subscription") or ""
+        reply["subscription"] = channel
+
+        if not _CHANNEL.match(channel):
+            return {
+                **reply,
+                "successful": False,
+                "error": f"400::The channel you requested to subscribe to does not exist {{{channel}}}",
+            }
+
+        replay_id = ((message.get("ext") or {}).get("replay") or {}).get(channel, _REPLAY_NEW)
+
+        if replay_id == _REPLAY_NEW:
+            replay_id = self._next_replay_id
+        elif replay_id == _REPLAY_ALL:
+            replay_id = 0
+        elif (
+            not isinstance(replay_id, int)
+            or replay_id < 0
+            or (self._events and replay_id < self._events[0].replay_id - 1)
+        ):
+            return {
+                **reply,
+                "successful": False,
+                "error": (
+                    f"400::The replayId {{{replay_id}}} you provided was invalid. "
+                    "Please provide a valid ID, -2 to replay all events, or -1 to replay "
+                    "only new events."
+                ),
+            }
+
+        client.subscriptions[channel] = replay_id
+        return {**reply, "successful": True}
+
+    async def _connect(self, client_id: str, client: _Client) -> list[dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        while True:
+            events = self._deliver(client)
+            remaining = deadline - loop.time()
+            if (
+                events
+                or self._closed
+                or remaining <= 0
+                or self._clients.get(client_id) is not client
+            ):
+                return events
+
+            try:
+                await asyncio.wait_for(self._published.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _deliver(self, client: _Client) -> list[dict[str, Any]]:
+        messages = []
+
+        for event in self._events:
+            for channel, last_replay_id in client.subscriptions.items():
+                if channel in event.channels and event.replay_id > last_replay_id:
+                    messages.append({"channel": channel, "data": event.data})
+                    client.subscriptions[channel] = event.replay_id
+
+        return messages
+
+
+def _unknown_client(reply: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **reply,
+        "successful": False,
+        "error": "403::Unknown client",
+        "advice": {"reconnect": "handshake", "interval": 0},
+    }
@@ -0,0 +1,229 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+
+A small SOQL evaluator for the fake Salesforce server. It supports what load tests and
+SDK tests typically need: a field list (including parent relationship fields like
+`Account.Name`), a single object, `WHERE` conditions joined with `AND`, negated with
+`NOT` and grouped with parentheses, `ORDER BY` and `LIMIT`. Subqueries, functions, `OR`
+and aggregate queries aren't supported. Like in Salesforce, ID fields can be compared
+with 15 and 18-character IDs alike.
+"""
+
+import re
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_QUERY = re.compile(
+    r"""
+    ^\s*SELECT\s+(?P<fields>.+?)
+    \s+FROM\s+(?P<object_type>\w+)
+    (?:\s+WHERE\s+(?P<where>.+?))?
+    (?:\s+ORDER\s+BY\s+(?P<order_by>\w+(?:\.\w+)?)(?:\s+(?P<direction>ASC|DESC))?)?
+    (?:\s+LIMIT\s+(?P<limit>\d+))?
+    \s*$
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+
+_CONDITION = re.compile(
+    r"""
+    ^(?P<field>\w+(?:\.\w+)?)\s*
+    (?:
+        (?P<operator>=|!=|<=|>=|<|>)\s*(?P<value>'(?:[^'\\]|\\.)*'|[^\s']+)
+        |
+        (?P<negated>NOT\s+)?IN\s*\((?P<values>[^)]*)\)
+    )$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_AND_OR_PARENTHESIS = re.compile(r"\s+AND\s+|[()]", re.IGNORECASE)
+_NOT = re.compile(r"NOT\b\s*", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+
+_LIST_ITEM = re.compile(r"'(?:[^'\\]|\\.)*'|[^\s,']+")
+
+
+class SoqlError(ValueError):
+    """Raised for queries the evaluator can't parse."""
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Query:
+    object_type: str
+    fields: tuple[str, ...]
+    conditions: tuple[Callable[[Callable[[str], Any]], bool], ...]
+    order_by: str | None
+    descending: bool
+    limit: int | None
+
+
+def _literal(token: str) -> Any:
+    if token.startswith("'"):
+        return re.sub(r"\\(.)", r"\1", token[1:-1])
+
+    lowered = token.lower()
+    if lowered == "null":
+        return None
+    if lowered in ("true", "false"):
+        return lowered == "true"
+
+    try:
+        return int(token)
+    except ValueError:
+        pass
+
+    try:
+        return float(token)
+    except ValueError:
+        # Date and datetime literals, such as `2025-03-06T18:20:42Z`, are compared as
+        # strings, which works for the fixed-width format the fake server writes.
+        return _normalize_datetime(token)
+
+
+def _normalize_datetime(value: str) -> str:
+    if value.endswith("Z"):
+        value = value[:-1] + "+0000"
+    if "T" in value and "." not in value:
+        value = value[:19] + ".000" + value[19:]
+    return value
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    if operator == "=":
+        return left == right
+    if operator == "!=":
+        return left != right
+    if left is None or right is None:
+        return False
+    if isinstance(left, str) and isinstance(right, str):
+        left, right = _normalize_datetime(left), _normalize_datetime(right)
+
+    try:
+        if operator == "<":
+            return left < right
+        if operator == ">":
+            return left > right
+        if operator == "<=":
+            return left <= right
+        return left >= right
+    except TypeError:
+        return False
+
+
+def _condition(text: str) -> Callable[[Callable[[str], Any]], bool]:
+    text = text.strip()
+
+    conditions = _split_and(text)
+    if len(conditions) > 1:
+        compiled = [_condition(condition) for condition in conditions]
+        return lambda get: all(condition(get) for condition in compiled)
+
+    negation = _NOT.match(text)
+    if negation is not None:
+        negated = _condition(text[negation.end() :])
+        return lambda get: not negated(get)
+
+    if text.startswith("(") and _closing_parenthesis(text, 0) == len(text) - 1:
+        return _condition(text[1:-1])
+
+    match = _CONDITION.match(text)
+    if match is None:
+        raise SoqlError(f"Unsupported WHERE condition: {text}")
+
+    field = match["field"]
+    # IDs are compared by their case-sensitive 15-character form.
+    normalize = _short_id if field.endswith("Id") else _identity
+
+    if match["operator"]:
+        operator = match["operator"]
+        value = normalize(_literal(match["value"]))
+        return lambda get: _compare(operator, normalize(get(field)), value)
+
+    values = [normalize(_literal(token)) for token in _LIST_ITEM.findall(match["values"])]
+    negated_in = bool(match["negated"])
+    return lambda get: (normalize(get(field)) in values) != negated_in
+
+
+def _short_id(value: Any) -> Any:
+    if isinstance(value, str) and len(value) == 18:
+        return value[:15]
+
+    return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _split_and(text: str) -> list[str]:
+    """
+    Split a condition at the `AND`s outside of parentheses and string literals.
+    """
+    masked = _mask_strings(text)
+    parts = []
+    depth = start = 0
+
+    for match in _AND_OR_PARENTHESIS.finditer(masked):
+        if match[0] == "(":
+            depth += 1
+        elif match[0] == ")":
+            depth -= 1
+        elif depth == 0:
+            parts.append(text[start : match.start()])
+            start = match.end()
+
+    parts.append(text[start:])
+    return parts
+
+
+def _closing_parenthesis(text: str, index: int) -> int:
+    masked = _mask_strings(text)
+    depth = 0
+
+    for position in range(index, len(masked)):
+        if masked[position] == "(":
+            depth += 1
+        elif masked[position] == ")":
+            depth -= 1
+            if depth == 0:
+                return position
+
+    raise SoqlError(f"Unbalanced parentheses: {text}")
+
+
+def _mask_strings(text: str) -> str:
+    # Blank out string literals, so their contents can't be mistaken for syntax.
+    return _STRING.sub(lambda match: "'" + " " * (len(match[0]) - 2) + "'", text)
+
+
+def parse(soql: str) -> Query:
+    """
+    Parse a SOQL query, raising `SoqlError` for unsupported syntax.
+    """
+    match = _QUERY.match(soql)
+    if match is None or "(" in match["fields"]:
+        raise SoqlError(f"Unsupported query: {soql}")
+
+    fields = tuple(field.strip() for field in match["fields"].split(","))
+    if not all(re.fullmatch(r"\w+(?:\.\w+)?", field) for field in fields):
+        raise SoqlError(f"Unsupported field list: {match['fields']}")
+
+    conditions = (
+        tuple(_condition(part) for part in _split_and(match["where"]))
+        if match["where"]
+        else ()
+    )
+
+    return Query(
+        object_type=match["object_type"],
+        fields=fields,
+        conditions=conditions,
+        order_by=match["order_by"],
+        descending=(match["direction"] or "").upper() == "DESC",
+        limit=int(match["limit"]) if match["limit"] else None,
+    )
@@ -0,0 +1,1156 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+import asyncio
+import base64
+import copy
+import random
+import re
+import uuid
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Mapping
+from urllib.parse import parse_qsl, urlsplit
+
+import orjson
+
+from aiohttp import web
+
+from . import _soql
+from ._cometd import BROWSER_COOKIE, _CometdServer
+
+__all__ = ["FakeSalesforce"]
+
+# Key prefixes of common standard objects, so generated IDs look familiar.
+_KEY_PREFIXES = {
+    "Account": "001",
+    "Contact": "003",
+    "User": "005",
+    "Opportunity": "006",
+    "Lead": "00Q",
+    "Case": "500",
+    "ContentVersion": "068",
+}
+
+_SYSTEM_FIELD_TYPES = {
+    "Id": "id",
+    "IsDeleted": "boolean",
+    "CreatedDate": "datetime",
+    "LastModifiedDate": "datetime",
+    "SystemModstamp": "datetime",
+}
+
+_DATA_PATH = re.compile(r"^/services/data/v(?P<version>\d+\.\d+)(?P<resource>/.*)$")
+_COMETD_PATH = re.compile(r"^/cometd/(?P<version>\d+\.\d+)/?$")
+_REFERENCE = re.compile(r"@\{(?P<reference_id>\w+)\.(?P<field>\w+)\}")
+
+_COLLECTION_LIMIT = 200
+_MAX_CURSORS = 1000
+
+Response = tuple[int, Any]
+
+
+@dataclass(kw_only=True, slots=True)
+class _InjectedError:
+    status: int
+    errors: Any
+    remaining: int
+    path: str | None
+    method: str | None
+
+
+def _error(status: int, error_code: str, message: str, fields: list[str] | None = None) -> Response:
+    return status, [{"errorCode": error_code, "message": message, "fields": fields or []}]
+
+
+def _not_found() -> Response:
+    return _error(404, "NOT_FOUND", "The requested resource does not exist")
+
+
+class FakeSalesforce:
+    """
+    An in-memory stand-in for the Salesforce REST API and the Heroku AppLink
+    `/authorizations` endpoint, served by `aiohttp` on a local port. Use it to test and
+    load test apps built with the SDK without a live org.
+
+    It implements:
+
+    - `query`, `queryAll` and their next records URLs, with a configurable page size
+    - sObject create, read, update, delete and describe
+    - `composite/graph`, rolled back as a whole if any of its operations fails
+    - `composite/batch`, with up to 25 independent sub-requests
+    - sObject Collections create, read, update and delete
+    - the Streaming API at `/cometd/{api_version}`, with replay IDs, Change Data
+      Capture events for records written through the API, and platform events
+      created through the API or with `publish_event()`
+    - `/authorizations/{developer_name}` for `Authorization.find()`
+
+    Every Salesforce API response carries a `Sforce-Limit-Info` header. Latency and
+    errors can be injected to test timeouts, retries and error handling.
+
+    ```python
+    async with FakeSalesforce(page_size=200) as salesforce:
+        salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(1000)])
+
+        data_api = DataAPI(
+            org_domain_url=salesforce.url,
+            api_version=salesforce.api_version,
+            access_token=salesforce.access_token,
+            connection=Connection(Config.default()),
+        )
+        result = await data_api.query("SELECT Id, Name FROM Account")
+    ```
+
+    Queries are evaluated against the stored records and support a field list
+    (including parent fields like `Account.Name`), `WHERE` conditions joined with
+    `AND` or negated with `NOT`, `ORDER BY` and `LIMIT`. Field names are
+    case-sensitive. Generated IDs have 18 characters, and ID fields can be compared
+    with their 15-character form.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_version: str = "62.0",
+        page_size: int = 2000,
+        latency: float | tuple[float, float] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        api_limit: int = 15000,
+        access_token: str = "00DFAKE000000000001!fake-access-token",
+        org_id: str = "00DFAKE000000000001",
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        streaming_timeout: float = 10.0,
+    ):
+        """
+        `latency` is the delay in seconds added to every request, or a `(min, max)`
+        range to draw it from. A share of `error_rate` (between `0` and `1`) of all
+        requests fails with `error_status`. `seed` makes both reproducible.
+
+        `streaming_timeout` is how long a Streaming API long-poll waits for events.
+        """
+        self.api_version = api_version
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_limit = api_limit
+        self.access_token = access_token
+        self.org_id = org_id
+        self.addon_token = "fake-addon-token"
+        self.app_uuid = str(uuid.UUID(int=0))
+
+        self.requests: list[tuple[str, str]] = []
+        """The method and path (with query string) of every request received."""
+
+        self._host = host
+        self._port = port
+        self._url: str | None = None
+        self._runner: web.AppRunner | None = None
+        self._random = random.Random(seed)
+
+        self._records: dict[str, dict[str, dict[str, Any]]] = {}
+        self._object_types: dict[str, str] = {}
+        self._required_fields: dict[str, set[str]] = {}
+        self._describes: dict[str, dict[str, str]] = {}
+        self._authorizations: dict[str, dict[str, str]] = {}
+        self._cursors: OrderedDict[str, tuple[list[dict[str, Any]], str]] = OrderedDict()
+        self._injected_errors: list[_InjectedError] = []
+        self._undo_log: list[tuple[str, str, dict[str, Any] | None]] | None = None
+        self._streaming = _CometdServer(timeout=streaming_timeout)
+        self._pending_changes: list[tuple[str, str, str, dict[str, Any]]] | None = None
+        self._commit_number = 0
+        self._next_id = 0
+        self._next_cursor = 0
+        self._api_usage = 0
+        self._last_timestamp: datetime | None = None
+
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Response]]] = [
+            ("GET", re.compile(r"/query"), self._query),
+            ("GET", re.compile(r"/queryAll"), self._query_all),
+            ("GET", re.compile(r"/(?:query|queryAll)/(?P<locator>\w+)-(?P<offset>\d+)"), self._query_more),
+            ("GET", re.compile(r"/sobjects/(?P<object_type>\w+)/describe"), self._describe),
+            ("POST", re.compile(r"/sobjects/(?P<object_type>\w+)"), self._create),
+            ("GET", re.compile(r"/sobjects/(?P<object_type>\w+)/(?P<record_id>\w+)"), self._retrieve),
+            ("PATCH", re.compile(r"/sobjects/(?P<object_type>\w+)/(?P<record_id>\w+)"), self._update),
+            ("DELETE", re.compile(r"/sobjects/(?P<object_type>\w+)/(?P<record_id>\w+)"), self._delete),
+            ("POST", re.compile(r"/composite/graph"), self._composite_graph),
+            ("POST", re.compile(r"/composite/batch"), self._composite_batch),
+            ("POST", re.compile(r"/composite/sobjects"), self._collection_create),
+            ("PATCH", re.compile(r"/composite/sobjects"), self._collection_update),
+            ("DELETE", re.compile(r"/composite/sobjects"), self._collection_delete),
+            ("GET", re.compile(r"/composite/sobjects/(?P<object_type>\w+)"), self._collection_retrieve),
+        ]
+
+    async def __aenter__(self) -> "FakeSalesforce":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> str:
+        """
+        Start serving on the configured host and port, returning the server's URL.
+        """
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+
+        host, port = self._runner.addresses[0][:2]
+        self._url = f"http://{host}:{port}"
+        return self._url
+
+    async def close(self) -> None:
+        """
+        Stop serving.
+        """
+        # Answer pending long-polls, which would hold up the shutdown.
+        self._streaming.close()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the running server, used as both the org domain URL and the
+        AppLink API URL.
+        """
+        if self._url is None:
+            raise RuntimeError("The fake Salesforce server hasn't been started")
+
+        return self._url
+
+    @property
+    def api_usage(self) -> int:
+        """
+        The number of Salesforce API requests received, as reported in the
+        `Sforce-Limit-Info` header.
+        """
+        return self._api_usage
+
+    def app(self) -> web.Application:
+        """
+        Build an `aiohttp` application serving this fake, for example to use it with
+        `aiohttp.test_utils.TestServer` instead of `start()`.
+        """
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        return app
+
+    def add_records(self, object_type: str, records: Iterable[Mapping[str, Any]]) -> list[str]:
+        """
+        Store records of the given type without going through the API, returning
+        their generated IDs.
+        """
+        return [self._insert(object_type, record) for record in records]
+
+    def get_record(self, object_type: str, record_id: str) -> dict[str, Any] | None:
+        """
+        Get a copy of a stored record, including deleted ones.
+        """
+        record = self._records.get(object_type, {}).get(record_id)
+        return copy.deepcopy(record) if record is not None else None
+
+    def require_fields(self, object_type: str, *fields: str) -> None:
+        """
+        Reject creating records of the given type without these fields, and updates
+        that clear them, with `REQUIRED_FIELD_MISSING`.
+        """
+        self._required_fields.setdefault(object_type, set()).update(fields)
+
+    def set_describe(self, object_type: str, field_types: Mapping[str, str]) -> None:
+        """
+        Set the field types returned by the describe endpoint for the given type, for
+        example `{"CloseDate": "date", "Amount": "currency"}`. Otherwise field types
+        are guessed from the stored records.
+        """
+        self._describes[object_type] = {**_SYSTEM_FIELD_TYPES, **field_types}
+
+    def inject_error(
+        self,
+        status: int = 500,
+        errors: Any = None,
+        *,
+        count: int = 1,
+        path: str | None = None,
+        method: str | None = None,
+    ) -> None:
+        """
+        Respond to the next `count` requests matching `method` and containing `path`
+        in their path with `status` and the JSON body `errors`, instead of handling
+        them.
+        """
+        if errors is None:
+            errors = [{"errorCode": "UNKNOWN_EXCEPTION", "message": "Injected error"}]
+
+        self._injected_errors.append(
+            _InjectedError(
+                status=status,
+                errors=errors,
+                remaining=count,
+                path=path,
+                method=method.upper() if method else None,
+            )
+        )
+
+    def publish_event(self, channel: str, payload: Mapping[str, Any]) -> int:
+        """
+        Publish an event with the given payload to a Streaming API channel, such as
+        `/event/Order_Event__e`, returning its replay ID.
+        """
+        return self._streaming.publish(
+            (channel,), {"schema": _schema_id(channel), "payload": dict(payload)}
+        )
+
+    def drop_streaming_clients(self) -> None:
+        """
+        Forget all Streaming API clients, as Salesforce does after a client stops
+        polling, so they have to handshake and subscribe again.
+        """
+        self._streaming.drop_clients()
+
+    def add_authorization(
+        self,
+        developer_name: str,
+        *,
+        user_id: str = "005FAKE000000000001",
+        username: str = "admin@example.org",
+    ) -> None:
+        """
+        Make `Authorization.find(developer_name)` return an authorization for this
+        fake org. Use `addon_config()` to point the SDK at this server.
+        """
+        self._authorizations[developer_name] = {
+            "user_id": user_id,
+            "username": username,
+        }
+
+    def addon_config(self, prefix: str = "HEROKU_APPLINK") -> dict[str, str]:
+        """
+        The config vars of a Heroku AppLink add-on backed by this server, to set in
+        `os.environ` (followed by `refresh_addon_config()`).
+        """
+        return {
+            f"{prefix}_API_URL": self.url,
+            f"{prefix}_TOKEN": self.addon_token,
+            "HEROKU_APP_ID": self.app_uuid,
+        }
+
+    def client_context_header(
+        self,
+        *,
+        request_id: str | None = None,
+        user_id: str = "005FAKE000000000001",
+        username: str = "admin@example.org",
+        namespace: str = "",
+    ) -> str:
+        """
+        Generate an `x-client-context` header value for a request from this fake org,
+        as Heroku AppLink sends it to the app.
+        """
+        context = {
+            "requestId": request_id or f"{self.org_id}-{uuid.uuid4()}",
+            "accessToken": self.access_token,
+            "apiVersion": self.api_version,
+            "namespace": namespace,
+            "orgId": self.org_id,
+            "orgDomainUrl": self.url,
+            "userContext": {"userId": user_id, "username": username},
+        }
+        return base64.b64encode(orjson.dumps(context)).decode("ascii")
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path_qs))
+        await self._sleep()
+
+        headers: dict[str, str] = {}
+        authorization = request.headers.get("Authorization", "")
+
+        if request.path.startswith("/authorizations/"):
+            if authorization != f"Bearer {self.addon_token}":
+                return self._response(401, {"id": "unauthorized", "message": "Invalid token"})
+        elif _COMETD_PATH.match(request.path):
+            if authorization != f"Bearer {self.access_token}":
+                return self._response(
+                    401,
+                    [
+                        {
+                            "channel": "/meta/handshake",
+                            "successful": False,
+                            "error": "403::Handshake denied",
+                            "ext": {"sfdc": {"failureReason": "401::Authentication invalid"}},
+                            "advice": {"reconnect": "none"},
+                        }
+                    ],
+                )
+        elif _DATA_PATH.match(request.path):
+            self._api_usage += 1
+            headers["Sforce-Limit-Info"] = f"api-usage={self._api_usage}/{self.api_limit}"
+
+            if authorization != f"Bearer {self.access_token}":
+                return self._response(
+                    *_error(401, "INVALID_SESSION_ID", "Session expired or invalid"),
+                    headers,
+                )
+        else:
+            return self._response(*_not_found(), headers)
+
+        injected = self._take_injected_error(request.method, request.path)
+        if injected is not None:
+            return self._response(injected.status, injected.errors, headers)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._response(
+                *_error(self.error_status, "SERVER_UNAVAILABLE", "Injected error"),
+                headers,
+            )
+
+        if request.path.startswith("/authorizations/"):
+            return self._response(*self._authorization(request.match_info["tail"]))
+
+        raw_body = await request.read()
+        try:
+            body = orjson.loads(raw_body) if raw_body else None
+        except orjson.JSONDecodeError:
+            return self._response(
+                *_error(400, "JSON_PARSER_ERROR", "The request body isn't valid JSON"),
+                headers,
+            )
+
+        if _COMETD_PATH.match(request.path):
+            return await self._cometd(request, body)
+
+        status, response_body = self._dispatch(
+            request.method, request.path, dict(request.query), body
+        )
+        return self._response(status, response_body, headers)
+
+    async def _cometd(self, request: web.Request, body: Any) -> web.Response:
+        if not isinstance(body, list):
+            body = [body] if isinstance(body, dict) else []
+
+        replies, browser_id = await self._streaming.handle(
+            body, request.cookies.get(BROWSER_COOKIE)
+        )
+
+        response = self._response(200, replies)
+        if browser_id is not None:
+            response.set_cookie(BROWSER_COOKIE, browser_id, httponly=True)
+        return response
+
+    def _response(
+        self, status: int, body: Any, headers: dict[str, str] | None = None
+    ) -> web.Response:
+        if body is None:
+            return web.Response(status=status, headers=headers)
+
+        return web.Response(
+            status=status,
+            body=orjson.dumps(body),
+            content_type="application/json",
+            headers=headers,
+        )
+
+    async def _sleep(self) -> None:
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    def _take_injected_error(self, method: str, path: str) -> _InjectedError | None:
+        for injected in self._injected_errors:
+            if (injected.method is None or injected.method == method) and (
+                injected.path is None or injected.path in path
+            ):
+                injected.remaining -= 1
+                if injected.remaining <= 0:
+                    self._injected_errors.remove(injected)
+                return injected
+
+        return None
+
+    def _dispatch(self, method: str, path: str, query: dict[str, str], body: Any) -> Response:
+        match = _DATA_PATH.match(path)
+        if match is None:
+            return _not_found()
+
+        resource = match["resource"]
+        for route_method, pattern, handler in self._routes:
+            if route_method != method:
+                continue
+
+            route_match = pattern.fullmatch(resource)
+            if route_match is not None:
+                return handler(query, body, **route_match.groupdict())
+
+        return _not_found()
+
+    def _authorization(self, path: str) -> Response:
+        developer_name = path.removeprefix("authorizations/")
+        authorization = self._authorizations.get(developer_name)
+
+        if authorization is None:
+            return 404, {"id": "not_found", "message": f"Authorization {developer_name} not found"}
+
+        timestamp = self._timestamp().isoformat().replace("+00:00", "Z")
+        return 200, {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, developer_name)),
+            "status": "authorized",
+            "org": {
+                "id": self.org_id,
+                "developer_name": developer_name,
+                "instance_url": self.url,
+                "type": "SalesforceOrg",
+                "api_version": self.api_version,
+                "user_auth": {
+                    "username": authorization["username"],
+                    "user_id": authorization["user_id"],
+                    "access_token": self.access_token,
+                },
+            },
+            "created_at": timestamp,
+            "created_by": "fake@example.org",
+            "created_via_app": "fake-salesforce",
+            "last_modified_at": timestamp,
+            "last_modified_by": "fake@example.org",
+            "redirect_uri": self.url,
+        }
+
+    # Queries
+
+    def _query(self, query: dict[str, str], body: Any, all_rows: bool = False) -> Response:
+        soql = query.get("q")
+        if not soql:
+            return _error(400, "MALFORMED_QUERY", "The q parameter is required")
+
+        try:
+            parsed = _soql.parse(soql)
+        except _soql.SoqlError as e:
+            return _error(400, "MALFORMED_QUERY", str(e))
+
+        records = [
+            record
+            for record in self._records.get(parsed.object_type, {}).values()
+            if (all_rows or not record["IsDeleted"])
+            and all(
+                condition(self._field_getter(record)) for condition in parsed.conditions
+            )
+        ]
+
+        if parsed.order_by is not None:
+            records.sort(
+                key=lambda record: self._sort_key(record, parsed.order_by),
+                reverse=parsed.descending,
+            )
+
+        if parsed.limit is not None:
+            records = records[: parsed.limit]
+
+        rows = [self._project(parsed.object_type, record, parsed.fields) for record in records]
+
+        self._next_cursor += 1
+        locator = f"01gFAKE{self._next_cursor:011d}"
+        resource = "queryAll" if all_rows else "query"
+
+        if len(rows) > self.page_size:
+            self._cursors[locator] = (rows, resource)
+            while len(self._cursors) > _MAX_CURSORS:
+                self._cursors.popitem(last=False)
+
+        return self._page(locator, rows, 0, resource)
+
+    def _query_all(self, query: dict[str, str], body: Any) -> Response:
+        return self._query(query, body, all_rows=True)
+
+    def _query_more(self, query: dict[str, str], body: Any, locator: str, offset: str) -> Response:
+        cursor = self._cursors.get(locator)
+        if cursor is None:
+            return _error(400, "INVALID_QUERY_LOCATOR", "invalid query locator")
+
+        rows, resource = cursor
+        return self._page(locator, rows, int(offset), resource)
+
+    def _page(self, locator: str, rows: list[dict[str, Any]], offset: int, resource: str) -> Response:
+        end = offset + self.page_size
+        body: dict[str, Any] = {
+            "totalSize": len(rows),
+            "done": end >= len(rows),
+            "records": rows[offset:end],
+        }
+
+        if end < len(rows):
+            body["nextRecordsUrl"] = (
+                f"/services/data/v{self.api_version}/{resource}/{locator}-{end}"
+            )
+
+        return 200, body
+
+    def _field_getter(self, record: dict[str, Any]) -> Callable[[str], Any]:
+        def get(field: str) -> Any:
+            if "." not in field:
+                return record.get(field)
+
+            relationship, _, name = field.partition(".")
+            parent = self._parent(record, relationship)
+            return parent.get(name) if parent is not None else None
+
+        return get
+
+    def _sort_key(self, record: dict[str, Any], field: str) -> tuple[bool, Any]:
+        value = self._field_getter(record)(field)
+        return (value is None, value if value is not None else "")
+
+    def _parent(self, record: dict[str, Any], relationship: str) -> dict[str, Any] | None:
+        if relationship.endswith("__r"):
+            parent_id = record.get(relationship[:-3] + "__c")
+        else:
+            parent_id = record.get(relationship + "Id")
+
+        object_type = self._object_types.get(parent_id) if parent_id else None
+        if object_type is None:
+            return None
+
+        return self._records[object_type][parent_id]
+
+    def _project(self, object_type: str, record: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+        row: dict[str, Any] = {"attributes": self._attributes(object_type, record["Id"])}
+
+        for field in fields:
+            if "." not in field:
+                row[field] = copy.deepcopy(record.get(field))
+                continue
+
+            relationship, _, name = field.partition(".")
+            parent = self._parent(record, relationship)
+
+            if parent is None:
+                row.setdefault(relationship, None)
+                continue
+
+            nested = row.get(relationship)
+            if nested is None:
+                nested = row[relationship] = {
+                    "attributes": self._attributes(
+                        self._object_types[parent["Id"]], parent["Id"]
+                    )
+                }
+            nested[name] = copy.deepcopy(parent.get(name))
+
+        return row
+
+    def _attributes(self, object_type: str, record_id: str) -> dict[str, str]:
+        return {
+            "type": object_type,
+            "url": f"/services/data/v{self.api_version}/sobjects/{object_type}/{record_id}",
+        }
+
+    # sObjects
+
+    def _describe(self, query: dict[str, str], body: Any, object_type: str) -> Response:
+        field_types = self._describes.get(object_type)
+
+        if field_types is None:
+            field_types = dict(_SYSTEM_FIELD_TYPES)
+            for record in self._records.get(object_type, {}).values():
+                for name, value in record.items():
+                    if name not in field_types and value is not None:
+                        field_types[name] = _guess_field_type(value)
+
+        return 200, {
+            "name": object_type,
+            "fields": [{"name": name, "type": type} for name, type in field_types.items()],
+        }
+
+    def _create(self, query: dict[str, str], body: Any, object_type: str) -> Response:
+        if not isinstance(body, dict):
+            return _error(400, "JSON_PARSER_ERROR", "Expected a JSON object")
+
+        error = self._validate(object_type, body, creating=True)
+        if error is not None:
+            return error
+
+        if object_type.endswith("__e"):
+            # Platform events are published instead of stored.
+            self._next_id += 1
+            self.publish_event(f"/event/{object_type}", body)
+            return 201, {"id": _record_id("e00", self._next_id), "success": True, "errors": []}
+
+        record_id = self._insert(object_type, body)
+        self._change("CREATE", object_type, record_id, self._records[object_type][record_id])
+        return 201, {"id": record_id, "success": True, "errors": []}
+
+    def _retrieve(self, query: dict[str, str], body: Any, object_type: str, record_id: str) -> Response:
+        record = self._records.get(object_type, {}).get(record_id)
+        if record is None or record["IsDeleted"]:
+            return _not_found()
+
+        fields = query.get("fields")
+        if fields:
+            return 200, self._project(
+                object_type, record, tuple(field.strip() for field in fields.split(","))
+            )
+
+        return 200, {"attributes": self._attributes(object_type, record_id), **copy.deepcopy(record)}
+
+    def _update(self, query: dict[str, str], body: Any, object_type: str, record_id: str) -> Response:
+        if not isinstance(body, dict):
+            return _error(400, "JSON_PARSER_ERROR", "Expected a JSON object")
+
+        record = self._records.get(object_type, {}).get(record_id)
+        if record is None:
+            return _not_found()
+        if record["IsDeleted"]:
+            return _error(404, "ENTITY_IS_DELETED", "entity is deleted")
+
+        error = self._validate(object_type, body, creating=False)
+        if error is not None:
+            return error
+
+        fields = {key: value for key, value in body.items() if key not in ("Id", "attributes")}
+        modified = self._modified()
+        self._put(object_type, record_id, {**record, **fields, **modified})
+        self._change("UPDATE", object_type, record_id, {**fields, **modified})
+        return 204, None
+
+    def _delete(self, query: dict[str, str], body: Any, object_type: str, record_id: str) -> Response:
+        record = self._records.get(object_type, {}).get(record_id)
+        if record is None:
+            return _not_found()
+        if record["IsDeleted"]:
+            return _error(404, "ENTITY_IS_DELETED", "entity is deleted")
+
+        self._put(object_type, record_id, {**record, "IsDeleted": True, **self._modified()})
+        self._change("DELETE", object_type, record_id, {})
+        return 204, None
+
+    def _validate(self, object_type: str, fields: dict[str, Any], creating: bool) -> Response | None:
+        if creating and "Id" in fields:
+            return _error(
+                400,
+                "INVALID_FIELD_FOR_INSERT_UPDATE",
+                "Unable to create/update fields: Id.",
+                ["Id"],
+            )
+
+        required = self._required_fields.get(object_type, set())
+        missing = sorted(
+            field
+            for field in required
+            if (creating and fields.get(field) is None)
+            or (not creating and field in fields and fields[field] is None)
+        )
+
+        if missing:
+            return _error(
+                400,
+                "REQUIRED_FIELD_MISSING",
+                f"Required fields are missing: [{', '.join(missing)}]",
+                missing,
+            )
+
+        return None
+
+    def _insert(self, object_type: str, fields: Mapping[str, Any]) -> str:
+        self._next_id += 1
+        record_id = _record_id(_KEY_PREFIXES.get(object_type, "a00"), self._next_id)
+        timestamp = self._format_timestamp(self._timestamp())
+
+        record = {key: value for key, value in fields.items() if key != "attributes"}
+        record.update(
+            Id=record_id,
+            IsDeleted=False,
+            CreatedDate=timestamp,
+            LastModifiedDate=timestamp,
+            SystemModstamp=timestamp,
+        )
+
+        self._put(object_type, record_id, record)
+        return record_id
+
+    def _put(self, object_type: str, record_id: str, record: dict[str, Any]) -> None:
+        records = self._records.setdefault(object_type, {})
+
+        if self._undo_log is not None:
+            self._undo_log.append((object_type, record_id, records.get(record_id)))
+
+        records[record_id] = record
+        self._object_types[record_id] = object_type
+
+    def _modified(self) -> dict[str, str]:
+        timestamp = self._format_timestamp(self._timestamp())
+        return {"LastModifiedDate": timestamp, "SystemModstamp": timestamp}
+
+    def _timestamp(self) -> datetime:
+        # Strictly increasing, so records can be synced by `SystemModstamp` watermarks.
+        now = datetime.now(timezone.utc)
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        if self._last_timestamp is not None and now <= self._last_timestamp:
+            now = self._last_timestamp + timedelta(milliseconds=1)
+
+        self._last_timestamp = now
+        return now
+
+    @staticmethod
+    def _format_timestamp(timestamp: datetime) -> str:
+        return timestamp.strftime("%Y-%m-%dT%H:%M:%S.") + f"{timestamp.microsecond // 1000:03d}+0000"
+
+    def _change(
+        self, change_type: str, object_type: str, record_id: str, fields: dict[str, Any]
+    ) -> None:
+        """
+        Record a Change Data Capture event, published when the transaction commits.
+        """
+        change = (change_type, object_type, record_id, fields)
+        if self._pending_changes is not None:
+            self._pending_changes.append(change)
+        else:
+            self._publish_changes([change])
+
+    def _publish_changes(self, changes: list[tuple[str, str, str, dict[str, Any]]]) -> None:
+        if not changes:
+            return
+
+        self._commit_number += 1
+        transaction_key = str(uuid.uuid4())
+        commit_timestamp = int(self._timestamp().timestamp() * 1000)
+
+        for sequence_number, (change_type, object_type, record_id, fields) in enumerate(
+            changes, start=1
+        ):
+            changed_fields = [
+                name for name in fields if name not in _SYSTEM_FIELD_TYPES or name == "LastModifiedDate"
+            ]
+            payload = {
+                "ChangeEventHeader": {
+                    "entityName": object_type,
+                    "recordIds": [record_id],
+                    "changeType": change_type,
+                    "changeOrigin": f"com/salesforce/api/rest/{self.api_version}",
+                    "transactionKey": transaction_key,
+                    "sequenceNumber": sequence_number,
+                    "commitTimestamp": commit_timestamp,
+                    "commitNumber": self._commit_number,
+                    "commitUser": "005FAKE000000000001",
+                    "changedFields": changed_fields if change_type == "UPDATE" else [],
+                },
+                **{name: value for name, value in fields.items() if name not in ("Id", "IsDeleted")},
+            }
+
+            channel = f"/data/{_change_event_name(object_type)}"
+            self._streaming.publish(
+                (channel, "/data/ChangeEvents"),
+                {"schema": _schema_id(channel), "payload": payload},
+            )
+
+    def _begin(self) -> None:
+        self._undo_log = []
+        self._pending_changes = []
+
+    def _commit(self) -> None:
+        self._undo_log = None
+        changes, self._pending_changes = self._pending_changes or [], None
+        self._publish_changes(changes)
+
+    def _rollback(self) -> None:
+        undo_log = self._undo_log or []
+        self._undo_log = None
+        self._pending_changes = None
+
+        for object_type, record_id, previous in reversed(undo_log):
+            if previous is None:
+                del self._records[object_type][record_id]
+                del self._object_types[record_id]
+            else:
+                self._records[object_type][record_id] = previous
+
+    # Composite
+
+    def _composite_graph(self, query: dict[str, str], body: Any) -> Response:
+        if not isinstance(body, dict) or not isinstance(body.get("graphs"), list):
+            return _error(400, "JSON_PARSER_ERROR", "Expected a graphs array")
+
+        graphs = []
+        for graph in body["graphs"]:
+            responses, successful = self._execute_graph(graph.get("compositeRequest", []))
+            graphs.append(
+                {
+                    "graphId": graph.get("graphId"),
+                    "graphResponse": {"compositeResponse": responses},
+                    "isSuccessful": successful,
+                }
+            )
+
+        return 200, {"graphs": graphs}
+
+    def _execute_graph(self, sub_requests: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], bool]:
+        results: dict[str, Any] = {}
+        responses: list[dict[str, Any]] = []
+        failed = False
+
+        self._begin()
+
+        for sub_request in sub_requests:
+            reference_id = sub_request["referenceId"]
+
+            if failed:
+                status, response_body = _error(
+                    400,
+                    "PROCESSING_HALTED",
+                    "The transaction was rolled back since another operation in the same transaction failed.",
+                )
+            else:
+                try:
+                    url = _resolve_references(sub_request["url"], results)
+                    sub_body = _resolve_references(sub_request.get("body"), results)
+                except KeyError as e:
+                    status, response_body = _error(
+                        400, "INVALID_REFERENCE", f"Invalid reference specified: {e.args[0]}"
+                    )
+                else:
+                    parts = urlsplit(url)
+                    status, response_body = self._dispatch(
+                        sub_request["method"].upper(),
+                        parts.path,
+                        dict(parse_qsl(parts.query)),
+                        sub_body,
+                    )
+
+                if status >= 400:
+                    failed = True
+                elif isinstance(response_body, dict):
+                    results[reference_id] = response_body
+
+            responses.append(
+                {
+                    "body": response_body,
+                    "httpHeaders": {},
+                    "httpStatusCode": status,
+                    "referenceId": reference_id,
+                }
+            )
+
+        if failed:
+            self._rollback()
+
+            # Operations that succeeded before the failure were rolled back as well.
+            for response in responses:
+                if response["httpStatusCode"] < 400:
+                    response["httpStatusCode"], response["body"] = _error(
+                        400,
+                        "PROCESSING_HALTED",
+                        "The transaction was rolled back since another operation in the same transaction failed.",
+                    )
+        else:
+            self._commit()
+
+        return responses, not failed
+
+    def _composite_batch(self, query: dict[str, str], body: Any) -> Response:
+        if not isinstance(body, dict) or not isinstance(body.get("batchRequests"), list):
+            return _error(400, "JSON_PARSER_ERROR", "Expected a batchRequests array")
+
+        if len(body["batchRequests"]) > 25:
+            return _error(400, "LIMIT_EXCEEDED", "A batch can contain at most 25 subrequests")
+
+        results = []
+        has_errors = False
+
+        for sub_request in body["batchRequests"]:
+            if has_errors and body.get("haltOnError"):
+                status, result = _error(
+                    412, "BATCH_PROCESSING_HALTED", "Batch processing halted per request"
+                )
+            else:
+                # Sub-request URLs are relative to `/services/data/`, e.g. `v62.0/query?q=...`.
+                parts = urlsplit(sub_request["url"])
+                status, result = self._dispatch(
+                    sub_request["method"].upper(),
+                    f"/services/data/{parts.path}",
+                    dict(parse_qsl(parts.query)),
+                    sub_request.get("richInput"),
+                )
+
+            has_errors = has_errors or status >= 400
+            results.append({"statusCode": status, "result": result})
+
+        return 200, {"hasErrors": has_errors, "results": results}
+
+    def _collection_create(self, query: dict[str, str], body: Any) -> Response:
+        return self._collection_write(body, creating=True)
+
+    def _collection_update(self, query: dict[str, str], body: Any) -> Response:
+        return self._collection_write(body, creating=False)
+
+    def _collection_write(self, body: Any, creating: bool) -> Response:
+        if not isinstance(body, dict) or not isinstance(body.get("records"), list):
+            return _error(400, "JSON_PARSER_ERROR", "Expected a records array")
+
+        records = body["records"]
+        if len(records) > _COLLECTION_LIMIT:
+            return _error(400, "EXCEEDED_ID_LIMIT", f"Record limit exceeded: {_COLLECTION_LIMIT}")
+
+        def write(record: dict[str, Any]) -> tuple[str | None, Response]:
+            object_type = (record.get("attributes") or {}).get("type")
+            if not object_type:
+                return None, _error(400, "INVALID_TYPE", "Missing attributes.type")
+
+            fields = {key: value for key, value in record.items() if key != "attributes"}
+
+            if creating:
+                status, response_body = self._create({}, fields, object_type)
+                record_id = response_body["id"] if status < 400 else None
+                return record_id, (status, response_body)
+
+            record_id = fields.get("Id")
+            return record_id, self._update({}, fields, object_type, str(record_id))
+
+        return 200, self._collection_results(records, write, body.get("allOrNone", False))
+
+    def _collection_delete(self, query: dict[str, str], body: Any) -> Response:
+        ids = [record_id for record_id in query.get("ids", "").split(",") if record_id]
+        if len(ids) > _COLLECTION_LIMIT:
+            return _error(400, "EXCEEDED_ID_LIMIT", f"Record limit exceeded: {_COLLECTION_LIMIT}")
+
+        def delete(record_id: str) -> tuple[str | None, Response]:
+            object_type = self._object_types.get(record_id)
+            if object_type is None:
+                return record_id, _not_found()
+
+            return record_id, self._delete({}, None, object_type, record_id)
+
+        all_or_none = query.get("allOrNone", "false").lower() == "true"
+        return 200, self._collection_results(ids, delete, all_or_none)
+
+    def _collection_results(
+        self,
+        items: list[Any],
+        operation: Callable[[Any], tuple[str | None, Response]],
+        all_or_none: bool,
+    ) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        failed = False
+
+        self._begin()
+
+        for item in items:
+            record_id, (status, response_body) = operation(item)
+
+            if status < 400:
+                results.append({"id": record_id, "success": True, "errors": []})
+                continue
+
+            failed = True
+            results.append(
+                {
+                    "id": record_id,
+                    "success": False,
+                    # Collections report errors with `statusCode` instead of `errorCode`.
+                    "errors": [
+                        {
+                            "statusCode": error["errorCode"],
+                            "message": error["message"],
+                            "fields": error.get("fields", []),
+                        }
+                        for error in response_body
+                    ],
+                }
+            )
+
+        if all_or_none and failed:
+            self._rollback()
+
+            for result in results:
+                if result["success"]:
+                    result.update(
+                        success=False,
+                        errors=[
+                            {
+                                "statusCode": "ALL_OR_NONE_OPERATION_ROLLED_BACK",
+                                "message": "Record rolled back because not all records were valid and the request was using AllOrNone header",
+                                "fields": [],
+                            }
+                        ],
+                    )
+        else:
+            self._commit()
+
+        return results
+
+    def _collection_retrieve(self, query: dict[str, str], body: Any, object_type: str) -> Response:
+        ids = [record_id for record_id in query.get("ids", "").split(",") if record_id]
+        fields = tuple(field.strip() for field in query.get("fields", "Id").split(",") if field.strip())
+        records = self._records.get(object_type, {})
+
+        return 200, [
+            self._project(object_type, records[record_id], fields)
+            if record_id in records and not records[record_id]["IsDeleted"]
+            else None
+            for record_id in ids
+        ]
+
+
+def _change_event_name(object_type: str) -> str:
+    if object_type.endswith("__c"):
+        return object_type.removesuffix("__c") + "__ChangeEvent"
+
+    return object_type + "ChangeEvent"
+
+
+def _schema_id(channel: str) -> str:
+    return uuid.uuid5(uuid.NAMESPACE_URL, channel).hex[:22]
+
+
+def _guess_field_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "double"
+    return "string"
+
+
+def _resolve_references(value: Any, results: dict[str, Any]) -> Any:
+    """
+    Replace `@{referenceId.field}` references in a composite sub-request with values
+    from the responses of earlier sub-requests. Raises `KeyError` for unknown ones.
+    """
+    if isinstance(value, str):
+        return _REFERENCE.sub(
+            lambda match: str(results[match["reference_id"]][match["field"]]), value
+        )
+    if isinstance(value, dict):
+        return {key: _resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_references(item, results) for item in value]
+    return value
+
+
+def _record_id(key_prefix: str, number: int) -> str:
+    """
+    An 18-character record ID: the 15-character, case-sensitive ID followed by the
+    checksum Salesforce appends to make it case-insensitive.
+    """
+    short_id = f"{key_prefix}{number:012d}"
+    checksum = ""
+
+    for start in range(0, 15, 5):
+        chunk = short_id[start : start + 5]
+        bits = sum(1 << index for index, char in enumerate(chunk) if char.isupper())
+        checksum += "ABCDEFGHIJKLMNOPQRSTUVWXYZ012345"[bits]
+
+    return short_id + checksum
@@ -0,0 +1,365 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+
+Transports send the HTTP requests of a `Connection`. `AiohttpTransport` is the
+default; `Http2Transport` multiplexes concurrent requests to an org over a single
+HTTP/2 connection and needs the `http2` extra (`pip install heroku_applink[http2]`).
+"""
+
+import aiohttp
+import asyncio
+import json
+import time
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from multidict import CIMultiDict, CIMultiDictProxy
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Protocol
+from yarl import URL
+
+from .instrumentation import RequestEvent, _trace_config
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+if TYPE_CHECKING:
+    from .config import Config
+
+__all__ = [
+    "Response",
+    "Transport",
+    "AiohttpTransport",
+    "Http2Transport",
+]
+
+
+class Response(Protocol):
+    """
+    The parts of `aiohttp.ClientResponse` that every transport's responses provide.
+    The body has already been read when a transport returns a response.
+    """
+
+    status: int
+    reason: str | None
+    headers: Mapping[str, str]
+
+    @property
+    def ok(self) -> bool: ...
+
+    async def read(self) -> bytes: ...
+
+    async def text(self, encoding: str | None = None) -> str: ...
+
+    async def json(self, *, loads: Callable[[str], Any] = json.loads) -> Any: ...
+
+    def raise_for_status(self) -> None: ...
+
+    def release(self) -> Any: ...
+
+
+class Transport:
+    """
+    Sends the HTTP requests of a `Connection`. Select one with `Config.transport`.
+
+    Implementations must read the response body before returning, and report
+    failures as `aiohttp.ClientError` or `asyncio.TimeoutError` so retries, the
+    circuit breaker and the Data API's error handling work the same for all of them.
+    """
+
+    def __init__(self, config: "Config"):
+        self._config = config
+
+    async def request(
+        self,
+        method: str,
+        url: str | URL,
+        *,
+        params=None,
+        headers: dict[str, str] | None = None,
+        data=None,
+        timeout: float | None = None,
+        event: RequestEvent | None = None,
+    ) -> Response:
+        """
+        Send a request and read its response. `data` is the body, either bytes or a
+        string sent as is, with its type in the `Content-Type` header, or a dict of
+        form fields. `timeout` is the total timeout in seconds, defaulting to
+        `Config.request_timeout`. If given, `event` receives the phase timings of the
+        request.
+        """
+        raise NotImplementedError
+
+    def pool_limit(self) -> int | None:
+        """
+        The maximum number of requests that can be in flight before requests wait for
+        a free connection, or `None` if there is no such limit.
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        Close all connections.
+        """
+
+
+class AiohttpTransport(Transport):
+    """
+    Sends requests over HTTP/1.1 with a pooled `aiohttp.ClientSession`. This is the
+    default transport.
+    """
+
+    def __init__(self, config: "Config"):
+        super().__init__(config)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def request(
+        self,
+        method: str,
+        url: str | URL,
+        *,
+        params=None,
+        headers: dict[str, str] | None = None,
+        data=None,
+        timeout: float | None = None,
+        event: RequestEvent | None = None,
+    ) -> aiohttp.ClientResponse:
+        response = await self._client().request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            data=data,
+            timeout=aiohttp.ClientTimeout(total=timeout) if timeout is not None else None,
+            trace_request_ctx=event,
+        )
+        await response.read()
+        return response
+
+    def pool_limit(self) -> int | None:
+        if self._session is None:
+            return None
+
+        return self._session.connector.limit or None
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _client(self) -> aiohttp.ClientSession:
+        """
+        Lazily get the underlying `aiohttp.ClientSession`. This session is
+        persisted so we can take advantage of connection pooling.
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                # Disable cookie storage using `DummyCookieJar`, given that we
+                # don't need cookie support.
+                cookie_jar=aiohttp.DummyCookieJar(),
+                # Phase timings are only collected when someone is listening.
+                trace_configs=(
+                    [_trace_config()]
+                    if self._config.instrumentation is not None
+                    else None
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=self._config.request_timeout,
+                    connect=self._config.connect_timeout,
+                    sock_connect=self._config.socket_connect,
+                    sock_read=self._config.socket_read,
+                ),
+            )
+        return self._session
+
+
+class Http2Transport(Transport):
+    """
+    Sends requests with `httpx` over HTTP/2, so concurrent requests to an org, such
+    as parallel query paging or collection batches, share a single connection instead
+    of opening one each. Servers that don't negotiate HTTP/2 are talked to over
+    HTTP/1.1.
+
+    Requires the `http2` extra:
+
+    ```shell
+    $ pip install heroku_applink[http2]
+    ```
+
+    ```python
+    config = sdk.Config(transport=sdk.Http2Transport)
+    ```
+    """
+
+    def __init__(self, config: "Config"):
+        if httpx is None:
+            raise ImportError(
+                "Http2Transport requires the http2 extra: "
+                "pip install heroku_applink[http2]"
+            )
+
+        super().__init__(config)
+        self._client: httpx.AsyncClient | None = None
+
+    async def request(
+        self,
+        method: str,
+        url: str | URL,
+        *,
+        params=None,
+        headers: dict[str, str] | None = None,
+        data=None,
+        timeout: float | None = None,
+        event: RequestEvent | None = None,
+    ) -> "_HttpxResponse":
+        content = None
+        form = None
+
+        if isinstance(data, (bytes, str)):
+            content = data
+        elif data is not None:
+            form = data
+
+        extensions = (
+            {"trace": _PhaseTimings(event).on_trace}
+            if event is not None and self._config.instrumentation is not None
+            else None
+        )
+
+        try:
+            response = await asyncio.wait_for(
+                self._get_client().request(
+                    method,
+                    str(url),
+                    params=params,
+                    headers=headers or {},
+                    content=content,
+                    data=form,
+                    extensions=extensions,
+                ),
+                timeout if timeout is not None else self._config.request_timeout,
+            )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientConnectionError(
+                f"{e.__class__.__name__}: {e}"
+            ) from e
+
+        return _HttpxResponse(response)
+
+    def pool_limit(self) -> int | None:
+        # Requests are multiplexed, so they don't wait for a free connection.
+        return None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            # The total timeout of a request is enforced by `request()`.
+            timeouts = {
+                "connect": self._config.socket_connect,
+                "read": self._config.socket_read,
+                "pool": self._config.connect_timeout,
+            }
+
+            self._client = httpx.AsyncClient(
+                http2=True,
+                # Reject all cookies, like `AiohttpTransport`.
+                cookies=CookieJar(DefaultCookiePolicy(allowed_domains=())),
+                timeout=httpx.Timeout(
+                    None,
+                    **{name: value for name, value in timeouts.items() if value is not None},
+                ),
+            )
+        return self._client
+
+
+class _PhaseTimings:
+    """
+    Fills in the phase timings of a `RequestEvent` from `httpcore`'s trace events.
+    """
+
+    __slots__ = ("_event", "_connect_start")
+
+    def __init__(self, event: RequestEvent):
+        self._event = event
+        self._connect_start: float | None = None
+
+    async def on_trace(self, name: str, info: dict) -> None:
+        now = time.perf_counter()
+        event = self._event
+
+        if name == "connection.connect_tcp.started":
+            self._connect_start = now
+        elif name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self._connect_start is not None:
+                event.connect = now - self._connect_start
+        elif name.endswith(".send_request_headers.started"):
+            event.reused_connection = self._connect_start is None
+            event._headers_sent_time = now
+        elif name.endswith(".receive_response_headers.complete"):
+            if event._headers_sent_time is not None:
+                event.server = now - event._headers_sent_time
+
+
+class _HttpxResponse:
+    """
+    Adapts an `httpx.Response` to the parts of `aiohttp.ClientResponse` the SDK uses.
+    """
+
+    __slots__ = ("_response", "status", "reason", "headers", "method", "url")
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status: int = response.status_code
+        self.reason: str | None = response.reason_phrase
+        self.headers = CIMultiDictProxy(CIMultiDict(response.headers.multi_items()))
+        self.method: str = response.request.method
+        self.url = URL(str(response.url))
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def http_version(self) -> str:
+        """The HTTP version the response was received with, such as `HTTP/2`."""
+        return self._response.http_version
+
+    async def read(self) -> bytes:
+        return self._response.content
+
+    async def text(self, encoding: str | None = None) -> str:
+        if encoding is None:
+            return self._response.text
+
+        return self._response.content.decode(encoding)
+
+    async def json(self, *, loads: Callable[[str], Any] = json.loads) -> Any:
+        return loads(await self.text())
+
+    def raise_for_status(self) -> None:
+        if self.ok:
+            return
+
+        request_headers = CIMultiDictProxy(
+            CIMultiDict(self._response.request.headers.multi_items())
+        )
+
+        raise aiohttp.ClientResponseError(
+            aiohttp.RequestInfo(self.url, self.method, request_headers, self.url),
+            (),
+            status=self.status,
+            message=self.reason or "",
+            headers=self.headers,
+        )
+
+    def release(self) -> None:
+        pass
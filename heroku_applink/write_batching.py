@@ -0,0 +1,37 @@
+"""
+Copyright (c) 2025, salesforce.com, inc.
+All rights reserved.
+SPDX-License-Identifier: BSD-3-Clause
+For full license text, see the LICENSE file in the repo root or https://opensource.org/licenses/BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+
+__all__ = ["WriteBatchingPolicy"]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class WriteBatchingPolicy:
+    """
+    Configures automatic batching of `DataAPI.create()`, `DataAPI.update()`, and
+    `DataAPI.delete()` calls. Calls for the same org and object type that are made
+    within `max_delay` seconds of each other are sent together as a single sObject
+    Collections request, which saves API requests under load. Each call still
+    returns its own record's ID, or raises its own record's error.
+
+    Records in a batch succeed or fail individually, like separate calls would.
+    Batching adds up to `max_delay` seconds of latency to every write.
+
+    ```python
+    config = sdk.Config(write_batching=sdk.WriteBatchingPolicy(max_delay=0.01))
+    ```
+    """
+
+    max_delay: float = 0.005
+    """How many seconds to wait for more calls after the first call of a batch."""
+
+    max_batch_size: int = 200
+    """
+    Send a batch as soon as it has this many records. sObject Collections requests
+    are limited to `200` records.
+    """
@@ -0,0 +1,46 @@
+import pytest
+
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.data_api import DataAPI
+from heroku_applink.testing import FakeSalesforce
+
+@pytest.fixture
+def fake_salesforce_options():
+    """Keyword arguments for `FakeSalesforce`, overridden by modules that need others."""
+    return {}
+
+@pytest.fixture
+async def salesforce(fake_salesforce_options):
+    async with FakeSalesforce(**fake_salesforce_options) as salesforce:
+        yield salesforce
+
+@pytest.fixture
+async def make_data_api(salesforce):
+    """
+    Create `DataAPI` clients of the fake org, each with its own `Connection` for the
+    given config unless a connection is given. Created connections are closed after
+    the test.
+    """
+    connections = []
+
+    def make_data_api(config=None, *, connection=None):
+        if connection is None:
+            connection = Connection(config or Config.default())
+            connections.append(connection)
+
+        return DataAPI(
+            org_domain_url=salesforce.url,
+            api_version=salesforce.api_version,
+            access_token=salesforce.access_token,
+            connection=connection,
+        )
+
+    yield make_data_api
+
+    for connection in connections:
+        await connection.close()
+
+@pytest.fixture
+def data_api(make_data_api):
+    return make_data_api()
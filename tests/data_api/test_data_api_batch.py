@@ -0,0 +1,84 @@
+import pytest
+
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+
+@pytest.mark.asyncio
+async def test_query_many(salesforce, data_api):
+    salesforce.add_records("Account", [{"Name": "Acme"}])
+    salesforce.add_records("Contact", [{"LastName": "Smith"}, {"LastName": "Jones"}])
+
+    accounts, contacts = await data_api.query_many(
+        ["SELECT Name FROM Account", "SELECT LastName FROM Contact ORDER BY LastName"]
+    )
+
+    assert [record.fields["Name"] for record in accounts.records] == ["Acme"]
+    assert [record.fields["LastName"] for record in contacts.records] == ["Jones", "Smith"]
+    assert salesforce.requests == [("POST", "/services/data/v62.0/composite/batch")]
+
+@pytest.mark.asyncio
+async def test_query_many_chunks_large_batches(salesforce, data_api):
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(30)])
+
+    results = await data_api.query_many(
+        [f"SELECT Name FROM Account WHERE Name = 'Account {i}'" for i in range(30)]
+    )
+
+    assert [result.records[0].fields["Name"] for result in results] == [
+        f"Account {i}" for i in range(30)
+    ]
+    assert len(salesforce.requests) == 2
+
+@pytest.mark.asyncio
+async def test_query_many_raises_errors_of_failed_queries(data_api):
+    with pytest.raises(SalesforceRestApiError) as exc_info:
+        await data_api.query_many(["SELECT Id FROM Account", "SELECT FROM", "SELECT"])
+
+    assert [error.error_code for error in exc_info.value.api_errors] == [
+        "MALFORMED_QUERY",
+        "MALFORMED_QUERY",
+    ]
+
+@pytest.mark.asyncio
+async def test_query_many_without_queries(salesforce, data_api):
+    assert await data_api.query_many([]) == []
+    assert salesforce.requests == []
+
+@pytest.mark.asyncio
+async def test_batch_operations_succeed_or_fail_independently(salesforce, data_api):
+    [account_id] = salesforce.add_records("Account", [{"Name": "Acme"}])
+
+    batch = data_api.batch()
+    create = batch.register_create(Record(type="Account", fields={"Name": "New"}))
+    update = batch.register_update(
+        Record(type="Account", fields={"Id": account_id, "Name": "Acme Inc."})
+    )
+    delete = batch.register_delete("Account", "001000000000000MISSING")
+    query = batch.register_query("SELECT Name FROM Account ORDER BY Name")
+
+    assert len(batch) == 4
+    results = await batch.execute()
+
+    assert salesforce.get_record("Account", results[create])["Name"] == "New"
+    assert results[update] == account_id
+    assert isinstance(results[delete], SalesforceRestApiError)
+    assert [record.fields["Name"] for record in results[query].records] == [
+        "Acme Inc.",
+        "New",
+    ]
+
+@pytest.mark.asyncio
+async def test_batch_query_more(salesforce, data_api):
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(3)])
+    salesforce.page_size = 2
+
+    result = await data_api.query("SELECT Name FROM Account")
+    batch = data_api.batch()
+    more = batch.register_query_more(result)
+
+    assert [record.fields["Name"] for record in (await batch.execute())[more].records] == [
+        "Account 2"
+    ]
+
+    with pytest.raises(ValueError):
+        batch.register_query_more((await batch.execute())[more])
@@ -0,0 +1,65 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from heroku_applink.data_api._field_types import (
+    _compile_field_converters,
+    _loads,
+    _parse_date,
+    _parse_datetime,
+    _parse_decimal,
+    _parse_time,
+)
+
+def test_parse_datetime_salesforce_offset():
+    result = _parse_datetime("2025-03-06T18:20:42.000+0000")
+    assert result == datetime(2025, 3, 6, 18, 20, 42, tzinfo=timezone.utc)
+
+def test_parse_datetime_negative_offset():
+    result = _parse_datetime("2025-03-06T18:20:42.123-0500")
+    assert result.utcoffset() == timedelta(hours=-5)
+    assert result.microsecond == 123000
+
+def test_parse_datetime_zulu():
+    result = _parse_datetime("2025-03-06T18:20:42.000Z")
+    assert result.tzinfo == timezone.utc
+
+def test_parse_date():
+    assert _parse_date("2025-03-06") == date(2025, 3, 6)
+
+def test_parse_time():
+    assert _parse_time("18:20:42.000Z") == time(18, 20, 42, tzinfo=timezone.utc)
+
+def test_parse_decimal():
+    assert _parse_decimal(0.1) == Decimal("0.1")
+    assert _parse_decimal(12) == Decimal("12")
+    assert _parse_decimal(Decimal("12345678901234567.89")) == Decimal("12345678901234567.89")
+
+def test_loads_exact_decimals():
+    body = b'{"Amount": 12345678901234567.89, "Score": [0.1]}'
+
+    assert _loads(body, exact_decimals=True) == {
+        "Amount": Decimal("12345678901234567.89"),
+        "Score": [Decimal("0.1")],
+    }
+    assert _loads(body) == {"Amount": 12345678901234567.89, "Score": [0.1]}
+    assert type(_loads(body)["Amount"]) is float
+
+def test_compile_field_converters():
+    describe = {
+        "fields": [
+            {"name": "Id", "type": "id"},
+            {"name": "CreatedDate", "type": "datetime"},
+            {"name": "CloseDate", "type": "date"},
+            {"name": "Amount", "type": "currency"},
+            {"name": "Probability", "type": "percent"},
+            {"name": "Name", "type": "string"},
+        ]
+    }
+
+    converters = _compile_field_converters(describe)
+
+    assert set(converters) == {"CreatedDate", "CloseDate", "Amount", "Probability"}
+    assert converters["CloseDate"] is _parse_date
+
+def test_compile_field_converters_without_fields():
+    assert _compile_field_converters({}) == {}
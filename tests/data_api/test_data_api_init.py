@@ -1,11 +1,16 @@
 # tests/data_api/test_data_api.py
+import datetime
+import re
 import pytest
 import orjson
 import aiohttp
+from decimal import Decimal
+from aioresponses import aioresponses
+from yarl import URL
 from unittest.mock import AsyncMock, patch, MagicMock
 from heroku_applink.config import Config
 from heroku_applink.connection import Connection
-from heroku_applink.data_api import DataAPI, Record, RecordQueryResult, UnitOfWork
+from heroku_applink.data_api import DataAPI, QueriedRecord, Record, RecordQueryResult, UnitOfWork
 from heroku_applink.data_api.exceptions import ClientError, UnexpectedRestApiResponsePayload
 
 @pytest.fixture
@@ -91,7 +96,7 @@ async def test_default_headers(data_api):
 async def test_json_serialize():
     from heroku_applink.data_api import _json_serialize
     payload = _json_serialize({"key": "value"})
-    assert payload.content_type == "application/json"
+    assert payload == b'{"key":"value"}'
 
 @pytest.mark.asyncio
 async def test_execute_client_error(data_api):
@@ -133,3 +138,124 @@ async def test_commit_unit_of_work_with_update_and_delete(data_api):
     result = await data_api.commit_unit_of_work(uow)
     assert result[update_ref] == "001X"
     assert result[delete_ref] == "003Y"
+
+@pytest.mark.asyncio
+async def test_stream_query_follows_next_records_url(data_api):
+    first_page = RecordQueryResult(
+        done=False,
+        total_size=2,
+        records=[QueriedRecord(type="Account", fields={"Id": "001A"})],
+        next_records_url="/services/data/v60.0/query/01gNEXT-1",
+    )
+    second_page = RecordQueryResult(
+        done=True,
+        total_size=2,
+        records=[QueriedRecord(type="Account", fields={"Id": "001B"})],
+        next_records_url=None,
+    )
+    data_api._execute = AsyncMock(side_effect=[first_page, second_page])
+
+    records = [record async for record in data_api.stream_query("SELECT Id FROM Account")]
+
+    assert [record.fields["Id"] for record in records] == ["001A", "001B"]
+    assert data_api._execute.await_count == 2
+
+@pytest.mark.asyncio
+async def test_query_convert_field_types(data_api):
+    describe_url = "https://example.salesforce.com/services/data/vv60.0/sobjects/Opportunity/describe"
+    query_url = re.compile(r"https://example\.salesforce\.com/services/data/vv60\.0/query\?q=.*")
+
+    with aioresponses() as m:
+        m.get(
+            describe_url,
+            status=200,
+            payload={
+                "fields": [
+                    {"name": "CloseDate", "type": "date"},
+                    {"name": "Amount", "type": "currency"},
+                    {"name": "LastModifiedDate", "type": "datetime"},
+                ]
+            },
+        )
+        m.get(
+            query_url,
+            status=200,
+            repeat=True,
+            payload={
+                "done": True,
+                "totalSize": 1,
+                "records": [
+                    {
+                        "attributes": {"type": "Opportunity"},
+                        "CloseDate": "2025-03-06",
+                        "Amount": 1250.5,
+                        "LastModifiedDate": "2025-03-06T18:20:42.000+0000",
+                        "Description": None,
+                    }
+                ],
+            },
+        )
+
+        result = await data_api.query("SELECT CloseDate, Amount FROM Opportunity", convert_field_types=True)
+        # The describe metadata is cached, so a second query doesn't fetch it again.
+        await data_api.query("SELECT CloseDate, Amount FROM Opportunity", convert_field_types=True)
+
+    fields = result.records[0].fields
+    assert fields["CloseDate"] == datetime.date(2025, 3, 6)
+    assert fields["Amount"] == Decimal("1250.5")
+    assert fields["LastModifiedDate"] == datetime.datetime(2025, 3, 6, 18, 20, 42, tzinfo=datetime.timezone.utc)
+    assert fields["Description"] is None
+    assert len(m.requests[("GET", URL(describe_url))]) == 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "exact_decimals, amount",
+    [(True, Decimal("12345678901234567.89")), (False, Decimal("12345678901234568"))],
+)
+async def test_query_convert_field_types_decimal_precision(exact_decimals, amount):
+    data_api = DataAPI(
+        org_domain_url="https://example.salesforce.com",
+        api_version="v60.0",
+        access_token="token",
+        connection=Connection(Config(exact_decimals=exact_decimals)),
+    )
+    describe_url = "https://example.salesforce.com/services/data/vv60.0/sobjects/Opportunity/describe"
+    query_url = re.compile(r"https://example\.salesforce\.com/services/data/vv60\.0/query\?q=.*")
+
+    with aioresponses() as m:
+        m.get(
+            describe_url,
+            status=200,
+            payload={"fields": [{"name": "Amount", "type": "currency"}]},
+        )
+        m.get(
+            query_url,
+            status=200,
+            content_type="application/json",
+            body=(
+                b'{"done": true, "totalSize": 1, "records": [{'
+                b'"attributes": {"type": "Opportunity"}, '
+                b'"Amount": 12345678901234567.89, '
+                b'"Score__c": 0.1, '
+                b'"Location__c": {"latitude": 37.7749, "longitude": -122.4194}}]}'
+            ),
+        )
+
+        result = await data_api.query(
+            "SELECT Amount, Score__c, Location__c FROM Opportunity", convert_field_types=True
+        )
+
+    await data_api._connection.close()
+
+    fields = result.records[0].fields
+    assert fields["Amount"] == amount
+    # Fields that aren't converted keep the floats they'd have without conversion.
+    assert type(fields["Score__c"]) is float and fields["Score__c"] == 0.1
+    assert fields["Location__c"] == {"latitude": 37.7749, "longitude": -122.4194}
+    assert type(fields["Location__c"]["latitude"]) is float
+
+@pytest.mark.asyncio
+async def test_field_converters_skip_aggregate_result(data_api):
+    data_api._execute = AsyncMock()
+    assert await data_api._field_converters("AggregateResult") == {}
+    data_api._execute.assert_not_awaited()
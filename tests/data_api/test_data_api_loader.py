@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from heroku_applink.context import ClientContext, Org, User
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+
+@pytest.fixture
+def context(salesforce, data_api):
+    return ClientContext(
+        org=Org(
+            id="00DFAKE",
+            domain_url=salesforce.url,
+            user=User(id="005FAKE", username="user@example.com"),
+        ),
+        data_api=data_api,
+        request_id="request-1",
+        access_token=salesforce.access_token,
+        api_version=salesforce.api_version,
+    )
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_iteration_are_batched(salesforce, context):
+    acme, globex = salesforce.add_records("Account", [{"Name": "Acme"}, {"Name": "Globex"}])
+    loader = context.loader("Account", ["Name"])
+
+    records = await asyncio.gather(
+        loader.load(acme),
+        context.loader("Account", ["Name"]).load(globex),
+        loader.load(acme),
+        loader.load("001000000000000999"),
+    )
+
+    assert [record and record.fields["Name"] for record in records] == ["Acme", "Globex", "Acme", None]
+    assert records[0] is records[2]
+    assert len(salesforce.requests) == 1
+
+    # Loaded records are memoized for the rest of the request.
+    assert await loader.load_many([globex, acme]) == [records[1], records[0]]
+    assert len(salesforce.requests) == 1
+
+    loader.clear(acme)
+    await loader.load(acme)
+    assert len(salesforce.requests) == 2
+
+@pytest.mark.asyncio
+async def test_loads_by_15_character_ids(salesforce, context):
+    (acme,) = salesforce.add_records("Account", [{"Name": "Acme"}])
+    loader = context.loader("Account", ["Name"])
+
+    short, full = await loader.load_many([acme[:15], acme])
+
+    assert short.fields["Id"] == full.fields["Id"] == acme
+
+def test_loaders_are_per_object_type_and_fields(context):
+    loader = context.loader("Account", ["Name"])
+
+    assert context.loader("Account", ("Name",)) is loader
+    assert context.loader("Account", ["Name", "Industry"]) is not loader
+    assert context.loader("Contact", ["Name"]) is not loader
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_retried(salesforce, context):
+    (acme,) = salesforce.add_records("Account", [{"Name": "Acme"}])
+    loader = context.loader("Account", ["Name"])
+    salesforce.inject_error(500, path="/query", method="GET")
+
+    with pytest.raises(SalesforceRestApiError):
+        await loader.load(acme)
+
+    assert (await loader.load(acme)).fields["Name"] == "Acme"
@@ -0,0 +1,68 @@
+from urllib.parse import quote_plus
+
+import pytest
+
+from heroku_applink import data_api as data_api_module
+
+@pytest.fixture
+def fake_salesforce_options():
+    return {"page_size": 2}
+
+@pytest.mark.asyncio
+async def test_query_by_ids(salesforce, data_api):
+    ids = salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(5)])
+
+    records = await data_api.query_by_ids(
+        "Account", ["Name"], [ids[3], ids[0], ids[3], "001000000000000999", ids[4]]
+    )
+
+    assert sorted(records) == sorted([ids[0], ids[3], ids[4]])
+    assert records[ids[3]].fields == {"Id": ids[3], "Name": "Account 3"}
+    # One query, and one query more for the second page.
+    assert len(salesforce.requests) == 2
+
+@pytest.mark.asyncio
+async def test_query_by_ids_keys_records_with_the_given_ids(salesforce, data_api):
+    first, second = salesforce.add_records("Account", [{"Name": "Acme"}, {"Name": "Globex"}])
+
+    records = await data_api.query_by_ids("Account", ["Name"], [first[:15], second])
+
+    assert set(records) == {first[:15], second}
+    assert records[first[:15]].fields["Id"] == first
+
+@pytest.mark.asyncio
+async def test_query_by_ids_selects_each_field_once(salesforce, data_api):
+    [record_id] = salesforce.add_records("Account", [{"Name": "Acme"}])
+
+    records = await data_api.query_by_ids("Account", ["id", "Name", "NAME"], [record_id])
+
+    assert records[record_id].fields == {"Id": record_id, "Name": "Acme"}
+    [(_, path)] = salesforce.requests
+    assert "SELECT+Id,+Name+FROM+Account+" in path
+
+@pytest.mark.asyncio
+async def test_chunks_are_sized_to_the_url_limit(salesforce, data_api, monkeypatch):
+    ids = salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(10)])
+    monkeypatch.setattr(data_api_module, "QUERY_URL_LIMIT", 300)
+
+    records = await data_api.query_by_ids("Account", ["Name"], ids, concurrency=2)
+
+    assert sorted(records) == sorted(ids)
+    # The fake server records URLs with percent-escapes decoded.
+    url_lengths = [
+        len(f"{salesforce.url}{path}?q=") + len(quote_plus(soql.replace("+", " ")))
+        for _, (path, _, soql) in (
+            (method, full_path.partition("?q=")) for method, full_path in salesforce.requests
+        )
+        if path.endswith("/query")
+    ]
+    assert len(url_lengths) > 1
+    assert all(300 - 30 < length <= 300 for length in url_lengths[:-1])
+
+@pytest.mark.asyncio
+async def test_query_by_ids_without_ids(salesforce, data_api):
+    assert await data_api.query_by_ids("Account", ["Name"], []) == {}
+    assert salesforce.requests == []
+
+    with pytest.raises(ValueError, match="Concurrency"):
+        await data_api.query_by_ids("Account", ["Name"], ["001"], concurrency=0)
@@ -8,6 +8,7 @@ from heroku_applink.data_api._requests import (
     QueryRecordsRestApiRequest,
     QueryNextRecordsRestApiRequest,
     CompositeGraphRestApiRequest,
+    CompositeBatchRestApiRequest,
     _normalize_field_value, _normalize_record_fields,
     _is_binary_field, _parse_errors, _process_records_response,
     _parse_record_query_result, _parse_queried_record
@@ -346,3 +347,57 @@ async def test_parse_queried_record_with_unexpected_field_type():
     }
     result = await _parse_queried_record(json_body, lambda x: b"")
     assert result.fields["SomeField"] == 42
+
+
+@pytest.mark.asyncio
+async def test_composite_batch_request():
+    req = CompositeBatchRestApiRequest(
+        "62.0",
+        [
+            QueryRecordsRestApiRequest("SELECT Id FROM Account", lambda url: b""),
+            CreateRecordRestApiRequest(Record(type="Account", fields={"Name": "Test"})),
+            DeleteRecordRestApiRequest("Account", "001"),
+        ],
+    )
+
+    assert req.url("https://example.com", "62.0") == "https://example.com/services/data/v62.0/composite/batch"
+    assert req.http_method() == "POST"
+    assert not req.hedgeable()
+    assert req.request_body() == {
+        "batchRequests": [
+            {"url": "v62.0/query?q=SELECT+Id+FROM+Account", "method": "GET"},
+            {"url": "v62.0/sobjects/Account", "method": "POST", "richInput": {"Name": "Test"}},
+            {"url": "v62.0/sobjects/Account/001", "method": "DELETE"},
+        ],
+        "haltOnError": False,
+    }
+
+    results = await req.process_response(
+        200,
+        {
+            "hasErrors": True,
+            "results": [
+                {"statusCode": 200, "result": {"done": True, "totalSize": 0, "records": []}},
+                {"statusCode": 201, "result": {"id": "001NEW", "success": True, "errors": []}},
+                {"statusCode": 404, "result": [{"message": "Not found", "errorCode": "NOT_FOUND"}]},
+            ],
+        },
+    )
+
+    assert results[0].records == []
+    assert results[1] == "001NEW"
+    assert isinstance(results[2], SalesforceRestApiError)
+    assert results[2].api_errors[0].error_code == "NOT_FOUND"
+
+@pytest.mark.asyncio
+async def test_composite_batch_request_of_queries_is_hedgeable():
+    req = CompositeBatchRestApiRequest(
+        "62.0",
+        [
+            QueryRecordsRestApiRequest("SELECT Id FROM Account", lambda url: b""),
+            QueryNextRecordsRestApiRequest("/services/data/v62.0/query/01g-2000", lambda url: b""),
+        ],
+    )
+
+    assert req.hedgeable()
+    assert req.request_body()["batchRequests"][1]["url"] == "v62.0/query/01g-2000"
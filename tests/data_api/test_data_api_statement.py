@@ -0,0 +1,112 @@
+import datetime
+
+from decimal import Decimal
+from urllib.parse import urlencode
+
+import pytest
+
+from heroku_applink.data_api._requests import QueryRecordsRestApiRequest
+from heroku_applink.data_api.statement import PreparedStatement
+
+def test_key_and_parameters():
+    statement = PreparedStatement(
+        """
+        SELECT Id,   Name
+        FROM Account
+        WHERE Id IN :ids AND Name != 'a  :b' AND CreatedDate = LAST_N_DAYS:30
+          AND Industry = :industry
+        """
+    )
+
+    assert statement.key == (
+        "SELECT Id, Name FROM Account WHERE Id IN :ids AND Name != 'a  :b' "
+        "AND CreatedDate = LAST_N_DAYS:30 AND Industry = :industry"
+    )
+    assert statement.parameters == ("ids", "industry")
+
+def test_bind():
+    statement = PreparedStatement("SELECT Id FROM Account WHERE Id IN :ids AND Name = :name")
+
+    bound = statement.bind(ids=["001", "002"], name="O'Brien \\ \"Co\"\n")
+
+    assert bound.soql == (
+        "SELECT Id FROM Account WHERE Id IN ('001', '002') AND Name = 'O\\'Brien \\\\ \\\"Co\\\"\\n'"
+    )
+    assert bound.encoded_soql == urlencode({"q": bound.soql})[2:]
+    assert bound.key == statement.key
+
+@pytest.mark.parametrize(
+    "value, literal",
+    [
+        (None, "null"),
+        (True, "true"),
+        (42, "42"),
+        (Decimal("1.50"), "1.50"),
+        (Decimal("1E+3"), "1000"),
+        (0.1, "0.1"),
+        (1e-07, "0.0000001"),
+        (1e20, "100000000000000000000"),
+        (datetime.date(2025, 3, 6), "2025-03-06"),
+        (
+            datetime.datetime(2025, 3, 6, 19, 20, 42, tzinfo=datetime.timezone(datetime.timedelta(hours=1))),
+            "2025-03-06T18:20:42.000Z",
+        ),
+        ((1, 2), "(1, 2)"),
+    ],
+)
+def test_bind_literals(value, literal):
+    assert PreparedStatement("SELECT Id FROM Account WHERE X = :x").bind(x=value).soql.endswith(
+        f"= {literal}"
+    )
+
+def test_bind_errors():
+    statement = PreparedStatement("SELECT Id FROM Account WHERE Id IN :ids")
+
+    with pytest.raises(ValueError, match="Missing values for bind parameters: ids"):
+        statement.bind()
+    with pytest.raises(ValueError, match="Unknown bind parameters: name"):
+        statement.bind(ids=["001"], name="Acme")
+    with pytest.raises(ValueError, match="must not be empty"):
+        statement.bind(ids=[])
+    with pytest.raises(ValueError, match="timezone-aware"):
+        statement.bind(ids=datetime.datetime(2025, 3, 6))
+    with pytest.raises(ValueError, match="must be finite"):
+        statement.bind(ids=float("nan"))
+    with pytest.raises(ValueError, match="must be finite"):
+        statement.bind(ids=float("-inf"))
+    with pytest.raises(ValueError, match="must be finite"):
+        statement.bind(ids=Decimal("Infinity"))
+    with pytest.raises(TypeError, match="Unsupported"):
+        statement.bind(ids=object())
+
+def test_prepared_statements_are_cached(data_api):
+    statement = data_api.prepare("SELECT Id FROM Account WHERE Name = :name")
+
+    assert data_api.prepare("SELECT Id FROM Account WHERE Name = :name") is statement
+
+def test_query_request_uses_the_encoded_statement():
+    bound = PreparedStatement("SELECT Id FROM Account WHERE Name = :name").bind(name="A&B")
+    request = QueryRecordsRestApiRequest(bound, download_file_fn=None)
+
+    assert request.url("https://example.com", "62.0") == (
+        "https://example.com/services/data/v62.0/query?q=SELECT+Id+FROM+Account+WHERE+Name+%3D+%27A%26B%27"
+    )
+    assert request.trace_attributes()["salesforce.query.statement"] == bound.key
+
+@pytest.mark.asyncio
+async def test_query_prepared_statement(salesforce, data_api):
+    acme, _, globex = salesforce.add_records(
+        "Account", [{"Name": "Acme"}, {"Name": "O'Brien"}, {"Name": "Globex"}]
+    )
+    statement = data_api.prepare("SELECT Id, Name FROM Account WHERE Id IN :ids ORDER BY Name")
+
+    result = await data_api.query(statement.bind(ids=[acme, globex]))
+    assert [record.fields["Name"] for record in result.records] == ["Acme", "Globex"]
+
+    # Values can't change the structure of the query.
+    by_name = data_api.prepare("SELECT Id, Name FROM Account WHERE Name = :name")
+    result = await data_api.query(by_name.bind(name="O'Brien"))
+    assert [record.fields["Name"] for record in result.records] == ["O'Brien"]
+
+    (result,) = await data_api.query_many([by_name.bind(name="x' OR Name != 'y")])
+    assert result.records == []
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from heroku_applink.config import Config
+from heroku_applink.data_api._requests import (
+    CollectionWriteRestApiRequest,
+    UpdateRecordRestApiRequest,
+)
+from heroku_applink.data_api.record import QueriedRecord, Record, TrackedRecord
+from heroku_applink.data_api.unit_of_work import UnitOfWork
+from heroku_applink.write_batching import WriteBatchingPolicy
+
+async def query_accounts(data_api):
+    result = await data_api.query("SELECT Id, Name, Phone FROM Account ORDER BY Name")
+    return [TrackedRecord.track(record) for record in result.records]
+
+def test_changed_fields():
+    record = TrackedRecord.track(
+        QueriedRecord(
+            type="Account",
+            fields={"Id": "001", "Name": "Acme", "BillingAddress": {"city": "Paris"}},
+        )
+    )
+
+    assert record.changed_fields == {}
+    assert not record.is_changed
+
+    record.set("Name", "Acme")
+    record.fields["BillingAddress"]["city"] = "Lyon"
+    record.set("Phone", None)
+    record.set("Id", "002")
+
+    assert record.changed_fields == {"BillingAddress": {"city": "Lyon"}, "Phone": None}
+    assert record.is_changed
+
+def test_update_requests_only_send_changed_fields():
+    record = TrackedRecord.track(
+        Record(type="Account", fields={"Id": "001", "Name": "Acme", "Phone": "1"})
+    )
+    record.set("Phone", "2")
+
+    assert UpdateRecordRestApiRequest(record).request_body() == {"Phone": "2"}
+    assert CollectionWriteRestApiRequest([record], creating=False).request_body() == {
+        "allOrNone": False,
+        "records": [{"attributes": {"type": "Account"}, "Id": "001", "Phone": "2"}],
+    }
+
+@pytest.mark.asyncio
+async def test_update_sends_only_changed_fields(salesforce, make_data_api):
+    data_api = make_data_api()
+    (record_id,) = salesforce.add_records("Account", [{"Name": "Acme", "Phone": "1"}])
+    (account,) = await query_accounts(data_api)
+
+    # A concurrent change that a full update would overwrite.
+    await data_api.update(Record(type="Account", fields={"Id": record_id, "Name": "Acme Corp"}))
+
+    account.set("Phone", "2")
+    assert await data_api.update(account) == record_id
+
+    assert salesforce.get_record("Account", record_id)["Name"] == "Acme Corp"
+    assert salesforce.get_record("Account", record_id)["Phone"] == "2"
+    assert not account.is_changed
+
+    salesforce.requests.clear()
+    assert await data_api.update(account) == record_id
+    assert salesforce.requests == []
+
+@pytest.mark.asyncio
+async def test_unit_of_work_skips_unchanged_records(salesforce, make_data_api):
+    data_api = make_data_api()
+    salesforce.add_records("Account", [{"Name": "Acme"}, {"Name": "Globex"}])
+    acme, globex = await query_accounts(data_api)
+    salesforce.requests.clear()
+
+    unit_of_work = UnitOfWork()
+    acme_reference_id = unit_of_work.register_update(acme)
+    globex_reference_id = unit_of_work.register_update(globex)
+
+    assert await data_api.commit_unit_of_work(unit_of_work) == {
+        acme_reference_id: acme.fields["Id"],
+        globex_reference_id: globex.fields["Id"],
+    }
+    assert salesforce.requests == []
+
+    globex.set("Name", "Globex Corp")
+    unit_of_work = UnitOfWork()
+    acme_reference_id = unit_of_work.register_update(acme)
+    globex_reference_id = unit_of_work.register_update(globex)
+
+    result = await data_api.commit_unit_of_work(unit_of_work)
+
+    assert list(result) == [acme_reference_id, globex_reference_id]
+    assert salesforce.get_record("Account", globex.fields["Id"])["Name"] == "Globex Corp"
+    assert not globex.is_changed
+
+@pytest.mark.asyncio
+async def test_batch_skips_unchanged_records(salesforce, make_data_api):
+    data_api = make_data_api()
+    salesforce.add_records("Account", [{"Name": "Acme"}])
+    (acme,) = await query_accounts(data_api)
+    salesforce.requests.clear()
+
+    batch = data_api.batch()
+    reference_id = batch.register_update(acme)
+
+    assert await batch.execute() == {reference_id: acme.fields["Id"]}
+    assert salesforce.requests == []
+
+@pytest.mark.asyncio
+async def test_batched_writes_send_only_changed_fields(salesforce, make_data_api):
+    data_api = make_data_api(Config(write_batching=WriteBatchingPolicy(max_delay=0.01)))
+    salesforce.add_records("Account", [{"Name": "Acme"}, {"Name": "Globex"}, {"Name": "Initech"}])
+    accounts = await query_accounts(data_api)
+    salesforce.requests.clear()
+
+    accounts[0].set("Phone", "1")
+    accounts[1].set("Phone", "2")
+    await asyncio.gather(*(data_api.update(account) for account in accounts))
+
+    assert salesforce.requests == [("PATCH", "/services/data/v62.0/composite/sobjects")]
+    assert [salesforce.get_record("Account", account.fields["Id"]).get("Phone") for account in accounts] == ["1", "2", None]
+    assert not any(account.is_changed for account in accounts)
+
+@pytest.mark.asyncio
+async def test_references_to_unchanged_records_use_their_id(salesforce, make_data_api):
+    data_api = make_data_api()
+    salesforce.add_records("Account", [{"Name": "Acme"}])
+    (acme,) = await query_accounts(data_api)
+
+    for commit in (data_api.commit_unit_of_work, data_api.commit_unit_of_work_partially):
+        unit_of_work = UnitOfWork()
+        account_reference_id = unit_of_work.register_update(acme)
+        contact_reference_id = unit_of_work.register_create(
+            Record(type="Contact", fields={"LastName": "Doe", "AccountId": account_reference_id})
+        )
+
+        result = await commit(unit_of_work)
+
+        assert result[account_reference_id] == acme.fields["Id"]
+        contact = salesforce.get_record("Contact", result[contact_reference_id])
+        assert contact["AccountId"] == acme.fields["Id"]
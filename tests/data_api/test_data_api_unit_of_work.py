@@ -1,4 +1,7 @@
+import orjson
+
 from heroku_applink.data_api import UnitOfWork, Record
+from heroku_applink.data_api._requests import CompositeGraphRestApiRequest
 
 def test_register_create():
     uow = UnitOfWork()
@@ -16,3 +19,48 @@ def test_register_delete():
     uow = UnitOfWork()
     ref = uow.register_delete("Account", "123")
     assert ref.id.startswith("referenceId")
+
+def test_request_body_is_serialized_once_per_operation():
+    uow = UnitOfWork()
+    account = Record(type="Account", fields={"Name": "Test", "Logo__c": b"\x00\x01"})
+    ref = uow.register_create(account)
+    uow.register_create(Record(type="Contact", fields={"LastName": "Doe", "AccountId": ref}))
+    uow.register_delete("Account", "123")
+
+    # Changes after registering aren't sent.
+    account.fields["Name"] = "Changed"
+
+    request = CompositeGraphRestApiRequest("62.0", uow._sub_requests, uow._nodes)
+    body = orjson.loads(orjson.dumps(request.request_body()))
+
+    assert body == {
+        "graphs": [
+            {
+                "graphId": "graph0",
+                "compositeRequest": [
+                    {
+                        "url": "/services/data/v62.0/sobjects/Account",
+                        "method": "POST",
+                        "referenceId": "referenceId0",
+                        "body": {"Name": "Test", "Logo__c": "AAE="},
+                    },
+                    {
+                        "url": "/services/data/v62.0/sobjects/Contact",
+                        "method": "POST",
+                        "referenceId": "referenceId1",
+                        "body": {"LastName": "Doe", "AccountId": "@{referenceId0.id}"},
+                    },
+                    {
+                        "url": "/services/data/v62.0/sobjects/Account/123",
+                        "method": "DELETE",
+                        "referenceId": "referenceId2",
+                    },
+                ],
+            }
+        ]
+    }
+
+    # Nodes are reused for another API version, with their URL memoized per version.
+    node = uow._nodes[0]
+    assert node.serialize("62.0") is node.serialize("62.0")
+    assert b"/v63.0/" in orjson.dumps(node.serialize("63.0"))
@@ -0,0 +1,76 @@
+import pytest
+
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+from heroku_applink.data_api.record import Record, TrackedRecord
+from heroku_applink.data_api.unit_of_work import UnitOfWork
+
+@pytest.mark.asyncio
+async def test_failed_groups_are_rolled_back_alone(salesforce, data_api):
+    unit_of_work = UnitOfWork()
+    acme = unit_of_work.register_create(Record(type="Account", fields={"Name": "Acme"}))
+    missing = unit_of_work.register_update(
+        Record(type="Account", fields={"Id": "001000000000000999", "Name": "Missing"})
+    )
+    contact = unit_of_work.register_create(
+        Record(type="Contact", fields={"LastName": "Doe", "AccountId": acme})
+    )
+    globex = unit_of_work.register_create(Record(type="Account", fields={"Name": "Globex"}))
+    globex_contact = unit_of_work.register_create(
+        Record(type="Contact", fields={"LastName": "Roe", "AccountId": globex})
+    )
+    unit_of_work.register_update(
+        Record(type="Contact", fields={"Id": "003000000000000999", "LastName": "Poe"})
+    )
+
+    results = await data_api.commit_unit_of_work_partially(unit_of_work)
+
+    assert list(results)[:5] == [acme, missing, contact, globex, globex_contact]
+    assert salesforce.get_record("Account", results[acme])["Name"] == "Acme"
+    assert salesforce.get_record("Contact", results[contact])["AccountId"] == results[acme]
+    assert salesforce.get_record("Account", results[globex])["Name"] == "Globex"
+    assert isinstance(results[missing], SalesforceRestApiError)
+    assert sum(isinstance(result, SalesforceRestApiError) for result in results.values()) == 2
+    assert salesforce.requests == [("POST", "/services/data/v62.0/composite/graph")]
+
+@pytest.mark.asyncio
+async def test_a_failure_rolls_back_its_whole_group(salesforce, data_api):
+    unit_of_work = UnitOfWork()
+    account = unit_of_work.register_create(Record(type="Account", fields={"Name": "Acme"}))
+    contact = unit_of_work.register_create(
+        Record(type="Contact", fields={"LastName": "Doe", "AccountId": account})
+    )
+    unit_of_work.register_update(
+        Record(type="Contact", fields={"Id": "003000000000000999", "ReportsToId": contact})
+    )
+    other = unit_of_work.register_create(Record(type="Account", fields={"Name": "Globex"}))
+
+    results = await data_api.commit_unit_of_work_partially(unit_of_work)
+
+    assert all(isinstance(results[ref], SalesforceRestApiError) for ref in (account, contact))
+    assert "PROCESSING_HALTED" in str(results[account])
+    assert salesforce.get_record("Account", results[other])["Name"] == "Globex"
+
+@pytest.mark.asyncio
+async def test_groups_are_split_into_several_requests(salesforce, data_api):
+    unit_of_work = UnitOfWork()
+    reference_ids = [
+        unit_of_work.register_create(Record(type="Account", fields={"Name": f"Account {i}"}))
+        for i in range(80)
+    ]
+
+    results = await data_api.commit_unit_of_work_partially(unit_of_work)
+
+    assert list(results) == reference_ids
+    assert all(isinstance(result, str) for result in results.values())
+    assert len(salesforce.requests) == 2
+
+@pytest.mark.asyncio
+async def test_unchanged_groups_are_not_sent(salesforce, data_api):
+    (record_id,) = salesforce.add_records("Account", [{"Name": "Acme"}])
+    account = TrackedRecord.track(Record(type="Account", fields={"Id": record_id, "Name": "Acme"}))
+
+    unit_of_work = UnitOfWork()
+    reference_id = unit_of_work.register_update(account)
+
+    assert await data_api.commit_unit_of_work_partially(unit_of_work) == {reference_id: record_id}
+    assert salesforce.requests == []
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from heroku_applink import connection
+from heroku_applink.config import Config
+from heroku_applink.data_api.exceptions import MissingFieldError, SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+from heroku_applink.write_batching import WriteBatchingPolicy
+
+COLLECTIONS_PATH = "/services/data/v62.0/composite/sobjects"
+
+@pytest.fixture
+def make_data_api(make_data_api):
+    def make_batching_data_api(**policy):
+        return make_data_api(
+            Config(write_batching=WriteBatchingPolicy(max_delay=0.01, **policy))
+        )
+
+    return make_batching_data_api
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_are_batched(salesforce, make_data_api):
+    data_api = make_data_api()
+
+    record_ids = await asyncio.gather(
+        *(
+            data_api.create(Record(type="Account", fields={"Name": f"Account {i}"}))
+            for i in range(10)
+        )
+    )
+
+    assert [
+        salesforce.get_record("Account", record_id)["Name"] for record_id in record_ids
+    ] == [f"Account {i}" for i in range(10)]
+    assert salesforce.requests == [("POST", COLLECTIONS_PATH)]
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_error(salesforce, make_data_api):
+    salesforce.require_fields("Account", "Name")
+    data_api = make_data_api()
+
+    results = await asyncio.gather(
+        data_api.create(Record(type="Account", fields={"Name": "Acme"})),
+        data_api.create(Record(type="Account", fields={"Industry": "Energy"})),
+        return_exceptions=True,
+    )
+
+    assert salesforce.get_record("Account", results[0])["Name"] == "Acme"
+    assert isinstance(results[1], SalesforceRestApiError)
+    assert results[1].api_errors[0].error_code == "REQUIRED_FIELD_MISSING"
+
+@pytest.mark.asyncio
+async def test_single_write_uses_a_regular_request(salesforce, make_data_api):
+    data_api = make_data_api()
+
+    record_id = await data_api.create(Record(type="Account", fields={"Name": "Acme"}))
+
+    assert salesforce.requests == [("POST", "/services/data/v62.0/sobjects/Account")]
+    assert salesforce.get_record("Account", record_id)["Name"] == "Acme"
+
+@pytest.mark.asyncio
+async def test_batches_are_split_by_size_and_object_type(salesforce, make_data_api):
+    data_api = make_data_api(max_batch_size=2)
+
+    await asyncio.gather(
+        *(data_api.create(Record(type="Account", fields={"Name": str(i)})) for i in range(4)),
+        *(data_api.create(Record(type="Contact", fields={"LastName": str(i)})) for i in range(2)),
+    )
+
+    assert salesforce.requests == [("POST", COLLECTIONS_PATH)] * 3
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_and_deletes_are_batched(salesforce, make_data_api):
+    record_ids = salesforce.add_records("Account", [{"Name": str(i)} for i in range(4)])
+    data_api = make_data_api()
+
+    updated = await asyncio.gather(
+        *(
+            data_api.update(Record(type="Account", fields={"Id": record_id, "Name": "Updated"}))
+            for record_id in record_ids[:2]
+        )
+    )
+    deleted = await asyncio.gather(
+        *(data_api.delete("Account", record_id) for record_id in record_ids[2:]),
+        data_api.delete("Account", "001000000000000MISSING"),
+        return_exceptions=True,
+    )
+
+    assert updated == record_ids[:2]
+    assert [salesforce.get_record("Account", record_id)["Name"] for record_id in updated] == [
+        "Updated",
+        "Updated",
+    ]
+    assert deleted[:2] == record_ids[2:]
+    assert isinstance(deleted[2], SalesforceRestApiError)
+    assert [method for method, _ in salesforce.requests] == ["PATCH", "DELETE"]
+
+@pytest.mark.asyncio
+async def test_update_without_id_fails_before_batching(salesforce, make_data_api):
+    data_api = make_data_api()
+
+    with pytest.raises(MissingFieldError):
+        await data_api.update(Record(type="Account", fields={"Name": "Acme"}))
+
+    assert salesforce.requests == []
+
+@pytest.mark.asyncio
+async def test_batches_use_the_tightest_deadline_of_their_callers(salesforce, make_data_api):
+    data_api = make_data_api()
+    sent = []
+    execute = data_api._write_batcher._execute
+
+    async def spy(request, timeout):
+        sent.append((connection.get_deadline(), connection.request_id.get(None)))
+        return await execute(request, timeout)
+
+    data_api._write_batcher._execute = spy
+
+    async def create(name, timeout):
+        connection.set_request_id(f"request-{name}")
+        connection.set_deadline(timeout)
+        record_id = await data_api.create(Record(type="Account", fields={"Name": name}))
+        return record_id, connection.get_deadline()
+
+    # The first caller, with the more lenient deadline, schedules the flush.
+    (_, first_deadline), (_, second_deadline) = await asyncio.gather(
+        create("Acme", 60), create("Globex", 30)
+    )
+
+    assert second_deadline < first_deadline
+    assert sent == [(second_deadline, None)]
+    assert salesforce.requests == [("POST", COLLECTIONS_PATH)]
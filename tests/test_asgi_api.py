@@ -1,6 +1,7 @@
 import pytest
 import json
 import base64
+import time
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -53,3 +54,82 @@ def test_scoped_client_context(client):
 
     assert response.status_code == 200
     assert response.json() == {"data_api_populated": True}
+
+def test_deadline_from_config_and_header():
+    deadline_app = FastAPI()
+    deadline_app.add_middleware(
+        sdk.IntegrationAsgiMiddleware,
+        config=sdk.Config(request_deadline=30, deadline_header="x-request-timeout"),
+    )
+
+    @deadline_app.get("/deadline")
+    async def deadline():
+        return {"remaining": sdk.get_deadline() - time.monotonic()}
+
+    client_context = base64.b64encode(json.dumps({
+        "orgId": "00DJS0000000123ABC",
+        "orgDomainUrl": "https://example-domain-url.my.salesforce.com",
+        "userContext": {"userId": "005JS000000H123", "username": "user@example.tld"},
+        "requestId": "006JS000000H123ABC",
+        "accessToken": "006JS000000H123ABC",
+        "apiVersion": "50.0",
+        "namespace": "heroku_applink",
+    }).encode()).decode()
+    client = TestClient(deadline_app)
+
+    from_config = client.get("/deadline", headers={"x-client-context": client_context})
+    from_header = client.get(
+        "/deadline",
+        headers={"x-client-context": client_context, "x-request-timeout": "2.5"},
+    )
+    invalid_header = client.get(
+        "/deadline",
+        headers={"x-client-context": client_context, "x-request-timeout": "soon"},
+    )
+
+    assert 29 < from_config.json()["remaining"] <= 30
+    assert 2 < from_header.json()["remaining"] <= 2.5
+    assert 29 < invalid_header.json()["remaining"] <= 30
+
+def test_only_needed_headers_are_decoded():
+    from heroku_applink.middleware import _asgi_headers
+
+    raw_headers = [
+        (b"x-forwarded-for", b"10.0.0.1"),
+        (b"x-request-id", b"first"),
+        (b"x-client-context", b"context"),
+        (b"x-request-id", "zwölf".encode("latin1")),
+    ]
+
+    assert _asgi_headers(raw_headers, frozenset({b"x-client-context", b"x-request-id"})) == {
+        "x-client-context": "context",
+        "x-request-id": "zwölf",
+    }
+
+def test_request_id_from_header():
+    request_id_app = FastAPI()
+    request_id_app.add_middleware(sdk.IntegrationAsgiMiddleware)
+    request_ids = []
+
+    @request_id_app.get("/request-id")
+    async def request_id():
+        request_ids.append(sdk.connection.get_request_id())
+        return {}
+
+    TestClient(request_id_app).get(
+        "/request-id",
+        headers={
+            "x-client-context": base64.b64encode(json.dumps({
+                "orgId": "00DJS0000000123ABC",
+                "orgDomainUrl": "https://example-domain-url.my.salesforce.com",
+                "userContext": {"userId": "005JS000000H123", "username": "user@example.tld"},
+                "requestId": "006JS000000H123ABC",
+                "accessToken": "006JS000000H123ABC",
+                "apiVersion": "50.0",
+                "namespace": "heroku_applink",
+            }).encode()).decode(),
+            "x-request-id": "abc-123",
+        },
+    )
+
+    assert request_ids == ["abc-123"]
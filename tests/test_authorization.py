@@ -4,15 +4,21 @@ import aiohttp
 
 from aioresponses import aioresponses
 from typing import Dict, Any
+from yarl import URL
 
 from heroku_applink.connection import Connection
 from heroku_applink.data_api import DataAPI
 from heroku_applink.authorization import (
     Authorization,
+    AuthorizationResults,
+    _AuthorizationCache,
+    _addon_config_index,
     _resolve_addon_config_by_attachment_or_color,
     _resolve_addon_config_by_url,
     _resolve_attachment_or_url,
     _is_valid_url,
+    _parse_datetime,
+    refresh_addon_config,
 )
 from heroku_applink.authorization import Org as AuthorizationOrg
 
@@ -62,6 +68,17 @@ VALID_RESPONSE_NO_REDIRECT_URI: Dict[str, Any] = {
     "last_modified_by": "foo@heroku.com",
 }
 
+@pytest.fixture(autouse=True)
+def refresh_addon_config_index():
+    # Don't let add-on config from a previous test's environment leak into this one.
+    refresh_addon_config()
+
+@pytest.fixture(autouse=True)
+def clear_authorization_cache():
+    Authorization.clear_cache()
+    yield
+    Authorization.clear_cache()
+
 @pytest.fixture
 def monkeypatch_app_id(monkeypatch):
     monkeypatch.setenv("HEROKU_APP_ID", "f208caa9-3d49-4660-a2cf-80cd8dde7492")
@@ -281,3 +298,221 @@ def test_is_valid_url():
     assert _is_valid_url("test") is False
     assert _is_valid_url("https://") is False
     assert _is_valid_url("https://api.test.com/") is True
+
+def test_parse_datetime_is_timezone_aware():
+    parsed = _parse_datetime("2025-03-06T18:20:42.226577Z")
+
+    assert parsed == datetime.datetime(2025, 3, 6, 18, 20, 42, 226577, tzinfo=datetime.timezone.utc)
+
+def test_parse_datetime_uncommon_fraction_digits():
+    parsed = _parse_datetime("2025-03-06T18:20:42.2265Z")
+
+    assert parsed == datetime.datetime(2025, 3, 6, 18, 20, 42, 226500, tzinfo=datetime.timezone.utc)
+
+@pytest.mark.parametrize(
+    "datetime_str",
+    [
+        "2025-03-06T18:20:42.226577",
+        "2025-03-06T18:20:42.2265",
+        "2025-03-06T20:20:42.226577+02:00",
+        "2025-03-06T20:20:42.2265+0200",
+    ],
+)
+def test_parse_datetime_is_always_utc(datetime_str):
+    parsed = _parse_datetime(datetime_str)
+
+    assert parsed.tzinfo is datetime.timezone.utc
+    assert parsed.replace(microsecond=0) == datetime.datetime(2025, 3, 6, 18, 20, 42, tzinfo=datetime.timezone.utc)
+
+@pytest.mark.asyncio
+async def test_find_authorization_datetimes_are_timezone_aware(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+
+    with aioresponses() as m:
+        m.get("https://api.test/authorizations/devName", status=200, payload=VALID_RESPONSE)
+
+        authorization = await Authorization.find("devName")
+
+    assert authorization.created_at.tzinfo == datetime.timezone.utc
+    assert authorization.last_modified_at.tzinfo == datetime.timezone.utc
+
+@pytest.mark.asyncio
+async def test_find_many(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+
+    with aioresponses() as m:
+        m.get("https://api.test/authorizations/org1", status=200, payload=VALID_RESPONSE)
+        m.get("https://api.test/authorizations/org2", status=200, payload=VALID_RESPONSE_NO_REDIRECT_URI)
+        m.get("https://api.test/authorizations/broken", status=404, payload={"error": "Not Found"})
+
+        results = await Authorization.find_many(["org1", "org2", "broken", "org1"], concurrency=2)
+
+    assert isinstance(results, AuthorizationResults)
+    assert set(results.authorizations) == {"org1", "org2"}
+    assert set(results.errors) == {"broken"}
+    assert isinstance(results.errors["broken"], aiohttp.client_exceptions.ClientResponseError)
+
+    for authorization in results.authorizations.values():
+        assert_authorization_is_valid(authorization)
+
+    # All authorizations share one connection pool.
+    assert results.authorizations["org1"].connection is results.authorizations["org2"].connection
+
+@pytest.mark.asyncio
+async def test_find_many_empty_developer_name(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+
+    results = await Authorization.find_many([""])
+
+    assert results.authorizations == {}
+    assert isinstance(results.errors[""], ValueError)
+
+@pytest.mark.asyncio
+async def test_find_many_invalid_concurrency():
+    with pytest.raises(ValueError, match="Concurrency must be at least 1"):
+        await Authorization.find_many(["org1"], concurrency=0)
+
+@pytest.mark.asyncio
+async def test_find_uses_cache_populated_by_find_many(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+
+    with aioresponses() as m:
+        m.get("https://api.test/authorizations/org1", status=200, payload=VALID_RESPONSE)
+
+        results = await Authorization.find_many(["org1"])
+        # No further request is mocked, so this must be served from the cache.
+        authorization = await Authorization.find("org1", use_cache=True)
+
+    assert authorization is results.authorizations["org1"]
+
+@pytest.mark.asyncio
+async def test_find_without_cache_fetches_again(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+
+    with aioresponses() as m:
+        m.get("https://api.test/authorizations/org1", status=200, payload=VALID_RESPONSE, repeat=True)
+
+        first = await Authorization.find("org1")
+        second = await Authorization.find("org1")
+
+    assert first is not second
+
+@pytest.mark.asyncio
+async def test_cached_authorizations_expire(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv("HEROKU_APPLINK_API_URL", "https://api.test/")
+    monkeypatch.setenv("HEROKU_APPLINK_TOKEN", "TOKEN")
+    now = [0.0]
+    monkeypatch.setattr("heroku_applink.authorization.time.monotonic", lambda: now[0])
+
+    with aioresponses() as m:
+        m.get("https://api.test/authorizations/org1", status=200, payload=VALID_RESPONSE, repeat=True)
+
+        first = await Authorization.find("org1", use_cache=True)
+
+        now[0] = 299.0
+        assert await Authorization.find("org1", use_cache=True) is first
+
+        now[0] = 300.0
+        second = await Authorization.find("org1", use_cache=True)
+
+    assert second is not first
+    assert len(m.requests[("GET", URL("https://api.test/authorizations/org1"))]) == 2
+
+def test_authorization_cache_evicts_least_recently_used():
+    cache = _AuthorizationCache(max_size=2)
+    first, second, third = (object() for _ in range(3))
+
+    cache.put(("https://api.test/", "org1"), first)
+    cache.put(("https://api.test/", "org2"), second)
+    assert cache.get(("https://api.test/", "org1")) is first
+    cache.put(("https://api.test/", "org3"), third)
+
+    assert len(cache) == 2
+    assert cache.get(("https://api.test/", "org2")) is None
+    assert cache.get(("https://api.test/", "org1")) is first
+    assert cache.get(("https://api.test/", "org3")) is third
+
+def test_resolve_by_attachment_sees_rotated_token_after_refresh(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv('ROTATING_API_URL', 'https://rotating.example.com')
+    monkeypatch.setenv('ROTATING_TOKEN', 'old-token')
+
+    assert _resolve_addon_config_by_attachment_or_color('ROTATING').token == 'old-token'
+
+    monkeypatch.setenv('ROTATING_TOKEN', 'new-token')
+
+    # The index isn't rebuilt on a hit...
+    assert _resolve_addon_config_by_attachment_or_color('ROTATING').token == 'old-token'
+
+    # ...only on an explicit refresh.
+    refresh_addon_config()
+    assert _resolve_addon_config_by_attachment_or_color('ROTATING').token == 'new-token'
+    assert _resolve_addon_config_by_url('https://rotating.example.com').token == 'new-token'
+
+def test_resolve_misses_only_rebuild_index_when_environment_changed(monkeypatch, monkeypatch_app_id):
+    refresh_addon_config()
+    refreshes = []
+    refresh = _addon_config_index.refresh
+    monkeypatch.setattr(_addon_config_index, "refresh", lambda: refreshes.append(1) or refresh())
+
+    for _ in range(3):
+        with pytest.raises(EnvironmentError):
+            _resolve_addon_config_by_attachment_or_color('UNKNOWN')
+        with pytest.raises(EnvironmentError):
+            _resolve_addon_config_by_url('https://unknown.example.com')
+
+    assert refreshes == []
+
+    monkeypatch.setenv('ADDED_API_URL', 'https://added.example.com')
+    monkeypatch.setenv('ADDED_TOKEN', 'token')
+
+    assert _resolve_addon_config_by_attachment_or_color('ADDED').token == 'token'
+    assert _resolve_addon_config_by_url('https://added.example.com').token == 'token'
+    assert refreshes == [1]
+
+def test_resolve_misses_rebuild_index_when_config_var_was_replaced(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv('OLD_API_URL', 'https://old.example.com')
+    monkeypatch.setenv('OLD_TOKEN', 'old-token')
+    refresh_addon_config()
+
+    # Replacing variables keeps the size of the environment the same.
+    monkeypatch.delenv('OLD_API_URL')
+    monkeypatch.delenv('OLD_TOKEN')
+    monkeypatch.setenv('NEW_API_URL', 'https://new.example.com')
+    monkeypatch.setenv('NEW_TOKEN', 'new-token')
+
+    assert _resolve_addon_config_by_attachment_or_color('NEW').token == 'new-token'
+    assert _resolve_addon_config_by_url('https://new.example.com').token == 'new-token'
+
+def test_resolve_by_url_missing_token(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv('NOTOKEN_API_URL', 'https://notoken.example.com')
+    monkeypatch.delenv('NOTOKEN_TOKEN', raising=False)
+
+    with pytest.raises(EnvironmentError) as exc_info:
+        _resolve_addon_config_by_url('https://notoken.example.com')
+
+    assert 'Missing token for API URL' in str(exc_info.value)
+
+def test_resolve_by_attachment_missing_app_id(monkeypatch):
+    monkeypatch.delenv('HEROKU_APP_ID', raising=False)
+    monkeypatch.setenv('NOAPP_API_URL', 'https://noapp.example.com')
+    monkeypatch.setenv('NOAPP_TOKEN', 'token')
+
+    with pytest.raises(EnvironmentError) as exc_info:
+        _resolve_addon_config_by_attachment_or_color('NOAPP')
+
+    assert 'HEROKU_APP_ID is not set' in str(exc_info.value)
+
+def test_resolve_by_color_custom_addon_prefix(monkeypatch, monkeypatch_app_id):
+    monkeypatch.setenv('HEROKU_APPLINK_ADDON_NAME', 'MY_APPLINK')
+    monkeypatch.setenv('MY_APPLINK_GREEN_API_URL', 'https://green.example.com')
+    monkeypatch.setenv('MY_APPLINK_GREEN_TOKEN', 'green-token')
+
+    auth = _resolve_addon_config_by_attachment_or_color('green')
+
+    assert auth.api_url == 'https://green.example.com'
+    assert auth.token == 'green-token'
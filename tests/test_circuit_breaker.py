@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from aioresponses import aioresponses
+from yarl import URL
+
+from heroku_applink import metrics
+from heroku_applink.circuit_breaker import CircuitBreakerPolicy, _CircuitBreaker
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.exceptions import CircuitOpenError
+
+SICK_URL = "https://sick.my.salesforce.com/services/data/v62.0/query"
+HEALTHY_URL = "https://healthy.my.salesforce.com/services/data/v62.0/query"
+
+@pytest.fixture
+def connection():
+    return Connection(
+        Config(
+            circuit_breaker=CircuitBreakerPolicy(failure_threshold=3, open_duration=0.05)
+        )
+    )
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures(connection):
+    rejected_before = metrics._CIRCUIT_BREAKER_REJECTED.get(org="sick.my.salesforce.com")
+
+    with aioresponses() as m:
+        m.get(SICK_URL, status=503, repeat=True)
+        m.get(HEALTHY_URL, status=200, repeat=True)
+
+        for _ in range(3):
+            await connection.request("GET", SICK_URL)
+
+        with pytest.raises(CircuitOpenError):
+            await connection.request("GET", SICK_URL)
+
+        # Other orgs aren't affected.
+        assert (await connection.request("GET", HEALTHY_URL)).status == 200
+
+        assert len(m.requests[("GET", URL(SICK_URL))]) == 3
+
+    assert metrics._CIRCUIT_BREAKER_STATE.get(org="sick.my.salesforce.com") == 1
+    assert (
+        metrics._CIRCUIT_BREAKER_REJECTED.get(org="sick.my.salesforce.com")
+        == rejected_before + 1
+    )
+
+@pytest.mark.asyncio
+async def test_successful_probe_closes_circuit(connection):
+    with aioresponses() as m:
+        m.get(SICK_URL, status=503, repeat=3)
+
+        for _ in range(3):
+            await connection.request("GET", SICK_URL)
+
+        await asyncio.sleep(0.06)
+        m.get(SICK_URL, status=200, repeat=True)
+
+        assert (await connection.request("GET", SICK_URL)).status == 200
+        assert (await connection.request("GET", SICK_URL)).status == 200
+
+    assert connection._circuit_breakers["sick.my.salesforce.com"].state == "closed"
+    assert metrics._CIRCUIT_BREAKER_STATE.get(org="sick.my.salesforce.com") == 0
+
+@pytest.mark.asyncio
+async def test_success_resets_consecutive_failures(connection):
+    with aioresponses() as m:
+        for status in (503, 503, 200, 503, 503):
+            m.get(SICK_URL, status=status)
+
+        for _ in range(5):
+            await connection.request("GET", SICK_URL)
+
+    assert connection._circuit_breakers["sick.my.salesforce.com"].state == "closed"
+
+@pytest.mark.asyncio
+async def test_circuit_opens_on_timeout_rate():
+    connection = Connection(
+        Config(
+            circuit_breaker=CircuitBreakerPolicy(
+                failure_threshold=100, timeout_rate_threshold=0.5, window_size=4
+            )
+        )
+    )
+
+    with aioresponses() as m:
+        for _ in range(2):
+            m.get(SICK_URL, status=200)
+            m.get(SICK_URL, exception=asyncio.TimeoutError())
+
+        for _ in range(2):
+            await connection.request("GET", SICK_URL)
+            with pytest.raises(asyncio.TimeoutError):
+                await connection.request("GET", SICK_URL)
+
+        with pytest.raises(CircuitOpenError):
+            await connection.request("GET", SICK_URL)
+
+def test_half_open_allows_limited_probes(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("heroku_applink.circuit_breaker.time.monotonic", lambda: now[0])
+    circuit_breaker = _CircuitBreaker(
+        CircuitBreakerPolicy(failure_threshold=1, open_duration=10), "probe.example.com"
+    )
+
+    assert circuit_breaker.before_request() is False
+    circuit_breaker.record_failure(False, timeout=False)
+    assert circuit_breaker.state == "open"
+
+    now[0] = 5.0
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+    now[0] = 10.0
+    assert circuit_breaker.before_request() is True
+    assert circuit_breaker.state == "half_open"
+
+    # Only one probe at a time.
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+    # A failed probe opens the circuit again, for another `open_duration`.
+    circuit_breaker.record_failure(True, timeout=True)
+    assert circuit_breaker.state == "open"
+
+    now[0] = 15.0
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.before_request()
+
+    now[0] = 20.0
+    assert circuit_breaker.before_request() is True
+    circuit_breaker.release_probe()
+    assert circuit_breaker.before_request() is True
+    circuit_breaker.record_success(True)
+    assert circuit_breaker.state == "closed"
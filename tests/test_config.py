@@ -9,6 +9,7 @@ def test_config_default():
     assert config.connect_timeout is None
     assert config.socket_connect is None
     assert config.socket_read is None
+    assert config.data_api_pool_size == 128
 
 def test_config_client_timeouts():
     config = Config(request_timeout=10)
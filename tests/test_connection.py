@@ -1,12 +1,15 @@
 import pytest
 import aiohttp
+import asyncio
+import time
 import uuid
 
 from aioresponses import aioresponses
 from yarl import URL
 
 from heroku_applink.config import Config
-from heroku_applink.connection import Connection, set_request_id
+from heroku_applink.connection import Connection, get_deadline, set_deadline, set_request_id
+from heroku_applink.exceptions import DeadlineExceededError
 
 @pytest.fixture
 def config():
@@ -41,6 +44,15 @@ async def test_connection_request_get(connection):
         data = await response.json()
         assert data == {'key': 'value'}
 
+@pytest.mark.asyncio
+async def test_connection_request_as_context_manager(connection):
+    with aioresponses() as m:
+        m.get('https://example.com', status=200, payload={'key': 'value'})
+
+        async with connection.request("GET", "https://example.com") as response:
+            assert response.status == 200
+            assert await response.json() == {'key': 'value'}
+
 @pytest.mark.asyncio
 async def test_connection_request_post(connection):
     with aioresponses() as m:
@@ -95,11 +107,11 @@ async def test_connection_close(connection):
     with aioresponses() as m:
         m.get('https://example.com', status=200)
         await connection.request("GET", "https://example.com")
-        assert connection._session is not None
+        assert connection._transport is not None
 
     # Close the session
     await connection.close()
-    assert connection._session is None
+    assert connection._transport is None
 
 @pytest.mark.asyncio
 async def test_connection_reuse(connection):
@@ -109,12 +121,12 @@ async def test_connection_reuse(connection):
         # First request
         response1 = await connection.request("GET", "https://example.com")
         assert response1.status == 200
-        session1 = connection._session
+        transport1 = connection._transport
 
         # Second request should reuse the same session
         response2 = await connection.request("GET", "https://example.com")
         assert response2.status == 200
-        assert connection._session is session1
+        assert connection._transport is transport1
 
 @pytest.mark.asyncio
 async def test_connection_custom_timeout(connection):
@@ -306,3 +318,73 @@ def test_decode_headers_with_non_ascii(connection):
     decoded = connection._decode_headers(headers)
     assert decoded["X-Custom"] == "välue"
     assert decoded["X-Other"] == "välue"
+
+@pytest.fixture
+def deadline():
+    yield set_deadline
+    set_deadline(None)
+
+@pytest.mark.asyncio
+async def test_connection_clamps_timeout_to_deadline(connection, deadline):
+    deadline(0.5)
+    timeouts = []
+
+    def callback(url, **kwargs):
+        timeouts.append(kwargs["timeout"])
+
+    with aioresponses() as m:
+        m.get("https://example.com", status=200, callback=callback)
+        m.get("https://example.com", status=200, callback=callback)
+
+        await connection.request("GET", "https://example.com")
+        await connection.request("GET", "https://example.com", timeout=0.1)
+
+    assert 0 < timeouts[0].total <= 0.5
+    assert timeouts[1].total == 0.1
+
+@pytest.mark.asyncio
+async def test_connection_raises_when_deadline_passed(connection, deadline):
+    deadline(-1)
+
+    with aioresponses() as m:
+        with pytest.raises(DeadlineExceededError):
+            await connection.request("GET", "https://example.com")
+
+        assert not m.requests
+
+@pytest.mark.asyncio
+async def test_connection_raises_when_deadline_passes_during_request(connection, deadline):
+    deadline(0.05)
+
+    async def callback(url, **kwargs):
+        # Stands in for aiohttp's timeout firing at the clamped deadline.
+        await asyncio.sleep(0.06)
+        raise asyncio.TimeoutError()
+
+    with aioresponses() as m:
+        m.get("https://example.com", callback=callback)
+
+        with pytest.raises(DeadlineExceededError):
+            await connection.request("GET", "https://example.com")
+
+@pytest.mark.asyncio
+async def test_connection_stops_retrying_without_budget(deadline):
+    connection = Connection(Config(max_retries=3, retry_backoff=1))
+    deadline(0.5)
+
+    with aioresponses() as m:
+        m.get("https://example.com", status=503, repeat=True)
+
+        response = await connection.request("GET", "https://example.com")
+
+    assert response.status == 503
+    assert len(m.requests[("GET", URL("https://example.com"))]) == 1
+
+def test_deadline_contextvar(deadline):
+    assert get_deadline() is None
+
+    deadline(10)
+    assert get_deadline() > time.monotonic() + 9
+
+    deadline(None)
+    assert get_deadline() is None
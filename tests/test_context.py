@@ -3,7 +3,7 @@ import json
 import pytest
 
 from heroku_applink.config import Config
-from heroku_applink.context import User, Org, ClientContext
+from heroku_applink.context import User, Org, ClientContext, DataAPIPool
 from heroku_applink.connection import Connection
 
 class FakeDataAPI:
@@ -103,3 +103,64 @@ def test_client_context_from_header_with_null_namespace():
     assert ctx.access_token == "access-token-xyz"
     assert ctx.api_version == "v57.0"
     assert ctx.namespace is None
+
+def _encoded_header(access_token="access-token-xyz"):
+    payload = {
+        "orgId": "00DJS0000000123ABC",
+        "orgDomainUrl": "https://example-domain.my.salesforce.com",
+        "userContext": {
+            "userId": "005JS000000H123",
+            "username": "user@example.tld",
+        },
+        "requestId": "req-456",
+        "accessToken": access_token,
+        "apiVersion": "v57.0",
+    }
+    return base64.b64encode(json.dumps(payload).encode()).decode()
+
+def test_data_api_pool_reuses_instances():
+    connection = Connection(Config.default())
+    pool = DataAPIPool(connection)
+
+    first = pool.get("https://example-domain.my.salesforce.com", "v57.0", "token-1")
+    second = pool.get("https://example-domain.my.salesforce.com", "v57.0", "token-1")
+    other_token = pool.get("https://example-domain.my.salesforce.com", "v57.0", "token-2")
+
+    assert first is second
+    assert first is not other_token
+    assert first.connection is connection
+    assert len(pool) == 2
+
+def test_data_api_pool_evicts_least_recently_used():
+    pool = DataAPIPool(Connection(Config.default()), max_size=2)
+
+    first = pool.get("https://a.my.salesforce.com", "v57.0", "token")
+    pool.get("https://b.my.salesforce.com", "v57.0", "token")
+    # Touch the first entry, so the second one is the least recently used.
+    pool.get("https://a.my.salesforce.com", "v57.0", "token")
+    pool.get("https://c.my.salesforce.com", "v57.0", "token")
+
+    assert len(pool) == 2
+    assert pool.get("https://a.my.salesforce.com", "v57.0", "token") is first
+
+def test_data_api_pool_disabled():
+    pool = DataAPIPool(Connection(Config.default()), max_size=0)
+
+    first = pool.get("https://a.my.salesforce.com", "v57.0", "token")
+    second = pool.get("https://a.my.salesforce.com", "v57.0", "token")
+
+    assert first is not second
+    assert len(pool) == 0
+
+def test_client_context_from_header_with_data_api_pool():
+    connection = Connection(Config.default())
+    pool = DataAPIPool(connection)
+
+    first = ClientContext.from_header(_encoded_header(), connection, pool)
+    second = ClientContext.from_header(_encoded_header(), connection, pool)
+    other = ClientContext.from_header(_encoded_header("other-token"), connection, pool)
+
+    assert first is not second
+    assert first.data_api is second.data_api
+    assert first.data_api is not other.data_api
+    assert other.data_api.access_token == "other-token"
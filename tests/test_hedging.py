@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from heroku_applink import metrics
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.data_api._requests import (
+    CreateRecordRestApiRequest,
+    QueryNextRecordsRestApiRequest,
+    QueryRecordsRestApiRequest,
+)
+from heroku_applink.data_api.record import Record
+from heroku_applink.hedging import HedgingPolicy, _LatencyWindow
+from heroku_applink.instrumentation import Instrumentation
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.ended = []
+
+    def on_request_end(self, event):
+        self.ended.append(event)
+
+def _slow_nth_request_app(slow_request: int, delay: float = 2.0):
+    """An app answering immediately, except for the `slow_request`th request."""
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) == slow_request:
+            await asyncio.sleep(delay)
+        return web.json_response({"request": len(requests)})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    return app, requests
+
+def test_latency_window_quantile():
+    window = _LatencyWindow(size=100)
+
+    assert window.quantile(0.95) is None
+
+    for latency in range(1, 101):
+        window.observe(latency / 100)
+
+    assert len(window) == 100
+    assert window.quantile(0.95) == 0.95
+    assert window.quantile(0.5) == 0.5
+
+    # Older samples fall out of the window.
+    for _ in range(100):
+        window.observe(2.0)
+
+    assert window.quantile(0.5) == 2.0
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged():
+    app, requests = _slow_nth_request_app(slow_request=4)
+    instrumentation = RecordingInstrumentation()
+    connection = Connection(
+        Config(
+            hedging=HedgingPolicy(min_samples=3, min_delay=0.05),
+            instrumentation=instrumentation,
+        )
+    )
+
+    async with TestServer(app) as server:
+        host = server.make_url("/").host
+        hedged_before = metrics._HTTP_HEDGED_REQUESTS.get(org=host)
+        wins_before = metrics._HTTP_HEDGE_WINS.get(org=host)
+
+        for _ in range(3):
+            await connection.request("GET", server.make_url("/"), hedge=True)
+
+        start = time.perf_counter()
+        response = await connection.request("GET", server.make_url("/"), hedge=True)
+        elapsed = time.perf_counter() - start
+
+        await connection.close()
+
+    assert elapsed < 1
+    assert (await response.json()) == {"request": 5}
+    assert len(requests) == 5
+    assert metrics._HTTP_HEDGED_REQUESTS.get(org=host) == hedged_before + 1
+    assert metrics._HTTP_HEDGE_WINS.get(org=host) == wins_before + 1
+    assert instrumentation.ended[-1].hedge
+
+@pytest.mark.asyncio
+async def test_requests_are_not_hedged_unless_requested():
+    app, requests = _slow_nth_request_app(slow_request=4, delay=0.3)
+    connection = Connection(Config(hedging=HedgingPolicy(min_samples=3, min_delay=0.05)))
+
+    async with TestServer(app) as server:
+        for _ in range(4):
+            response = await connection.request("GET", server.make_url("/"))
+
+        await connection.close()
+
+    assert (await response.json()) == {"request": 4}
+    assert len(requests) == 4
+
+@pytest.mark.asyncio
+async def test_requests_are_not_hedged_without_policy():
+    app, requests = _slow_nth_request_app(slow_request=4, delay=0.3)
+    connection = Connection(Config())
+
+    async with TestServer(app) as server:
+        for _ in range(4):
+            await connection.request("GET", server.make_url("/"), hedge=True)
+
+        await connection.close()
+
+    assert len(requests) == 4
+
+def test_only_queries_are_hedgeable():
+    async def download_file(url):
+        return b""  # pragma: no cover
+
+    assert QueryRecordsRestApiRequest("SELECT Id FROM Account", download_file).hedgeable()
+    assert QueryNextRecordsRestApiRequest(
+        "/services/data/v62.0/query/01gRO0000016PIAYA2-2000", download_file
+    ).hedgeable()
+    assert not CreateRecordRestApiRequest(
+        Record(type="Account", fields={"Name": "Acme"})
+    ).hedgeable()
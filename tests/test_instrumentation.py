@@ -0,0 +1,180 @@
+import aiohttp
+import pytest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aioresponses import aioresponses
+from yarl import URL
+
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection, set_request_id
+from heroku_applink.instrumentation import (
+    Histogram,
+    HistogramCollector,
+    Instrumentation,
+    RequestEvent,
+)
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+        self.retried = []
+
+    def on_request_start(self, event):
+        self.started.append(event)
+
+    def on_request_end(self, event):
+        self.ended.append(event)
+
+    def on_retry(self, event, delay):
+        self.retried.append((event, delay))
+
+@pytest.fixture
+def instrumentation():
+    return RecordingInstrumentation()
+
+def test_histogram_percentiles():
+    histogram = Histogram(buckets=(1, 2, 3, 4))
+
+    assert histogram.percentile(0.5) is None
+
+    for value in (0.5, 1.5, 1.5, 2.5, 10):
+        histogram.observe(value)
+
+    assert histogram.count == 5
+    assert histogram.sum == 16
+    assert histogram.percentile(0.2) == 1
+    assert histogram.percentile(0.5) == 2
+    assert histogram.percentile(0.8) == 3
+    assert histogram.percentile(1.0) == float("inf")
+
+def test_histogram_collector_snapshot():
+    collector = HistogramCollector()
+
+    collector.on_request_end(
+        RequestEvent(
+            method="GET",
+            url="https://example.com",
+            request_id="req-1",
+            start_time=1.0,
+            end_time=1.2,
+            connect=0.05,
+            server=0.1,
+            status=200,
+            response_size=2048,
+        )
+    )
+    collector.on_request_end(
+        RequestEvent(
+            method="GET",
+            url="https://example.com",
+            request_id="req-2",
+            start_time=1.0,
+            end_time=1.5,
+            error=aiohttp.ClientConnectionError(),
+        )
+    )
+    collector.on_retry(RequestEvent(method="GET", url="https://example.com", request_id="req-2"), 0.1)
+
+    snapshot = collector.snapshot()
+
+    assert snapshot["total"]["count"] == 2
+    assert snapshot["connect"]["count"] == 1
+    assert snapshot["dns"]["count"] == 0
+    assert snapshot["server"]["p50"] == 0.1
+    assert snapshot["response_size"]["sum"] == 2048
+    assert snapshot["status_counts"] == {200: 1}
+    assert snapshot["errors"] == 1
+    assert snapshot["retries"] == 1
+
+@pytest.mark.asyncio
+async def test_connection_notifies_instrumentation(instrumentation):
+    connection = Connection(Config(instrumentation=instrumentation))
+    set_request_id("instrumented-request")
+
+    with aioresponses() as m:
+        m.get("https://example.com", status=200, body=b'{"key": "value"}')
+
+        response = await connection.request("GET", "https://example.com")
+
+    assert response.status == 200
+    assert len(instrumentation.started) == 1
+    assert instrumentation.ended == instrumentation.started
+
+    event = instrumentation.ended[0]
+    assert event.method == "GET"
+    assert event.url == "https://example.com"
+    assert event.request_id == "instrumented-request"
+    assert event.attempt == 1
+    assert event.status == 200
+    assert event.response_size == len(b'{"key": "value"}')
+    assert event.duration >= 0
+    assert event.error is None
+
+@pytest.mark.asyncio
+async def test_connection_retries_idempotent_requests(instrumentation):
+    connection = Connection(Config(instrumentation=instrumentation, max_retries=2, retry_backoff=0))
+
+    with aioresponses() as m:
+        m.get("https://example.com", status=503)
+        m.get("https://example.com", exception=aiohttp.ClientConnectionError("reset"))
+        m.get("https://example.com", status=200, payload={"ok": True})
+
+        response = await connection.request("GET", "https://example.com")
+
+    assert response.status == 200
+    assert [event.attempt for event in instrumentation.ended] == [1, 2, 3]
+    assert instrumentation.ended[0].status == 503
+    assert isinstance(instrumentation.ended[1].error, aiohttp.ClientConnectionError)
+    assert len(instrumentation.retried) == 2
+
+@pytest.mark.asyncio
+async def test_connection_gives_up_after_max_retries(instrumentation):
+    connection = Connection(Config(instrumentation=instrumentation, max_retries=1, retry_backoff=0))
+
+    with aioresponses() as m:
+        m.get("https://example.com", exception=aiohttp.ClientConnectionError("reset"), repeat=True)
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await connection.request("GET", "https://example.com")
+
+    assert len(instrumentation.ended) == 2
+    assert len(instrumentation.retried) == 1
+
+@pytest.mark.asyncio
+async def test_connection_does_not_retry_non_idempotent_requests(instrumentation):
+    connection = Connection(Config(instrumentation=instrumentation, max_retries=3, retry_backoff=0))
+
+    with aioresponses() as m:
+        m.post("https://example.com", status=503)
+
+        response = await connection.request("POST", "https://example.com")
+
+        assert len(m.requests[("POST", URL("https://example.com"))]) == 1
+
+    assert response.status == 503
+    assert instrumentation.retried == []
+
+@pytest.mark.asyncio
+async def test_connection_collects_phase_timings():
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    collector = HistogramCollector()
+    connection = Connection(Config(instrumentation=collector))
+
+    async with TestServer(app) as server:
+        await connection.request("GET", server.make_url("/"))
+        await connection.request("GET", server.make_url("/"))
+        await connection.close()
+
+    snapshot = collector.snapshot()
+    assert snapshot["total"]["count"] == 2
+    assert snapshot["server"]["count"] == 2
+    # Only the first request had to open a connection, the second one reused it.
+    assert snapshot["connect"]["count"] == 1
+    assert snapshot["status_counts"] == {200: 2}
@@ -0,0 +1,144 @@
+import re
+
+import pytest
+
+from aioresponses import aioresponses
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import heroku_applink as sdk
+from heroku_applink import metrics
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.data_api import DataAPI
+from heroku_applink.metrics import MetricsRegistry
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("org",))
+    gauge = registry.gauge("in_flight", "In flight.")
+
+    counter.inc(org="a.example.com")
+    counter.inc(2, org='b"quoted')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert counter.get(org="a.example.com") == 1
+    assert gauge.get() == 1
+
+    rendered = registry.render()
+    assert "# HELP requests_total Requests.\n# TYPE requests_total counter\n" in rendered
+    assert 'requests_total{org="a.example.com"} 1.0\n' in rendered
+    assert 'requests_total{org="b\\"quoted"} 2.0\n' in rendered
+    assert "# TYPE in_flight gauge\nin_flight 1.0\n" in rendered
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("duration_seconds", "Duration.", ("api_type",), buckets=(0.1, 1))
+
+    histogram.observe(0.05, api_type="query")
+    histogram.observe(0.5, api_type="query")
+    histogram.observe(5, api_type="query")
+
+    rendered = registry.render()
+    assert 'duration_seconds_bucket{api_type="query",le="0.1"} 1\n' in rendered
+    assert 'duration_seconds_bucket{api_type="query",le="1.0"} 2\n' in rendered
+    assert 'duration_seconds_bucket{api_type="query",le="+Inf"} 3\n' in rendered
+    assert 'duration_seconds_sum{api_type="query"} 5.55\n' in rendered
+    assert 'duration_seconds_count{api_type="query"} 3\n' in rendered
+
+def test_gauge_callback():
+    registry = MetricsRegistry()
+    registry.gauge("utilization", "Utilization.", callback=lambda: 0.25)
+
+    assert "utilization 0.25\n" in registry.render()
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("org",))
+
+    assert registry.counter("requests_total", "Requests.", ("org",)) is counter
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.", ("org",))
+
+def test_wrong_labels():
+    counter = MetricsRegistry().counter("requests_total", "Requests.", ("org",))
+
+    with pytest.raises(ValueError):
+        counter.inc(host="a.example.com")
+
+def test_record_limit_info():
+    metrics._record_limit_info("limits.example.com", "api-usage=25/5000")
+
+    assert metrics._SALESFORCE_API_USAGE.get(org="limits.example.com") == 25
+    assert metrics._SALESFORCE_API_LIMIT.get(org="limits.example.com") == 5000
+
+@pytest.mark.asyncio
+async def test_data_api_records_metrics():
+    data_api = DataAPI(
+        org_domain_url="https://metrics.my.salesforce.com",
+        api_version="62.0",
+        access_token="token",
+        connection=Connection(Config.default()),
+    )
+    duration = metrics._DATA_API_REQUEST_DURATION.get(api_type="query")
+    count_before = duration.count if duration else 0
+    records_before = metrics._DATA_API_RECORDS_PARSED.get(api_type="query")
+    bytes_before = metrics._HTTP_RESPONSE_BYTES.get(org="metrics.my.salesforce.com")
+
+    with aioresponses() as m:
+        m.get(
+            re.compile(r"https://metrics\.my\.salesforce\.com/services/data/v62\.0/query.*"),
+            status=200,
+            headers={"Sforce-Limit-Info": "api-usage=42/15000"},
+            payload={
+                "done": True,
+                "totalSize": 2,
+                "records": [
+                    {"attributes": {"type": "Account"}, "Id": "001A"},
+                    {"attributes": {"type": "Account"}, "Id": "001B"},
+                ],
+            },
+        )
+
+        await data_api.query("SELECT Id FROM Account")
+
+    assert metrics._DATA_API_REQUEST_DURATION.get(api_type="query").count == count_before + 1
+    assert metrics._DATA_API_RECORDS_PARSED.get(api_type="query") == records_before + 2
+    assert metrics._HTTP_RESPONSE_BYTES.get(org="metrics.my.salesforce.com") > bytes_before
+    assert metrics._HTTP_REQUESTS_IN_FLIGHT.get(org="metrics.my.salesforce.com") == 0
+    assert metrics._SALESFORCE_API_USAGE.get(org="metrics.my.salesforce.com") == 42
+
+def test_metrics_path_on_asgi_middleware():
+    app = FastAPI()
+    app.add_middleware(sdk.IntegrationAsgiMiddleware, metrics_path="/metrics")
+
+    @app.get("/")
+    async def root():
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE heroku_applink_http_requests_in_flight gauge" in response.text
+    assert "heroku_applink_connection_pool_utilization" in response.text
+
+    # Other paths still require the client context.
+    with pytest.raises(ValueError, match="x-client-context not set"):
+        client.get("/")
+
+def test_metrics_asgi_app_mounted():
+    registry = MetricsRegistry()
+    registry.counter("mounted_total", "Mounted.").inc()
+
+    app = FastAPI()
+    app.mount("/metrics", sdk.MetricsAsgiApp(registry))
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert "mounted_total 1.0" in response.text
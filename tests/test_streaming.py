@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+from heroku_applink.data_api.unit_of_work import UnitOfWork
+from heroku_applink.exceptions import StreamingError
+from heroku_applink.streaming import (
+    MemoryCheckpointStore,
+    StreamingClient,
+    StreamingEvent,
+)
+
+ACCOUNT_CHANNEL = "/data/AccountChangeEvent"
+
+@pytest.fixture
+def fake_salesforce_options():
+    return {"streaming_timeout": 0.2}
+
+async def take(client, count):
+    async def collect():
+        events = []
+        async for event in client:
+            events.append(event)
+            if len(events) == count:
+                return events
+
+    return await asyncio.wait_for(collect(), 5)
+
+@pytest.mark.asyncio
+async def test_change_events(salesforce, data_api):
+    async with StreamingClient(data_api) as client:
+        await client.subscribe(ACCOUNT_CHANNEL)
+
+        record_id = await data_api.create(Record(type="Account", fields={"Name": "Acme"}))
+        await data_api.update(
+            Record(type="Account", fields={"Id": record_id, "Name": "Acme Corp"})
+        )
+        await data_api.delete("Account", record_id)
+        await data_api.create(Record(type="Contact", fields={"LastName": "Doe"}))
+
+        created, updated, deleted = await take(client, 3)
+
+    headers = [event.change_event_header for event in (created, updated, deleted)]
+    assert [header["changeType"] for header in headers] == ["CREATE", "UPDATE", "DELETE"]
+    assert all(header["entityName"] == "Account" for header in headers)
+    assert all(header["recordIds"] == [record_id] for header in headers)
+    assert created.payload["Name"] == "Acme"
+    assert updated.payload["Name"] == "Acme Corp"
+    assert headers[1]["changedFields"] == ["Name", "LastModifiedDate"]
+    assert created.channel == ACCOUNT_CHANNEL
+    assert created.replay_id < updated.replay_id < deleted.replay_id
+    assert salesforce.api_usage == 4
+
+@pytest.mark.asyncio
+async def test_checkpoints_resume_after_processed_events(salesforce, data_api):
+    store = MemoryCheckpointStore()
+
+    async with StreamingClient(
+        data_api, checkpoint_store=store, replay_id=StreamingClient.REPLAY_ALL
+    ) as client:
+        await client.subscribe(ACCOUNT_CHANNEL)
+        salesforce.publish_event(ACCOUNT_CHANNEL, {"Name": "First"})
+        salesforce.publish_event(ACCOUNT_CHANNEL, {"Name": "Second"})
+        first, second = await take(client, 2)
+
+    # The second event was handed out, but not processed completely.
+    assert store.replay_ids == {ACCOUNT_CHANNEL: first.replay_id}
+
+    salesforce.publish_event(ACCOUNT_CHANNEL, {"Name": "Third"})
+
+    async with StreamingClient(data_api, checkpoint_store=store) as client:
+        await client.subscribe(ACCOUNT_CHANNEL)
+        events = await take(client, 2)
+
+    assert [event.payload["Name"] for event in events] == ["Second", "Third"]
+
+@pytest.mark.asyncio
+async def test_replay_new_and_all(salesforce, data_api):
+    salesforce.publish_event("/event/Order_Event__e", {"Order": 1})
+
+    async with StreamingClient(data_api) as new_client, StreamingClient(
+        data_api, replay_id=StreamingClient.REPLAY_ALL
+    ) as all_client:
+        await new_client.subscribe("/event/Order_Event__e")
+        await all_client.subscribe("/event/Order_Event__e")
+
+        await data_api.create(Record(type="Order_Event__e", fields={"Order": 2}))
+
+        new_events = await take(new_client, 1)
+        all_events = await take(all_client, 2)
+
+    assert [event.payload["Order"] for event in new_events] == [2]
+    assert [event.payload["Order"] for event in all_events] == [1, 2]
+    assert salesforce.get_record("Order_Event__e", "e00000000000000001") is None
+
+@pytest.mark.asyncio
+async def test_reconnects_after_the_server_drops_the_client(salesforce, data_api):
+    async with StreamingClient(data_api) as client:
+        await client.subscribe("/data/ChangeEvents")
+
+        await data_api.create(Record(type="Account", fields={"Name": "Before"}))
+        (before,) = await take(client, 1)
+
+        salesforce.drop_streaming_clients()
+        await data_api.create(Record(type="Contact", fields={"LastName": "After"}))
+        (after,) = await take(client, 1)
+
+    assert before.payload["Name"] == "Before"
+    assert after.payload["LastName"] == "After"
+    assert after.channel == "/data/ChangeEvents"
+
+@pytest.mark.asyncio
+async def test_transactions_publish_on_commit(salesforce, data_api):
+    async with StreamingClient(data_api) as client:
+        await client.subscribe(ACCOUNT_CHANNEL)
+
+        failing = UnitOfWork()
+        failing.register_create(Record(type="Account", fields={"Name": "Rolled back"}))
+        failing.register_update(Record(type="Account", fields={"Id": "001000000000000999"}))
+        with pytest.raises(SalesforceRestApiError):
+            await data_api.commit_unit_of_work(failing)
+
+        unit_of_work = UnitOfWork()
+        unit_of_work.register_create(Record(type="Account", fields={"Name": "A"}))
+        unit_of_work.register_create(Record(type="Account", fields={"Name": "B"}))
+        await data_api.commit_unit_of_work(unit_of_work)
+
+        first, second = await take(client, 2)
+
+    assert [first.payload["Name"], second.payload["Name"]] == ["A", "B"]
+    assert (
+        first.change_event_header["transactionKey"]
+        == second.change_event_header["transactionKey"]
+    )
+    assert [
+        first.change_event_header["sequenceNumber"],
+        second.change_event_header["sequenceNumber"],
+    ] == [1, 2]
+
+@pytest.mark.asyncio
+async def test_errors(salesforce, data_api):
+    async with StreamingClient(data_api) as client:
+        with pytest.raises(StreamingError, match="Subscribe to a channel"):
+            await anext(client.events())
+
+        with pytest.raises(StreamingError, match="does not exist"):
+            await client.subscribe("/unknown/Channel")
+
+        with pytest.raises(StreamingError, match="replayId"):
+            await client.subscribe(ACCOUNT_CHANNEL, replay_id=-5)
+
+    data_api.access_token = "invalid"
+    with pytest.raises(StreamingError, match="401"):
+        await StreamingClient(data_api).subscribe(ACCOUNT_CHANNEL)
+
+def test_streaming_event_payload():
+    event = StreamingEvent(
+        channel="/topic/Accounts",
+        replay_id=1,
+        data={"sobject": {"Id": "001"}, "event": {"replayId": 1}},
+    )
+
+    assert event.payload == {"Id": "001"}
+    assert event.change_event_header is None
@@ -0,0 +1,170 @@
+import sqlite3
+
+import pytest
+
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+from heroku_applink.sync import SyncedObject, SyncEngine, SyncResult
+
+ACCOUNT = SyncedObject(name="Account", fields=("Name", "Industry"), indexes=("Name",))
+
+@pytest.fixture
+def fake_salesforce_options():
+    return {"page_size": 2}
+
+@pytest.fixture
+def engine(data_api):
+    engine = SyncEngine(data_api, ":memory:", [ACCOUNT])
+    yield engine
+    engine.close()
+
+def names(engine):
+    return [
+        row["Name"]
+        for row in engine.database.execute('SELECT "Name" FROM "Account" ORDER BY "Name"')
+    ]
+
+@pytest.mark.asyncio
+async def test_initial_load_and_incremental_changes(salesforce, data_api, engine):
+    first, second, third = salesforce.add_records(
+        "Account",
+        [
+            {"Name": "Acme", "Industry": "Energy"},
+            {"Name": "Globex", "Industry": "Retail"},
+            {"Name": "Initech", "Industry": "Software"},
+        ],
+    )
+
+    results = await engine.sync()
+
+    assert results == {
+        "Account": SyncResult(
+            upserted=3,
+            deleted=0,
+            watermark=salesforce.get_record("Account", third)["SystemModstamp"],
+        )
+    }
+    assert engine.get("Account", first) == {
+        "Id": first,
+        "SystemModstamp": salesforce.get_record("Account", first)["SystemModstamp"],
+        "Name": "Acme",
+        "Industry": "Energy",
+    }
+
+    await data_api.update(Record(type="Account", fields={"Id": first, "Name": "Acme Corp"}))
+    await data_api.delete("Account", second)
+    await data_api.create(Record(type="Account", fields={"Name": "Umbrella"}))
+    salesforce.requests.clear()
+
+    results = await engine.sync("Account")
+
+    # The newest record seen before is pulled again, since the watermark is inclusive.
+    assert results["Account"].upserted == 3
+    assert results["Account"].deleted == 1
+    assert names(engine) == ["Acme Corp", "Initech", "Umbrella"]
+    assert salesforce.requests[0][1].startswith("/services/data/v62.0/queryAll?q=")
+
+@pytest.mark.asyncio
+async def test_resumes_from_the_next_records_url(salesforce, engine):
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(5)])
+    salesforce.inject_error(503, path="/query/01g", method="GET")
+
+    with pytest.raises(SalesforceRestApiError):
+        await engine.sync()
+
+    assert names(engine) == ["Account 0", "Account 1"]
+    assert engine.watermark("Account") is None
+    salesforce.requests.clear()
+
+    await engine.sync()
+
+    assert names(engine) == [f"Account {i}" for i in range(5)]
+    assert [path.split("?")[0] for _, path in salesforce.requests] == [
+        "/services/data/v62.0/query/01gFAKE00000000001-2",
+        "/services/data/v62.0/query/01gFAKE00000000001-4",
+    ]
+
+@pytest.mark.asyncio
+async def test_expired_next_records_url_pulls_the_changes_again(salesforce, engine):
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(5)])
+    salesforce.inject_error(503, path="/query/01g", method="GET")
+
+    with pytest.raises(SalesforceRestApiError):
+        await engine.sync()
+
+    salesforce.inject_error(
+        400,
+        [{"errorCode": "INVALID_QUERY_LOCATOR", "message": "invalid query locator"}],
+        path="/query/01g",
+    )
+
+    result = await engine.sync()
+
+    assert result["Account"].upserted == 5
+    assert names(engine) == [f"Account {i}" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_changed_fields_reload_the_table(salesforce, data_api, tmp_path):
+    salesforce.add_records(
+        "Account",
+        [
+            {"Name": "Acme", "Type": "Customer", "BillingAddress": {"city": "Paris"}},
+            {"Name": "Globex", "Type": "Prospect"},
+        ],
+    )
+    database = str(tmp_path / "mirror.db")
+
+    engine = SyncEngine(data_api, database, [ACCOUNT])
+    await engine.sync()
+    engine.close()
+
+    customers = SyncedObject(
+        name="Account", fields=("Name", "BillingAddress"), where="Type = 'Customer'"
+    )
+    engine = SyncEngine(data_api, database, [customers])
+    try:
+        result = await engine.sync()
+        rows = [dict(row) for row in engine.database.execute('SELECT * FROM "Account"')]
+    finally:
+        engine.close()
+
+    assert result["Account"].upserted == 1
+    assert [(row["Name"], row["BillingAddress"]) for row in rows] == [
+        ("Acme", '{"city":"Paris"}')
+    ]
+
+    with sqlite3.connect(database) as connection:
+        indexes = {row[1] for row in connection.execute('PRAGMA index_list("Account")')}
+    assert {"Account_SystemModstamp", "Account_Name"} <= indexes
+
+@pytest.mark.asyncio
+async def test_records_that_no_longer_match_are_removed(salesforce, data_api):
+    acme, globex, initech = salesforce.add_records(
+        "Account",
+        [
+            {"Name": "Acme", "Type": "Customer"},
+            {"Name": "Globex", "Type": "Customer"},
+            {"Name": "Initech", "Type": "Customer"},
+        ],
+    )
+    customers = SyncedObject(name="Account", fields=("Name",), where="Type = 'Customer'")
+    engine = SyncEngine(data_api, ":memory:", [customers])
+
+    try:
+        await engine.sync()
+
+        for record_id in (acme, globex):
+            await data_api.update(Record(type="Account", fields={"Id": record_id, "Type": "Prospect"}))
+
+        result = await engine.sync()
+
+        assert result["Account"].deleted == 2
+        assert names(engine) == ["Initech"]
+    finally:
+        engine.close()
+
+def test_rejects_unsupported_fields(data_api):
+    with pytest.raises(ValueError, match="Account.Name"):
+        SyncEngine(
+            data_api, ":memory:", [SyncedObject(name="Contact", fields=("Account.Name",))]
+        )
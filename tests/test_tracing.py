@@ -0,0 +1,207 @@
+import base64
+import json
+import re
+
+import pytest
+
+from aioresponses import aioresponses
+
+import heroku_applink as sdk
+from heroku_applink import _tracing
+from heroku_applink.data_api import DataAPI
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+_exporter = InMemorySpanExporter()
+
+@pytest.fixture(scope="module", autouse=True)
+def tracer_provider():
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(_exporter))
+    trace.set_tracer_provider(provider)
+    yield provider
+
+@pytest.fixture
+def exporter():
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+CLIENT_CONTEXT = {
+    "orgId": "00DJS0000000123ABC",
+    "orgDomainUrl": "https://example-domain-url.my.salesforce.com",
+    "userContext": {
+        "userId": "005JS000000H123",
+        "username": "user@example.tld"
+    },
+    "requestId": "006JS000000H123ABC",
+    "accessToken": "006JS000000H123ABC",
+    "apiVersion": "62.0",
+    "namespace": "heroku_applink",
+}
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+
+async def _call_asgi(app, headers):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/accounts",
+        "headers": headers,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+@pytest.mark.asyncio
+async def test_spans_are_linked_from_middleware_to_http_call(exporter):
+    async def app(scope, receive, send):
+        await sdk.get_client_context().data_api.query("SELECT Id FROM Account")
+
+    middleware = sdk.IntegrationAsgiMiddleware(app)
+    headers = [
+        (b"x-client-context", base64.b64encode(json.dumps(CLIENT_CONTEXT).encode())),
+        (b"traceparent", f"00-{TRACE_ID}-b7ad6b7169203331-01".encode()),
+    ]
+
+    with aioresponses() as m:
+        m.get(
+            re.compile(r"https://example-domain-url\.my\.salesforce\.com/services/data/v62\.0/query.*"),
+            status=200,
+            payload={
+                "done": True,
+                "totalSize": 1,
+                "records": [{"attributes": {"type": "Account"}, "Id": "001A"}],
+            },
+        )
+
+        await _call_asgi(middleware, headers)
+
+        outbound_headers = list(m.requests.values())[0][0].kwargs["headers"]
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server_span = spans["GET"]
+    query_span = spans["DataAPI.query"]
+    http_span = spans["HTTP GET"]
+
+    assert query_span.parent.span_id == server_span.context.span_id
+    assert http_span.parent.span_id == query_span.context.span_id
+
+    # The incoming trace is continued, and propagated to Salesforce.
+    assert format(server_span.context.trace_id, "032x") == TRACE_ID
+    assert TRACE_ID in outbound_headers["traceparent"]
+    assert "X-Request-Id" in outbound_headers
+
+    assert server_span.attributes["salesforce.org.id"] == "00DJS0000000123ABC"
+    assert query_span.attributes["salesforce.sobject_type"] == "Account"
+    assert query_span.attributes["salesforce.record_count"] == 1
+    assert query_span.attributes["salesforce.query.offset"] == 0
+    assert query_span.attributes["salesforce.response.size"] > 0
+    assert http_span.attributes["http.response.status_code"] == 200
+    assert http_span.attributes["server.address"] == "example-domain-url.my.salesforce.com"
+
+def test_wsgi_span_ends_when_the_body_is_closed(exporter):
+    closed = []
+
+    class Body:
+        def __iter__(self):
+            assert exporter.get_finished_spans() == ()
+            yield b"chunk"
+            raise RuntimeError("broken body")
+
+        def close(self):
+            closed.append(True)
+
+    def app(environ, start_response):
+        start_response("200 OK", [])
+        return Body()
+
+    middleware = sdk.IntegrationWsgiMiddleware(app)
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": "/accounts",
+        "HTTP_X_CLIENT_CONTEXT": base64.b64encode(json.dumps(CLIENT_CONTEXT).encode()).decode(),
+    }
+
+    body = middleware(environ, lambda status, headers: None)
+    assert exporter.get_finished_spans() == ()
+
+    chunks = iter(body)
+    assert next(chunks) == b"chunk"
+    with pytest.raises(RuntimeError):
+        next(chunks)
+    assert exporter.get_finished_spans() == ()
+
+    body.close()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET"
+    assert span.status.status_code == trace.StatusCode.ERROR
+    assert closed == [True]
+
+@pytest.mark.asyncio
+async def test_http_span_marks_error_responses(exporter):
+    connection = sdk.Connection(sdk.Config.default())
+
+    with aioresponses() as m:
+        m.get("https://example.com/missing", status=404)
+
+        await connection.request("GET", "https://example.com/missing")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.status.status_code == trace.StatusCode.ERROR
+
+@pytest.mark.asyncio
+async def test_data_api_span_records_salesforce_errors(exporter):
+    data_api = DataAPI(
+        org_domain_url="https://example-domain-url.my.salesforce.com",
+        api_version="62.0",
+        access_token="token",
+        connection=sdk.Connection(sdk.Config.default()),
+    )
+
+    with aioresponses() as m:
+        m.get(
+            re.compile(r".*/query\?.*"),
+            status=400,
+            payload=[{"errorCode": "MALFORMED_QUERY", "message": "unexpected token"}],
+        )
+
+        # `SalesforceRestApiError` is a frozen dataclass, so spans must not assign
+        # its `__traceback__` while it propagates.
+        with pytest.raises(SalesforceRestApiError):
+            await data_api.query("SELECT")
+
+    data_api_span = next(
+        span for span in exporter.get_finished_spans() if span.name == "DataAPI.query"
+    )
+    assert data_api_span.status.status_code == trace.StatusCode.ERROR
+    assert data_api_span.events[0].name == "exception"
+
+def test_noop_when_opentelemetry_is_missing(monkeypatch):
+    monkeypatch.setattr(_tracing, "trace", None)
+    monkeypatch.setattr(_tracing, "propagate", None)
+
+    with _tracing.start_span("name", {"key": "value"}) as span:
+        span.set_attribute("key", "value")
+        span.set_attributes({"key": "value"})
+        _tracing.mark_error(span, "failed")
+
+    assert span is _tracing._NOOP_SPAN
+    assert _tracing.current_span() is _tracing._NOOP_SPAN
+    assert _tracing.extract({"traceparent": "ignored"}) is None
+
+    headers = {}
+    _tracing.inject(headers)
+    assert headers == {}
@@ -0,0 +1,169 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection, _pool_utilization
+from heroku_applink.data_api.exceptions import ClientError, SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+from heroku_applink.instrumentation import Instrumentation
+from heroku_applink.transport import AiohttpTransport, Http2Transport
+
+pytest.importorskip("h2")
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.ended = []
+
+    def on_request_end(self, event):
+        self.ended.append(event)
+
+class RecordingTransport(AiohttpTransport):
+    def __init__(self, config):
+        super().__init__(config)
+        self.requests = []
+        self.bodies = []
+
+    async def request(self, method, url, **kwargs):
+        self.requests.append((method, str(url)))
+        self.bodies.append((kwargs["headers"].get("Content-Type"), kwargs["data"]))
+        return await super().request(method, url, **kwargs)
+
+@pytest.fixture
+def fake_salesforce_options():
+    return {"page_size": 3}
+
+@pytest.mark.asyncio
+async def test_http2_transport_queries_and_creates(salesforce, make_data_api):
+    connection = Connection(Config(transport=Http2Transport))
+    data_api = make_data_api(connection=connection)
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(5)])
+
+    try:
+        record_id = await data_api.create(Record(type="Account", fields={"Name": "New"}))
+        result = await data_api.query("SELECT Id, Name FROM Account")
+        result = await data_api.query_more(result)
+    finally:
+        await connection.close()
+
+    assert salesforce.get_record("Account", record_id)["Name"] == "New"
+    assert [record.fields["Name"] for record in result.records] == [
+        "Account 3",
+        "Account 4",
+        "New",
+    ]
+
+@pytest.mark.asyncio
+async def test_http2_transport_reports_salesforce_errors(salesforce, make_data_api):
+    connection = Connection(Config(transport=Http2Transport))
+    data_api = make_data_api(connection=connection)
+
+    try:
+        with pytest.raises(SalesforceRestApiError) as exc_info:
+            await data_api.query("SELECT Id FROM")
+    finally:
+        await connection.close()
+
+    assert exc_info.value.api_errors[0].error_code == "MALFORMED_QUERY"
+
+@pytest.mark.asyncio
+async def test_http2_transport_response(salesforce):
+    connection = Connection(Config(transport=Http2Transport))
+
+    try:
+        response = await connection.request(
+            "GET",
+            f"{salesforce.url}/services/data/v{salesforce.api_version}/limits",
+            headers={"Authorization": "Bearer invalid"},
+        )
+    finally:
+        await connection.close()
+
+    assert response.status == 401
+    assert not response.ok
+    assert response.http_version == "HTTP/1.1"
+    assert "sforce-limit-info" in response.headers
+    assert (await response.json())[0]["errorCode"] == "INVALID_SESSION_ID"
+
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        response.raise_for_status()
+
+    assert exc_info.value.status == 401
+
+@pytest.mark.asyncio
+async def test_http2_transport_maps_timeouts_and_connection_errors(salesforce, make_data_api):
+    salesforce.latency = 0.5
+    connection = Connection(Config(transport=Http2Transport))
+    data_api = make_data_api(connection=connection)
+
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await connection.request(
+                "GET",
+                f"{salesforce.url}/services/data/v{salesforce.api_version}/limits",
+                timeout=0.05,
+            )
+
+        await salesforce.close()
+
+        with pytest.raises(aiohttp.ClientError):
+            await connection.request("GET", salesforce.url)
+
+        with pytest.raises(ClientError):
+            await data_api.query("SELECT Id FROM Account")
+    finally:
+        await connection.close()
+
+@pytest.mark.asyncio
+async def test_http2_transport_phase_timings(salesforce, make_data_api):
+    instrumentation = RecordingInstrumentation()
+    connection = Connection(
+        Config(transport=Http2Transport, instrumentation=instrumentation)
+    )
+    data_api = make_data_api(connection=connection)
+
+    try:
+        await data_api.query("SELECT Id FROM Account")
+        await data_api.query("SELECT Id FROM Account")
+    finally:
+        await connection.close()
+
+    first, second = instrumentation.ended
+    assert first.connect is not None and not first.reused_connection
+    assert second.connect is None and second.reused_connection
+    assert first.server is not None and first.status == 200
+
+@pytest.mark.asyncio
+async def test_config_transport_factory(salesforce, make_data_api):
+    connection = Connection(Config(transport=RecordingTransport))
+    data_api = make_data_api(connection=connection)
+
+    try:
+        await data_api.query("SELECT Id FROM Account")
+        assert connection._transport.pool_limit() == 100
+        assert _pool_utilization() == 0.0
+        requests = connection._transport.requests
+    finally:
+        await connection.close()
+
+    assert connection._transport is None
+    assert requests == [
+        ("GET", f"{salesforce.url}/services/data/v62.0/query?q=SELECT+Id+FROM+Account"),
+    ]
+
+@pytest.mark.asyncio
+async def test_transports_receive_raw_bytes_with_a_content_type(salesforce, make_data_api):
+    connection = Connection(Config(transport=RecordingTransport))
+    data_api = make_data_api(connection=connection)
+
+    try:
+        await data_api.create(Record(type="Account", fields={"Name": "Acme"}))
+        bodies = connection._transport.bodies
+    finally:
+        await connection.close()
+
+    assert bodies == [("application/json", b'{"Name":"Acme"}')]
+
+def test_http2_transport_pool_limit():
+    assert Http2Transport(Config.default()).pool_limit() is None
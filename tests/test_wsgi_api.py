@@ -1,6 +1,7 @@
 import pytest
 import json
 import base64
+import time
 
 from flask import Flask, jsonify
 
@@ -52,3 +53,36 @@ def test_scoped_client_context(client):
 
     assert response.status_code == 200
     assert response.json == {"data_api_populated": True}
+
+def test_deadline_from_header():
+    deadline_app = Flask(__name__)
+    deadline_app.wsgi_app = sdk.IntegrationWsgiMiddleware(
+        deadline_app.wsgi_app, config=sdk.Config(deadline_header="X-Request-Timeout")
+    )
+
+    @deadline_app.route("/deadline")
+    def deadline():
+        current_deadline = sdk.get_deadline()
+        return jsonify(
+            {"remaining": current_deadline - time.monotonic() if current_deadline else None}
+        )
+
+    client_context = base64.b64encode(json.dumps({
+        "orgId": "00DJS0000000123ABC",
+        "orgDomainUrl": "https://example-domain-url.my.salesforce.com",
+        "userContext": {"userId": "005JS000000H123", "username": "user@example.tld"},
+        "requestId": "006JS000000H123ABC",
+        "accessToken": "006JS000000H123ABC",
+        "apiVersion": "50.0",
+        "namespace": "heroku_applink",
+    }).encode()).decode()
+
+    with deadline_app.test_client() as client:
+        with_header = client.get(
+            "/deadline",
+            headers={"x-client-context": client_context, "x-request-timeout": "1.5"},
+        )
+        without_header = client.get("/deadline", headers={"x-client-context": client_context})
+
+    assert 1 < with_header.json["remaining"] <= 1.5
+    assert without_header.json["remaining"] is None
@@ -0,0 +1,266 @@
+import aiohttp
+import pytest
+
+from heroku_applink.authorization import Authorization, refresh_addon_config
+from heroku_applink.config import Config
+from heroku_applink.connection import Connection
+from heroku_applink.context import ClientContext
+from heroku_applink.data_api import DataAPI
+from heroku_applink.data_api.exceptions import SalesforceRestApiError
+from heroku_applink.data_api.record import Record
+from heroku_applink.data_api.unit_of_work import UnitOfWork
+from heroku_applink.testing import FakeSalesforce
+from heroku_applink.testing._soql import SoqlError, parse
+
+@pytest.fixture
+async def salesforce():
+    async with FakeSalesforce(page_size=3) as salesforce:
+        yield salesforce
+
+@pytest.fixture
+async def connection():
+    connection = Connection(Config.default())
+    yield connection
+    await connection.close()
+
+@pytest.fixture
+def data_api(salesforce, connection):
+    return DataAPI(
+        org_domain_url=salesforce.url,
+        api_version=salesforce.api_version,
+        access_token=salesforce.access_token,
+        connection=connection,
+    )
+
+@pytest.mark.asyncio
+async def test_query_pages(salesforce, data_api):
+    salesforce.add_records("Account", [{"Name": f"Account {i}"} for i in range(7)])
+
+    result = await data_api.query("SELECT Id, Name FROM Account")
+    names = [record.fields["Name"] for record in result.records]
+
+    assert result.total_size == 7
+    assert not result.done
+
+    while not result.done:
+        result = await data_api.query_more(result)
+        names.extend(record.fields["Name"] for record in result.records)
+
+    assert names == [f"Account {i}" for i in range(7)]
+
+@pytest.mark.asyncio
+async def test_query_where_order_limit_and_relationships(salesforce, data_api):
+    [account_id] = salesforce.add_records("Account", [{"Name": "Acme"}])
+    salesforce.add_records(
+        "Contact",
+        [
+            {"LastName": "B", "Age": 30, "AccountId": account_id},
+            {"LastName": "A", "Age": 40, "AccountId": account_id},
+            {"LastName": "C", "Age": 50, "AccountId": None},
+        ],
+    )
+
+    result = await data_api.query(
+        "SELECT LastName, Account.Name FROM Contact "
+        "WHERE Age >= 30 AND LastName IN ('A', 'B') ORDER BY LastName DESC LIMIT 1"
+    )
+
+    [record] = result.records
+    assert record.fields["LastName"] == "B"
+    assert record.fields["Account"].type == "Account"
+    assert record.fields["Account"].fields == {"Name": "Acme"}
+
+@pytest.mark.asyncio
+async def test_query_all_includes_deleted_records(salesforce, data_api):
+    [account_id] = salesforce.add_records("Account", [{"Name": "Acme"}])
+    await data_api.delete("Account", account_id)
+
+    assert (await data_api.query("SELECT Id FROM Account")).total_size == 0
+
+    response = await data_api._connection.request(
+        "GET",
+        f"{salesforce.url}/services/data/v62.0/queryAll",
+        params={"q": "SELECT Id, IsDeleted FROM Account"},
+        headers=data_api._default_headers(),
+    )
+    body = await response.json()
+
+    assert body["records"][0]["IsDeleted"] is True
+
+@pytest.mark.asyncio
+async def test_malformed_query(data_api):
+    with pytest.raises(SalesforceRestApiError) as exc_info:
+        await data_api.query("SELECT COUNT() FROM Account")
+
+    assert exc_info.value.api_errors[0].error_code == "MALFORMED_QUERY"
+
+@pytest.mark.asyncio
+async def test_crud(salesforce, data_api):
+    salesforce.require_fields("Account", "Name")
+
+    record_id = await data_api.create(Record(type="Account", fields={"Name": "Acme"}))
+    await data_api.update(Record(type="Account", fields={"Id": record_id, "Name": "Acme 2"}))
+
+    assert salesforce.get_record("Account", record_id)["Name"] == "Acme 2"
+
+    with pytest.raises(SalesforceRestApiError) as exc_info:
+        await data_api.create(Record(type="Account", fields={"Industry": "Technology"}))
+
+    assert exc_info.value.api_errors[0].error_code == "REQUIRED_FIELD_MISSING"
+    assert exc_info.value.api_errors[0].fields == ["Name"]
+
+    await data_api.delete("Account", record_id)
+
+    assert salesforce.get_record("Account", record_id)["IsDeleted"] is True
+
+@pytest.mark.asyncio
+async def test_describe_drives_field_conversion(salesforce, data_api):
+    salesforce.add_records("Opportunity", [{"Name": "Deal", "CloseDate": "2025-03-06"}])
+    salesforce.set_describe("Opportunity", {"CloseDate": "date"})
+
+    result = await data_api.query(
+        "SELECT CloseDate, CreatedDate FROM Opportunity", convert_field_types=True
+    )
+
+    assert str(result.records[0].fields["CloseDate"]) == "2025-03-06"
+    assert result.records[0].fields["CreatedDate"].tzinfo is not None
+
+@pytest.mark.asyncio
+async def test_composite_graph(salesforce, data_api):
+    unit_of_work = UnitOfWork()
+    account = unit_of_work.register_create(Record(type="Account", fields={"Name": "Acme"}))
+    contact = unit_of_work.register_create(
+        Record(type="Contact", fields={"LastName": "Doe", "AccountId": account})
+    )
+
+    result = await data_api.commit_unit_of_work(unit_of_work)
+
+    assert salesforce.get_record("Contact", result[contact])["AccountId"] == result[account]
+
+@pytest.mark.asyncio
+async def test_composite_graph_rolls_back(salesforce, data_api):
+    salesforce.require_fields("Contact", "LastName")
+
+    unit_of_work = UnitOfWork()
+    unit_of_work.register_create(Record(type="Account", fields={"Name": "Acme"}))
+    unit_of_work.register_create(Record(type="Contact", fields={"FirstName": "Jane"}))
+
+    with pytest.raises(SalesforceRestApiError) as exc_info:
+        await data_api.commit_unit_of_work(unit_of_work)
+
+    assert {error.error_code for error in exc_info.value.api_errors} == {
+        "REQUIRED_FIELD_MISSING",
+        "PROCESSING_HALTED",
+    }
+    assert (await data_api.query("SELECT Id FROM Account")).total_size == 0
+
+@pytest.mark.asyncio
+async def test_collections(salesforce, connection):
+    salesforce.require_fields("Account", "Name")
+    url = f"{salesforce.url}/services/data/v62.0/composite/sobjects"
+    headers = {"Authorization": f"Bearer {salesforce.access_token}"}
+
+    response = await connection.request(
+        "POST",
+        url,
+        headers=headers,
+        data=b'{"allOrNone": false, "records": ['
+        b'{"attributes": {"type": "Account"}, "Name": "A"},'
+        b'{"attributes": {"type": "Account"}}]}',
+    )
+    created = await response.json()
+
+    assert created[0]["success"] is True
+    assert created[1]["errors"][0]["statusCode"] == "REQUIRED_FIELD_MISSING"
+
+    response = await connection.request(
+        "DELETE",
+        url,
+        params={"ids": f"{created[0]['id']},001000000000000999", "allOrNone": "true"},
+        headers=headers,
+    )
+    deleted = await response.json()
+
+    assert [result["success"] for result in deleted] == [False, False]
+    assert deleted[0]["errors"][0]["statusCode"] == "ALL_OR_NONE_OPERATION_ROLLED_BACK"
+    assert salesforce.get_record("Account", created[0]["id"])["IsDeleted"] is False
+
+@pytest.mark.asyncio
+async def test_limit_info_and_invalid_session(salesforce, connection):
+    response = await connection.request(
+        "GET",
+        f"{salesforce.url}/services/data/v62.0/query",
+        params={"q": "SELECT Id FROM Account"},
+        headers={"Authorization": "Bearer wrong"},
+    )
+
+    assert response.status == 401
+    assert response.headers["Sforce-Limit-Info"] == "api-usage=1/15000"
+    assert salesforce.api_usage == 1
+
+@pytest.mark.asyncio
+async def test_injected_errors(salesforce, data_api):
+    salesforce.inject_error(503, count=2, path="/query", method="GET")
+
+    for _ in range(2):
+        with pytest.raises(SalesforceRestApiError):
+            await data_api.query("SELECT Id FROM Account")
+
+    assert (await data_api.query("SELECT Id FROM Account")).done
+
+@pytest.mark.asyncio
+async def test_error_rate_and_latency(connection):
+    async with FakeSalesforce(error_rate=1.0, latency=(0.01, 0.02), seed=1) as salesforce:
+        response = await connection.request(
+            "GET",
+            f"{salesforce.url}/services/data/v62.0/query",
+            params={"q": "SELECT Id FROM Account"},
+            headers={"Authorization": f"Bearer {salesforce.access_token}"},
+        )
+
+    assert response.status == 503
+
+@pytest.mark.asyncio
+async def test_authorization_find(salesforce, monkeypatch):
+    salesforce.add_authorization("productionOrg")
+    for name, value in salesforce.addon_config().items():
+        monkeypatch.setenv(name, value)
+    refresh_addon_config()
+
+    try:
+        authorization = await Authorization.find("productionOrg")
+
+        assert authorization.org.instance_url == salesforce.url
+        assert authorization.org.user_auth.username == "admin@example.org"
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await Authorization.find("unknownOrg")
+    finally:
+        monkeypatch.undo()
+        refresh_addon_config()
+
+@pytest.mark.asyncio
+async def test_client_context_header(salesforce, connection):
+    salesforce.add_records("Account", [{"Name": "Acme"}])
+
+    context = ClientContext.from_header(salesforce.client_context_header(), connection)
+    result = await context.data_api.query("SELECT Name FROM Account")
+
+    assert context.org.id == salesforce.org_id
+    assert result.records[0].fields["Name"] == "Acme"
+
+def test_soql_parse():
+    query = parse("SELECT Id, Owner.Name FROM Account WHERE Name != 'O\\'Brien' LIMIT 5")
+
+    assert query.object_type == "Account"
+    assert query.fields == ("Id", "Owner.Name")
+    assert query.limit == 5
+    assert query.conditions[0](lambda field: "Acme")
+    assert not query.conditions[0](lambda field: "O'Brien")
+
+    negated = parse("SELECT Id FROM Account WHERE NOT (Name = 'a' AND Type = 'b (AND c)')")
+    assert negated.conditions[0](lambda field: "a")
+    assert not negated.conditions[0](lambda field: {"Name": "a", "Type": "b (AND c)"}[field])
+
+    with pytest.raises(SoqlError):
+        parse("SELECT Id FROM Account WHERE Name = 'a' OR Name = 'b'")